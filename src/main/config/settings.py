@@ -72,6 +72,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "core.context_processors.live_updates",
             ],
         },
     },
@@ -95,6 +96,35 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# "default" holds the booking-change version counter; "availability" holds
+# computed search results (LRU culling at MAX_ENTRIES, TTL of TIMEOUT seconds).
+# With several worker processes, point both at a shared backend
+# (Memcached/Redis) so they see each other's writes.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "farmhouse",
+    },
+    "availability": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "farmhouse-availability",
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+    # Product carts with CART_STORE = "cache" (product.cart.CacheCartStore);
+    # replace with a shared backend, e.g. Redis or Memcached, to use it.
+    "carts": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "farmhouse-carts",
+        "TIMEOUT": 60 * 60 * 24 * 7,
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -135,3 +165,35 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Statistics
+# Read "Free services now" from the SERVICE_OCCUPANCY snapshot (kept current by
+# the booking write paths and the periodic refresh_occupancy command) instead
+# of aggregating BOOKING_DETAIL on every page load.
+
+FREE_SERVICES_SNAPSHOT = False
+
+
+# Product cart
+# Where product.cart keeps carts: "session", "cookie" (signed cookie) or
+# "cache" (the "carts" cache alias; mutations never write to the database).
+# "cache" requires "carts" to point at a shared backend (Redis, Memcached).
+
+CART_STORE = "session"
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# Booking lock waits above service.locks.LOCK_WAIT_WARN_MS and failed
+# occupancy snapshot refreshes are reported here.
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "service.locks": {"handlers": ["console"], "level": "WARNING"},
+        "service.availability": {"handlers": ["console"], "level": "WARNING"},
+    },
+}
@@ -0,0 +1,12 @@
+"""Template context shared by every page."""
+
+from django.core.handlers.asgi import ASGIRequest
+
+
+def live_updates(request) -> dict:
+    """`live_updates` is True when the /live/ stream can be served.
+
+    The stream is an endless async response: only an ASGI server sends it
+    incrementally, so pages open it only when served under ASGI.
+    """
+    return {"live_updates": isinstance(request, ASGIRequest)}
@@ -0,0 +1,27 @@
+"""Rebuild the SEARCH_TOKEN inverted index.
+
+Usage:
+    python manage.py rebuild_search_index [--kind event|product|review]
+                                          [--chunk-size 1000]
+
+Each kind is rebuilt in its own transaction, streaming the source rows in
+chunks. Run it once after creating the table; afterwards model signals keep
+the index current.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the site search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=sorted(search.sources()), action="append")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for kind in options["kind"] or sorted(search.sources()):
+            count = search.rebuild(kind, chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {kind} rows."))
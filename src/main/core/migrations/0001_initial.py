@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-16 22:21
+
+from django.db import migrations, models
+
+SEARCH_TOKEN_DDL = """
+CREATE TABLE SEARCH_TOKEN (
+    kind VARCHAR(16) NOT NULL,
+    token VARCHAR(64) COLLATE utf8mb4_bin NOT NULL,
+    object_id INT NOT NULL,
+    hits SMALLINT UNSIGNED NOT NULL DEFAULT 1,
+    PRIMARY KEY (kind, token, object_id),
+    INDEX idx_search_token_object (kind, object_id)
+)
+"""
+
+
+def create_search_token(apps, schema_editor):
+    """Create SEARCH_TOKEN on MySQL databases built before it was in db.sql."""
+    connection = schema_editor.connection
+    if connection.vendor != "mysql":
+        return
+    with connection.cursor() as cursor:
+        if "SEARCH_TOKEN" in connection.introspection.table_names(cursor):
+            return
+    schema_editor.execute(SEARCH_TOKEN_DDL)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchToken",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "kind",
+                        "token",
+                        "object_id",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("kind", models.CharField(max_length=16)),
+                ("token", models.CharField(max_length=64)),
+                ("object_id", models.IntegerField()),
+                ("hits", models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                "verbose_name": "Search token",
+                "verbose_name_plural": "Search tokens",
+                "db_table": "SEARCH_TOKEN",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_token, migrations.RunPython.noop),
+    ]
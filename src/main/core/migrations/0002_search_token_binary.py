@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-17 09:00
+
+from django.db import migrations
+
+
+def binary_token_collation(apps, schema_editor):
+    """Compare SEARCH_TOKEN keys exactly on MySQL databases built earlier.
+
+    Under the default accent- and case-insensitive collation, "caffè" and
+    "caffe" collided on the primary key. Tokens are folded by
+    core.search.tokenize now, so the index is emptied here and must be
+    rebuilt with `manage.py rebuild_search_index`.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "mysql":
+        return
+    with connection.cursor() as cursor:
+        if "SEARCH_TOKEN" not in connection.introspection.table_names(cursor):
+            return
+    schema_editor.execute("DELETE FROM SEARCH_TOKEN")
+    schema_editor.execute(
+        "ALTER TABLE SEARCH_TOKEN MODIFY token VARCHAR(64) COLLATE utf8mb4_bin NOT NULL"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(binary_token_collation, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,31 @@
+"""Models for the Core app.
+
+Tables:
+- SEARCH_TOKEN: inverted index used by the site search (see core.search)
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class SearchToken(models.Model):
+    """One lowercase token of an indexed object.
+
+    Maps to SEARCH_TOKEN(kind, token, object_id, hits). The primary key
+    starts with (kind, token), so exact and prefix lookups are index range
+    scans instead of LIKE '%...%' table scans.
+    """
+
+    pk = models.CompositePrimaryKey("kind", "token", "object_id")
+    kind = models.CharField(max_length=16)
+    token = models.CharField(max_length=64)
+    object_id = models.IntegerField()
+    hits = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        managed = False
+        db_table = "SEARCH_TOKEN"
+        verbose_name = "Search token"
+        verbose_name_plural = "Search tokens"
+
+    def __str__(self) -> str:
+        return f"SearchToken({self.kind}:{self.object_id} {self.token!r})"
@@ -0,0 +1,57 @@
+"""In-process publish/subscribe for live updates.
+
+Booking code (sync, any thread) calls `publish(topic, payload)`; each open
+server-sent-events stream (async, on the ASGI event loop) owns a bounded
+asyncio.Queue registered for the topics it follows. Messages are handed to
+the subscriber's loop with call_soon_threadsafe, so publishing never blocks
+a request. A subscriber that falls behind drops messages instead of growing
+without bound.
+
+The broker lives in the worker process: with several ASGI workers each
+stream only sees bookings made through its own worker. Point `publish` at a
+shared channel (e.g. Redis pub/sub) before scaling out.
+"""
+
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+
+QUEUE_SIZE = 100
+
+_subscribers = {}
+_lock = threading.Lock()
+
+
+def _offer(queue: asyncio.Queue, message: str) -> None:
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        pass
+
+
+def publish(topic: str, payload) -> None:
+    """Send `payload` (JSON-serializable) to every subscriber of `topic`."""
+    message = json.dumps({"topic": topic, "data": payload}, default=str)
+    with _lock:
+        targets = list(_subscribers.get(topic, ()))
+    for loop, queue in targets:
+        try:
+            loop.call_soon_threadsafe(_offer, queue, message)
+        except RuntimeError:
+            pass  # loop already closed; the stream is going away
+
+
+@contextmanager
+def subscribe(topics):
+    """Register a queue for `topics` on the running loop while in the block."""
+    entry = (asyncio.get_running_loop(), asyncio.Queue(QUEUE_SIZE))
+    with _lock:
+        for topic in topics:
+            _subscribers.setdefault(topic, set()).add(entry)
+    try:
+        yield entry[1]
+    finally:
+        with _lock:
+            for topic in topics:
+                _subscribers.get(topic, set()).discard(entry)
@@ -0,0 +1,154 @@
+"""Inverted-index search for events, products and reviews.
+
+Indexed text is split into lowercase, accent-free word tokens (no stemming)
+stored in SEARCH_TOKEN with their number of occurrences, so "Caffè" and
+"caffe" are the same token. SEARCH_TOKEN.token uses a binary collation: the
+primary key then compares tokens exactly as `tokenize` produces them. A query matches objects having
+a token that starts with any query term, ranked by the number of distinct
+terms matched, then by total occurrences.
+
+The index is kept current by model signals (registered in CoreConfig.ready)
+and can be rebuilt from scratch with `manage.py rebuild_search_index`.
+
+SQL (approximate; search("event", "wine tasting")):
+
+SELECT T."object_id",
+       MAX(CASE WHEN T."token" LIKE 'wine%' THEN 1 ELSE 0 END)
+     + MAX(CASE WHEN T."token" LIKE 'tasting%' THEN 1 ELSE 0 END) AS "matched",
+       SUM(T."hits") AS "score"
+FROM "SEARCH_TOKEN" T
+WHERE T."kind" = 'event' AND (T."token" LIKE 'wine%' OR T."token" LIKE 'tasting%')
+  [AND T."object_id" IN (SELECT ... candidates)]
+GROUP BY T."object_id"
+ORDER BY "matched" DESC, "score" DESC, T."object_id" ASC
+LIMIT 500;
+
+Terms are matched with `istartswith`: tokens and terms are both lowercase, and
+on MySQL it compiles to a plain LIKE 'term%' that the optimizer turns into a
+range scan of the (kind, token) primary key. `startswith` would compile to
+LIKE BINARY, which cannot use that key.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, Q, Sum, Value, When
+
+from .models import SearchToken
+
+TOKEN_RE = re.compile(r"\w+")
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TERMS = 8
+SEARCH_LIMIT = 500
+
+
+def sources():
+    """kind -> (model, function returning the indexed texts of an object)."""
+    from event.models import Event
+    from product.models import Product
+    from review.models import Review
+
+    return {
+        "event": (Event, lambda e: [e.title, e.description]),
+        "product": (Product, lambda p: [p.name, p.description]),
+        "review": (Review, lambda r: [r.comment]),
+    }
+
+
+def _fold(text: str) -> str:
+    """Lowercase `text` and strip its accents ("Caffè" -> "caffe")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(*texts) -> Counter:
+    """Count the folded word tokens of `texts` (None is ignored)."""
+    tokens = Counter()
+    for text in texts:
+        for token in TOKEN_RE.findall(_fold(text or "")):
+            tokens[token[:MAX_TOKEN_LENGTH]] += 1
+    return tokens
+
+
+def _rows(kind: str, obj, texts) -> list:
+    return [
+        SearchToken(kind=kind, token=token, object_id=obj.pk, hits=min(hits, 32767))
+        for token, hits in tokenize(*texts(obj)).items()
+    ]
+
+
+def index_object(kind: str, obj) -> None:
+    """(Re)write the tokens of one object."""
+    _, texts = sources()[kind]
+    with transaction.atomic():
+        SearchToken.objects.filter(kind=kind, object_id=obj.pk).delete()
+        SearchToken.objects.bulk_create(_rows(kind, obj, texts))
+
+
+def remove_object(kind: str, object_id: int) -> None:
+    """Drop the tokens of a deleted object."""
+    SearchToken.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild(kind: str, chunk_size: int = 1000) -> int:
+    """Re-index every object of `kind`; returns the number of objects."""
+    model, texts = sources()[kind]
+    count = 0
+    batch = []
+    with transaction.atomic():
+        SearchToken.objects.filter(kind=kind).delete()
+        for obj in model.objects.order_by("pk").iterator(chunk_size=chunk_size):
+            batch.extend(_rows(kind, obj, texts))
+            count += 1
+            if len(batch) >= chunk_size:
+                SearchToken.objects.bulk_create(batch)
+                batch = []
+        SearchToken.objects.bulk_create(batch)
+    return count
+
+
+def search(kind: str, query: str, limit: int = SEARCH_LIMIT, candidates=None) -> list:
+    """Ids of the objects of `kind` matching `query`, best first.
+
+    candidates: optional queryset of ids (e.g. upcoming events only) the
+    matches are restricted to before ranking, so the `limit` applies to them
+    rather than to every indexed object.
+    """
+    terms = list(tokenize(query))[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    matches = Q()
+    matched = None
+    for term in terms:
+        matches |= Q(token__istartswith=term)
+        hit = Max(
+            Case(
+                When(token__istartswith=term, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        matched = hit if matched is None else matched + hit
+    tokens = SearchToken.objects.filter(matches, kind=kind)
+    if candidates is not None:
+        tokens = tokens.filter(object_id__in=candidates)
+    rows = (
+        tokens.values("object_id")
+        .annotate(matched=matched, score=Sum("hits"))
+        .order_by("-matched", "-score", "object_id")
+        .values_list("object_id", flat=True)[:limit]
+    )
+    return list(rows)
+
+
+def ranked(queryset, ids):
+    """Restrict `queryset` to `ids`, ordered as in `ids`."""
+    if not ids:
+        return queryset.none()
+    order = Case(
+        *[When(pk=pk, then=Value(pos)) for pos, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(order)
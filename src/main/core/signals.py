@@ -0,0 +1,27 @@
+"""Signal receivers keeping the search index in step with model writes."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import search
+
+
+def _connect(kind: str, model) -> None:
+    def saved(sender, instance, **kwargs):
+        transaction.on_commit(lambda: search.index_object(kind, instance))
+
+    def deleted(sender, instance, **kwargs):
+        pk = instance.pk
+        transaction.on_commit(lambda: search.remove_object(kind, pk))
+
+    post_save.connect(
+        saved, sender=model, weak=False, dispatch_uid=f"search-{kind}-save"
+    )
+    post_delete.connect(
+        deleted, sender=model, weak=False, dispatch_uid=f"search-{kind}-delete"
+    )
+
+
+def connect_search_index() -> None:
+    for kind, (model, _) in search.sources().items():
+        _connect(kind, model)
@@ -1,3 +1,56 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
 
-# Create your tests here.
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+
+from .context_processors import live_updates
+from .pubsub import publish, subscribe
+from .search import tokenize
+
+
+class TokenizeTests(SimpleTestCase):
+    """Search tokens are lowercase words counted per object."""
+
+    def test_lowercase_word_counts(self):
+        tokens = tokenize("Wine tasting: WINE & cheese!", None)
+        self.assertEqual(tokens, {"wine": 2, "tasting": 1, "cheese": 1})
+
+    def test_accented_variants_share_a_token(self):
+        self.assertEqual(tokenize("Caffè e caffe, CAFFÉ"), {"caffe": 3, "e": 1})
+
+
+class PubSubTests(SimpleTestCase):
+    """Messages published from any thread reach the topic's subscribers."""
+
+    def test_publish_from_worker_thread(self):
+        async def listen():
+            with subscribe(["events"]) as queue:
+                worker = threading.Thread(
+                    target=publish, args=("events", {"event": 1, "remaining": 3})
+                )
+                worker.start()
+                worker.join()
+                publish("services", [])
+                return await asyncio.wait_for(queue.get(), 1), queue.qsize()
+
+        message, pending = asyncio.run(listen())
+        self.assertEqual(
+            json.loads(message),
+            {"topic": "events", "data": {"event": 1, "remaining": 3}},
+        )
+        self.assertEqual(pending, 0)
+
+
+class LiveUpdatesWsgiTests(SimpleTestCase):
+    """Under WSGI the stream is refused and pages do not open it."""
+
+    def test_stream_answers_no_content(self):
+        response = self.client.get(reverse("live_updates"))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+
+    def test_pages_are_told_not_to_connect(self):
+        request = RequestFactory().get("/events/")
+        self.assertEqual(live_updates(request), {"live_updates": False})
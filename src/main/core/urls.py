@@ -22,4 +22,5 @@ from . import views
 
 urlpatterns = [
     path("", views.homepage, name="homepage"),
+    path("live/", views.live_updates, name="live_updates"),
 ]
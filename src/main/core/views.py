@@ -1,5 +1,13 @@
+import asyncio
+
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+
+from .pubsub import subscribe
+
+LIVE_TOPICS = {"events", "services"}
+LIVE_KEEPALIVE_SECONDS = 15
 
 
 # Create your views here.
@@ -8,3 +16,40 @@ def homepage(request: HttpRequest) -> HttpResponse:
     Renders the "index.html" page when a request is made to the homepage.
     """
     return render(request, "index.html")
+
+
+async def live_updates(request: HttpRequest) -> HttpResponse:
+    """Server-sent events stream of seat and slot availability changes.
+
+    Query param `topics`: comma-separated subset of LIVE_TOPICS (default all).
+    Each change is sent as one `data:` line of JSON {"topic", "data"}; a
+    comment line is sent every LIVE_KEEPALIVE_SECONDS to keep proxies from
+    closing the connection.
+
+    Under WSGI the endless stream would be consumed to the end before
+    anything is sent, holding a worker forever; the view answers 204 instead,
+    which tells EventSource clients not to reconnect.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    topics = [
+        t for t in (request.GET.get("topics") or "").split(",") if t in LIVE_TOPICS
+    ] or sorted(LIVE_TOPICS)
+
+    async def stream():
+        with subscribe(topics) as queue:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), LIVE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,13 +1,12 @@
 """Admin configuration for the Event app.
 
 This module defines Django Admin classes and inlines to manage events and
-their subscriptions efficiently. It adds computed columns (booked/remaining),
-avoids N+1 queries, and keeps the UI compact and searchable.
+their subscriptions efficiently. It shows booked/remaining seats from the
+event's taken counter, avoids N+1 queries, and keeps the UI compact and
+searchable.
 """
 
 from django.contrib import admin
-from django.db.models import Sum, IntegerField
-from django.db.models.functions import Coalesce
 from . import models
 
 
@@ -33,7 +32,7 @@ class EventAdmin(admin.ModelAdmin):
     """Admin configuration for events.
 
     Provides:
-    - Computed columns: Booked and Remaining seats
+    - Booked and Remaining seats (from the taken counter)
     - Filters, search, ordering
     - Inline list of subscriptions (read-only)
     - Query optimizations to avoid N+1 when rendering the list
@@ -43,7 +42,7 @@ class EventAdmin(admin.ModelAdmin):
         "title",
         "event_date",
         "seats",
-        "taken",
+        "booked",
         "remaining",
         "created_by_display",
     )
@@ -52,38 +51,32 @@ class EventAdmin(admin.ModelAdmin):
     ordering = ("event_date", "title")
     inlines = [EventSubscriptionInline]
     autocomplete_fields = ("created_by",)
+    readonly_fields = ("taken",)
     list_select_related = ("created_by", "created_by__username")
     list_per_page = 25
 
     def get_queryset(self, request):
-        """Return queryset annotated with computed fields and optimized joins.
+        """Return queryset with optimized joins.
 
-        - _taken: total booked participants for the event (coalesced to 0)
-        - Uses select_related for created_by and nested username to avoid
-          additional queries when rendering display columns.
+        Uses select_related for created_by and nested username to avoid
+        additional queries when rendering display columns; booked seats come
+        from the EVENT.taken counter, so no aggregation is needed.
         """
-        qs = (
+        return (
             super()
             .get_queryset(request)
             .select_related("created_by", "created_by__username")
         )
-        return qs.annotate(
-            _taken=Coalesce(
-                Sum("subscriptions__participants"), 0, output_field=IntegerField()
-            )
-        )
 
-    @admin.display(description="Booked", ordering="_taken")
-    def taken(self, obj):
+    @admin.display(description="Booked", ordering="taken")
+    def booked(self, obj):
         """Total number of booked seats for this event."""
-        return obj._taken
+        return obj.taken
 
     @admin.display(description="Remaining")
     def remaining(self, obj):
         """Seats still available (never negative)."""
-        seats = obj.seats or 0
-        taken = obj._taken or 0
-        return max(0, seats - taken)
+        return obj.remaining
 
     @admin.display(description="Created by", ordering="created_by")
     def created_by_display(self, obj):
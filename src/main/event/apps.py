@@ -12,3 +12,7 @@ class EventConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "event"
+
+    def ready(self):
+        # Registers the signal receivers that invalidate the events list cache.
+        from . import listing  # noqa: F401
@@ -0,0 +1,51 @@
+"""Shared cache of the public events list.
+
+The public part of a list page (events with their seats/taken counters and
+the next-page cursor) is the same for every visitor, so it is cached under
+a key that includes an events-list version. Any change to events or
+subscriptions bumps the version, which retires every cached page at once:
+
+- book_event/cancel_event call `bump_events_version` on commit;
+- Event saves and deletes (admin, shell) bump it through model signals.
+
+The current user's own seats are not cached; the view fetches them with one
+small query for the visible events only.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Event
+
+EVENTS_VERSION_KEY = "event:list-version"
+EVENTS_CACHE_TTL = 600
+
+
+def events_version() -> int:
+    """Current events-list version (shared through the default cache).
+
+    Starts from the current time in milliseconds so an evicted or cleared
+    counter never hands out a version whose pages may still be cached.
+    """
+    version = cache.get(EVENTS_VERSION_KEY)
+    if version is None:
+        cache.add(EVENTS_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(EVENTS_VERSION_KEY)
+    return version
+
+
+def bump_events_version() -> None:
+    """Invalidate every cached events-list page."""
+    try:
+        cache.incr(EVENTS_VERSION_KEY)
+    except ValueError:
+        events_version()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def _event_changed(sender, **kwargs):
+    bump_events_version()
@@ -0,0 +1,133 @@
+"""Contention benchmark for event bookings.
+
+Usage:
+    python manage.py bench_event_booking --event <id> [--bookers 1,8,32]
+                                         [--seconds 3]
+
+For each concurrency level, N threads book one seat of the same event for
+distinct users as fast as they can, once with the previous strategy (lock
+every subscription of the event and sum them) and once with the taken
+counter (`event.seats`). Every booking runs in its own transaction that is
+rolled back, so the database is left unchanged; the event needs at least
+one free seat. Only successful bookings count towards bookings/s; attempts
+refused for lack of seats are reported separately. Meaningful on MySQL:
+SQLite serializes all writers anyway.
+"""
+
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from event.models import Event, EventSubscription
+from event.seats import add_participants, reserve_seats
+from user.models import User
+
+
+def _lock_all_subscriptions(event_id: int, username: str) -> bool:
+    """The former book_event transaction body."""
+    event = Event.objects.get(pk=event_id)
+    subs = EventSubscription.objects.select_for_update().filter(event_id=event_id)
+    taken = subs.aggregate(taken=Coalesce(Sum("participants"), 0))["taken"]
+    if taken + 1 > event.seats:
+        return False
+    sub = subs.filter(user_id=username).first()
+    if sub:
+        sub.participants += 1
+        sub.save(update_fields=["participants"])
+    else:
+        EventSubscription.objects.create(
+            event_id=event_id,
+            user_id=username,
+            subscription_date=timezone.now(),
+            participants=1,
+        )
+    return True
+
+
+def _taken_counter(event_id: int, username: str) -> bool:
+    if not reserve_seats(event_id, 1):
+        return False
+    add_participants(event_id, username, 1)
+    return True
+
+
+STRATEGIES = {
+    "lock-subscriptions": _lock_all_subscriptions,
+    "taken-counter": _taken_counter,
+}
+
+
+class Command(BaseCommand):
+    help = "Measure event booking throughput under concurrent bookers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, required=True)
+        parser.add_argument("--bookers", default="1,8,32")
+        parser.add_argument("--seconds", type=float, default=3.0)
+
+    def handle(self, *args, **options):
+        event_id = options["event"]
+        event = Event.objects.filter(pk=event_id).first()
+        if event is None:
+            raise CommandError(f"Event {event_id} does not exist.")
+        if event.remaining <= 0:
+            raise CommandError("The event needs at least one free seat.")
+        levels = [int(n) for n in options["bookers"].split(",") if n.strip()]
+        users = list(
+            User.objects.exclude(event_subscriptions__event_id=event_id)
+            .order_by("username")
+            .values_list("username", flat=True)[: max(levels)]
+        )
+        if not users:
+            raise CommandError("No users without a subscription to this event.")
+        if len(users) < max(levels):
+            self.stderr.write(
+                self.style.WARNING(
+                    f"Only {len(users)} users available; some bookers share a user."
+                )
+            )
+
+        self.stdout.write(
+            f"{'strategy':<20}{'bookers':>8}{'bookings/s':>12}{'failed':>8}"
+        )
+        for name, strategy in STRATEGIES.items():
+            for bookers in levels:
+                rate, failed = self._run(
+                    strategy, event_id, users, bookers, options["seconds"]
+                )
+                self.stdout.write(f"{name:<20}{bookers:>8}{rate:>12.1f}{failed:>8}")
+
+    def _run(self, strategy, event_id, users, bookers, seconds) -> tuple:
+        """Return (successful bookings per second, refused bookings)."""
+        deadline = time.monotonic() + seconds
+        start = threading.Barrier(bookers)
+        booked = [0] * bookers
+        failed = [0] * bookers
+
+        def worker(i):
+            username = users[i % len(users)]
+            try:
+                start.wait()
+                while time.monotonic() < deadline:
+                    with transaction.atomic():
+                        ok = strategy(event_id, username)
+                        transaction.set_rollback(True)
+                    if ok:
+                        booked[i] += 1
+                    else:
+                        failed[i] += 1
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(bookers)]
+        began = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sum(booked) / (time.monotonic() - began), sum(failed)
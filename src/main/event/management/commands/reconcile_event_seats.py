@@ -0,0 +1,67 @@
+"""Check EVENT.taken against the real subscription totals.
+
+Usage:
+    python manage.py reconcile_event_seats [--fix]
+
+Reports every event whose taken counter differs from
+SUM(EVENT_SUBSCRIPTION.participants); with --fix the counters are rewritten
+from the sums, each event under a row lock so concurrent bookings are not
+lost.
+
+SQL (approximate):
+
+SELECT E."id", E."title", E."taken", COALESCE(SUM(S."participants"), 0) AS "actual"
+FROM "EVENT" E
+LEFT JOIN "EVENT_SUBSCRIPTION" S ON S."event" = E."id"
+GROUP BY E."id", E."title", E."taken"
+HAVING E."taken" <> COALESCE(SUM(S."participants"), 0);
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, IntegerField, Sum
+from django.db.models.functions import Coalesce
+
+from event.listing import bump_events_version
+from event.models import Event, EventSubscription
+
+
+class Command(BaseCommand):
+    help = "Verify (and optionally repair) the per-event taken-seats counter."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix", action="store_true", help="Rewrite drifted counters."
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Event.objects.annotate(
+                actual=Coalesce(
+                    Sum("subscriptions__participants"), 0, output_field=IntegerField()
+                )
+            )
+            .exclude(taken=F("actual"))
+            .values_list("id", "title", "taken", "actual")
+        )
+        for event_id, title, taken, actual in drifted:
+            self.stdout.write(f"{event_id} {title!r}: taken={taken} actual={actual}")
+
+        if options["fix"]:
+            for event_id, *_ in drifted:
+                with transaction.atomic():
+                    Event.objects.select_for_update().get(pk=event_id)
+                    actual = EventSubscription.objects.filter(
+                        event_id=event_id
+                    ).aggregate(total=Coalesce(Sum("participants"), 0))["total"]
+                    Event.objects.filter(pk=event_id).update(taken=actual)
+            if drifted:
+                bump_events_version()
+
+        summary = f"{len(drifted)} events with a drifted counter"
+        if drifted and options["fix"]:
+            self.stdout.write(self.style.SUCCESS(summary + ", fixed."))
+        elif drifted:
+            self.stdout.write(self.style.WARNING(summary + " (use --fix)."))
+        else:
+            self.stdout.write(self.style.SUCCESS("All event counters match."))
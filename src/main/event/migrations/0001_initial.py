@@ -8,38 +8,60 @@ class Migration(migrations.Migration):
 
     initial = True
 
-    dependencies = [
-    ]
+    dependencies = []
 
     operations = [
         migrations.CreateModel(
-            name='Event',
+            name="Event",
             fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('seats', models.IntegerField()),
-                ('title', models.CharField(max_length=100)),
-                ('description', models.TextField()),
-                ('event_date', models.DateField()),
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seats", models.IntegerField()),
+                ("title", models.CharField(max_length=100)),
+                ("description", models.TextField()),
+                ("event_date", models.DateField()),
             ],
             options={
-                'verbose_name': 'Event',
-                'verbose_name_plural': 'Events',
-                'db_table': 'EVENT',
-                'managed': False,
+                "verbose_name": "Event",
+                "verbose_name_plural": "Events",
+                "db_table": "EVENT",
+                "managed": False,
             },
         ),
         migrations.CreateModel(
-            name='EventSubscription',
+            name="EventSubscription",
             fields=[
-                ('pk', models.CompositePrimaryKey('event', 'user', blank=True, editable=False, primary_key=True, serialize=False)),
-                ('subscription_date', models.DateTimeField(blank=True, null=True)),
-                ('participants', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "event",
+                        "user",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("subscription_date", models.DateTimeField(blank=True, null=True)),
+                (
+                    "participants",
+                    models.IntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)]
+                    ),
+                ),
             ],
             options={
-                'verbose_name': 'Event subscription',
-                'verbose_name_plural': 'Event subscriptions',
-                'db_table': 'EVENT_SUBSCRIPTION',
-                'managed': False,
+                "verbose_name": "Event subscription",
+                "verbose_name_plural": "Event subscriptions",
+                "db_table": "EVENT_SUBSCRIPTION",
+                "managed": False,
             },
         ),
     ]
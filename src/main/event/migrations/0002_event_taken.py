@@ -0,0 +1,85 @@
+# Generated by Django 5.2.4 on 2026-10-16 22:30
+
+from django.db import migrations, models
+
+ADD_TAKEN_SQL = [
+    "ALTER TABLE EVENT ADD COLUMN taken INT NOT NULL DEFAULT 0"
+    " CHECK (taken >= 0) AFTER seats",
+    "UPDATE EVENT e SET e.taken = (SELECT IFNULL(SUM(es.participants), 0)"
+    " FROM EVENT_SUBSCRIPTION es WHERE es.event = e.id)",
+]
+
+TAKEN_VIEW_SQL = """
+CREATE OR REPLACE VIEW fully_booked_events AS
+SELECT
+    e.id,
+    e.title,
+    e.event_date,
+    e.seats,
+    e.taken AS total_participants
+FROM EVENT e
+WHERE e.taken >= e.seats
+"""
+
+SUM_VIEW_SQL = """
+CREATE OR REPLACE VIEW fully_booked_events AS
+SELECT
+    e.id,
+    e.title,
+    e.event_date,
+    e.seats,
+    IFNULL(SUM(es.participants), 0) AS total_participants
+FROM EVENT e
+LEFT JOIN EVENT_SUBSCRIPTION es ON es.event = e.id
+GROUP BY e.id
+HAVING IFNULL(SUM(es.participants), 0) >= e.seats
+"""
+
+
+def add_taken_column(apps, schema_editor):
+    """Add and fill EVENT.taken on MySQL databases built before it was in db.sql."""
+    connection = schema_editor.connection
+    if connection.vendor != "mysql":
+        return
+    with connection.cursor() as cursor:
+        if "EVENT" not in connection.introspection.table_names(cursor):
+            return
+        columns = connection.introspection.get_table_description(cursor, "EVENT")
+    if any(column.name == "taken" for column in columns):
+        return
+    for sql in ADD_TAKEN_SQL:
+        schema_editor.execute(sql)
+
+
+def _replace_view(sql):
+    """RunPython step that redefines fully_booked_events on MySQL only."""
+
+    def run(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != "mysql":
+            return
+        with connection.cursor() as cursor:
+            if "EVENT" not in connection.introspection.table_names(cursor):
+                return
+        schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("event", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="taken",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(add_taken_column, migrations.RunPython.noop),
+        migrations.RunPython(
+            _replace_view(TAKEN_VIEW_SQL), _replace_view(SUM_VIEW_SQL)
+        ),
+    ]
@@ -11,9 +11,16 @@ from user.models import User, Employee
 
 
 class Event(models.Model):
-    """Represents an event with a title, date, seats and creator."""
+    """Represents an event with a title, date, seats and creator.
+
+    `taken` is a denormalized counter of the booked seats (the sum of
+    EVENT_SUBSCRIPTION.participants). It is updated by the booking views in
+    the same transaction as the subscription and checked by the
+    `reconcile_event_seats` command.
+    """
 
     seats = models.IntegerField()
+    taken = models.IntegerField(default=0)
     title = models.CharField(max_length=100)
     description = models.TextField()
     event_date = models.DateField()
@@ -35,6 +42,11 @@ class Event(models.Model):
         """Human-friendly representation used in admin and logs."""
         return f"{self.title} ({self.event_date:%Y-%m-%d})"
 
+    @property
+    def remaining(self) -> int:
+        """Seats still available (never negative)."""
+        return max(0, (self.seats or 0) - (self.taken or 0))
+
 
 class EventSubscription(models.Model):
     """A user's subscription to an event, with participant count."""
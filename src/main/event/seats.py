@@ -0,0 +1,74 @@
+"""Seat accounting for event bookings.
+
+Capacity is enforced on the single EVENT row: a booking increments the
+taken counter with a conditional UPDATE that only matches while the seats
+suffice, so concurrent bookers contend on one row lock for the duration of
+that statement instead of locking every subscription of the event.
+
+SQL (approximate; reserve_seats):
+
+UPDATE "EVENT" SET "taken" = "taken" + %(n)s
+WHERE "id" = %(event)s AND "taken" + %(n)s <= "seats";  -- 0 rows => not enough seats
+
+SQL (approximate; add_participants):
+
+UPDATE "EVENT_SUBSCRIPTION" SET "participants" = "participants" + %(n)s
+WHERE "event" = %(event)s AND "user" = %(user)s;
+-- 0 rows => INSERT INTO "EVENT_SUBSCRIPTION" (...) VALUES (...);
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.pubsub import publish
+
+from .models import Event, EventSubscription
+
+
+def reserve_seats(event_id: int, participants: int) -> bool:
+    """Take `participants` seats of the event if they are still free."""
+    return bool(
+        Event.objects.filter(pk=event_id, taken__lte=F("seats") - participants).update(
+            taken=F("taken") + participants
+        )
+    )
+
+
+def release_seats(event_id: int, participants: int) -> None:
+    """Give back `participants` seats of the event."""
+    Event.objects.filter(pk=event_id).update(taken=F("taken") - participants)
+
+
+def add_participants(event_id: int, username: str, participants: int) -> bool:
+    """Add participants to the user's subscription, creating it if needed.
+
+    Only the user's own row is touched. Returns True if it was created.
+    """
+    mine = EventSubscription.objects.filter(event_id=event_id, user_id=username)
+    if mine.update(participants=F("participants") + participants):
+        return False
+    try:
+        with transaction.atomic():
+            EventSubscription.objects.create(
+                event_id=event_id,
+                user_id=username,
+                subscription_date=timezone.now(),
+                participants=participants,
+            )
+        return True
+    except IntegrityError:
+        # A concurrent request of the same user created the row meanwhile.
+        mine.update(participants=F("participants") + participants)
+        return False
+
+
+def publish_seats(event_id: int) -> None:
+    """Push the event's current free seats to live listeners (after commit)."""
+    row = Event.objects.filter(pk=event_id).values("seats", "taken").first()
+    if row is None:
+        return
+    publish(
+        "events",
+        {"event": event_id, "remaining": max((row["seats"] or 0) - row["taken"], 0)},
+    )
@@ -1,26 +1,101 @@
-(function () {
-    const init = () => {
-        document.querySelectorAll('.capacity').forEach(el => {
-            const toInt = (v) => {
-                const n = parseInt(v, 10);
-                return Number.isNaN(n) ? 0 : n;
-            };
-            const seats = toInt(el.dataset.seats);
-            const remaining = toInt(el.dataset.remaining);
-            const taken = Math.max(0, seats - remaining);
-            const pct = seats > 0 ? Math.min(100, Math.round((taken / Math.max(seats, 1)) * 100)) : 0;
-            const bar = el.querySelector('.capacity-fill');
-            if (!bar) return;
+// Animate the capacity bars of the event cards found under `root`.
+function initCapacityBars(root) {
+    root.querySelectorAll('.capacity').forEach(el => {
+        if (el.dataset.ready) return;
+        el.dataset.ready = '1';
+        const bar = el.querySelector('.capacity-fill');
+        if (!bar) return;
 
-            bar.style.width = '0%';
-            requestAnimationFrame(() => {
-                bar.style.width = pct + '%';
-            });
+        bar.style.width = '0%';
+        requestAnimationFrame(() => {
+            bar.style.width = capacityPercent(el) + '%';
         });
+    });
+}
+
+function capacityPercent(el) {
+    const toInt = (v) => {
+        const n = parseInt(v, 10);
+        return Number.isNaN(n) ? 0 : n;
     };
+    const seats = toInt(el.dataset.seats);
+    const remaining = toInt(el.dataset.remaining);
+    const taken = Math.max(0, seats - remaining);
+    return seats > 0 ? Math.min(100, Math.round((taken / Math.max(seats, 1)) * 100)) : 0;
+}
+
+(function () {
+    const init = () => initCapacityBars(document);
     if (document.readyState === 'loading') {
         document.addEventListener('DOMContentLoaded', init);
     } else {
         init();
     }
 })();
+
+// "Load more": fetch the next keyset page as card markup and append it.
+(function () {
+    const more = document.getElementById('events-more');
+    const grid = document.getElementById('events-grid');
+    if (!more || !grid) return;
+
+    const pageUrl = (after, partial) => {
+        const params = new URLSearchParams(window.location.search);
+        params.set('after', after);
+        if (partial) params.set('partial', '1');
+        return `${window.location.pathname}?${params}`;
+    };
+
+    more.addEventListener('click', (evt) => {
+        evt.preventDefault();
+        more.classList.add('disabled');
+        fetch(pageUrl(more.dataset.next, true))
+            .then((r) => (r.ok ? r.text() : Promise.reject(r.status)))
+            .then((html) => {
+                const page = document.createElement('template');
+                page.innerHTML = html;
+                const marker = page.content.querySelector('.events-next');
+                const next = marker ? marker.dataset.next : '';
+                if (marker) marker.remove();
+                grid.append(page.content);
+                initCapacityBars(grid);
+                if (next) {
+                    more.dataset.next = next;
+                    more.href = pageUrl(next, false);
+                    more.classList.remove('disabled');
+                } else {
+                    more.remove();
+                }
+            })
+            .catch(() => more.classList.remove('disabled'));
+    });
+})();
+
+// Live seat counts: the server pushes {event, remaining} whenever a booking
+// or cancellation commits, so the cards stay current without reloading.
+(function () {
+    const grid = document.getElementById('events-grid');
+    if (!grid || !grid.dataset.live || !window.EventSource) return;
+
+    const source = new EventSource(grid.dataset.live);
+    source.onmessage = (msg) => {
+        let change;
+        try {
+            change = JSON.parse(msg.data).data;
+        } catch (e) {
+            return;
+        }
+        grid.querySelectorAll(`.capacity[data-event-id="${change.event}"]`).forEach((el) => {
+            el.dataset.remaining = change.remaining;
+            const bar = el.querySelector('.capacity-fill');
+            if (bar) bar.style.width = capacityPercent(el) + '%';
+            const card = el.closest('.card');
+            (card || el).querySelectorAll('.capacity-left').forEach((n) => {
+                n.textContent = change.remaining;
+            });
+            const qty = card && card.querySelector('.booking-form input[name="participants"]');
+            if (qty) qty.max = change.remaining;
+        });
+    };
+    window.addEventListener('beforeunload', () => source.close());
+})();
@@ -6,6 +6,9 @@ interaction is necessary, tests are marked to safely skip if the
 underlying tables are unmanaged or missing.
 """
 
+from datetime import date
+
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse, resolve
 from django.contrib.auth import get_user_model
@@ -13,9 +16,15 @@ from django.contrib.auth.models import AnonymousUser
 from django.test.client import RequestFactory
 from django.utils import timezone
 from unittest import skipIf
+from unittest.mock import patch
 from django.db import connection
 
+from user.models import Employee, Person, User
+
 from . import views
+from .listing import bump_events_version, events_version
+from .models import Event, EventSubscription
+from .seats import add_participants, release_seats, reserve_seats
 
 
 def _table_exists(name: str) -> bool:
@@ -63,6 +72,39 @@ class EventListViewTests(TestCase):
         self.assertIn(b"Events", resp.content)
 
 
+class EventCursorTests(TestCase):
+    """Keyset cursors round-trip and reject tampered input."""
+
+    def test_cursor_round_trip(self):
+        event = Event(pk=7, title="Harvest", event_date=date(2030, 5, 1))
+        token = views._encode_cursor(event)
+        self.assertEqual(views._decode_cursor(token), (date(2030, 5, 1), "Harvest", 7))
+        self.assertIsNone(views._decode_cursor("not-a-cursor"))
+
+
+class EventListCacheTests(TestCase):
+    """Bumping the events-list version retires every cached page."""
+
+    def test_bump_changes_version(self):
+        before = events_version()
+        bump_events_version()
+        self.assertNotEqual(events_version(), before)
+
+    def test_cleared_version_does_not_revive_old_pages(self):
+        before = events_version()
+        cache.clear()
+        with patch("event.listing.time.time", return_value=before / 1000 + 1):
+            self.assertGreater(events_version(), before)
+
+
+class EventCounterTests(TestCase):
+    """The remaining seats derive from the denormalized taken counter."""
+
+    def test_remaining_uses_taken_counter(self):
+        self.assertEqual(Event(seats=10, taken=4).remaining, 6)
+        self.assertEqual(Event(seats=10, taken=12).remaining, 0)
+
+
 @skipIf(
     not (_table_exists("EVENT") and _table_exists("EVENT_SUBSCRIPTION")),
     "Database tables for Event app are unmanaged or missing.",
@@ -89,3 +131,121 @@ class BookingFlowTests(TestCase):
         resp = self.client.post(url)
         self.assertEqual(resp.status_code, 302)
         self.assertIn("/login", resp.url)
+
+
+@skipIf(
+    not all(
+        _table_exists(t)
+        for t in ("PERSON", "USER", "EMPLOYEE", "EVENT", "EVENT_SUBSCRIPTION")
+    ),
+    "Database tables for Event app are unmanaged or missing.",
+)
+class SeatAccountingTests(TestCase):
+    """The taken counter admits bookings only while the seats suffice."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for username, cf in (
+            ("staff", "STAFFCF000000001"),
+            ("ann", "ANNCF00000000001"),
+        ):
+            person = Person.objects.create(cf=cf, name=username, surname="Test")
+            User.objects.create(
+                cf=person, username=username, email=f"{username}@x.it", password="pwd"
+            )
+        Employee.objects.create(username_id="staff", role="admin")
+        cls.ann = get_user_model().objects.create_user(username="ann", password="pwd")
+
+    def setUp(self):
+        self.event = Event.objects.create(
+            seats=4,
+            taken=0,
+            title="Harvest",
+            description="Grape harvest",
+            event_date=date(2030, 9, 1),
+            created_by_id="staff",
+        )
+
+    def _taken(self):
+        self.event.refresh_from_db(fields=["taken"])
+        return self.event.taken
+
+    def test_reserve_until_full_then_refuse(self):
+        self.assertTrue(reserve_seats(self.event.pk, 3))
+        self.assertFalse(reserve_seats(self.event.pk, 2))
+        self.assertTrue(reserve_seats(self.event.pk, 1))
+        self.assertFalse(reserve_seats(self.event.pk, 1))
+        self.assertEqual(self._taken(), 4)
+
+    def test_release_gives_seats_back(self):
+        reserve_seats(self.event.pk, 4)
+        release_seats(self.event.pk, 3)
+        self.assertEqual(self._taken(), 1)
+        self.assertTrue(reserve_seats(self.event.pk, 3))
+
+    def test_add_participants_creates_then_increments(self):
+        self.assertTrue(add_participants(self.event.pk, "ann", 2))
+        self.assertFalse(add_participants(self.event.pk, "ann", 1))
+        sub = EventSubscription.objects.get(event=self.event, user_id="ann")
+        self.assertEqual(sub.participants, 3)
+
+    def test_booking_beyond_capacity_changes_nothing(self):
+        self.client.force_login(self.ann)
+        url = reverse("event_book", args=[self.event.pk])
+        self.client.post(url, {"participants": 3})
+        self.client.post(url, {"participants": 2})
+        self.assertEqual(self._taken(), 3)
+        sub = EventSubscription.objects.get(event=self.event, user_id="ann")
+        self.assertEqual(sub.participants, 3)
+
+    def test_cancel_releases_the_subscription_seats(self):
+        self.client.force_login(self.ann)
+        self.client.post(
+            reverse("event_book", args=[self.event.pk]), {"participants": 2}
+        )
+        self.client.post(reverse("event_cancel", args=[self.event.pk]))
+        self.assertEqual(self._taken(), 0)
+        self.assertFalse(EventSubscription.objects.filter(event=self.event).exists())
+
+
+@skipIf(
+    not all(
+        _table_exists(t)
+        for t in ("PERSON", "USER", "EMPLOYEE", "EVENT", "SEARCH_TOKEN")
+    ),
+    "Database tables for Event app are unmanaged or missing.",
+)
+class EventSearchPagingTests(TestCase):
+    """Searches rank upcoming events only and page through every match."""
+
+    @classmethod
+    def setUpTestData(cls):
+        person = Person.objects.create(cf="STAFFCF000000001", name="s", surname="t")
+        User.objects.create(cf=person, username="staff", email="s@x.it", password="p")
+        Employee.objects.create(username_id="staff", role="admin")
+
+    def _event(self, day, title):
+        return Event.objects.create(
+            seats=10,
+            title=title,
+            description="Wine tasting",
+            event_date=day,
+            created_by_id="staff",
+        )
+
+    def test_pages_cover_every_upcoming_match(self):
+        today = date(2030, 1, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._event(date(2029, 12, 1), "Past wine")
+            upcoming = {
+                self._event(date(2030, 2, i), f"Wine {i}").pk for i in range(1, 16)
+            }
+        seen, after = [], ""
+        while True:
+            page = views._public_page("wine", after, today)
+            seen += [e.pk for e in page["events"]]
+            after = page["next_cursor"]
+            if not after:
+                break
+        self.assertEqual(len(seen), len(upcoming))
+        self.assertEqual(set(seen), upcoming)
@@ -1,5 +1,11 @@
-from django.db.models import Q, F, Sum, IntegerField
-from django.db.models.functions import Coalesce
+import hashlib
+import json
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from core.search import ranked, search
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
@@ -7,9 +13,13 @@ from django.utils import timezone
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import HttpRequest, HttpResponse
 from django.db import transaction
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 
+from .listing import EVENTS_CACHE_TTL, bump_events_version, events_version
 from .models import Event, EventSubscription
+from .seats import add_participants, publish_seats, release_seats, reserve_seats
 
+EVENTS_PAGE_SIZE = 12
 
 """Views for the Event app.
 
@@ -20,59 +30,121 @@ Contains:
 """
 
 
-def event_view(request: HttpRequest) -> HttpResponse:
-    """Render the events list with search and capacity annotations.
+def _encode_cursor(event: Event) -> str:
+    """Opaque keyset cursor pointing just after `event`."""
+    raw = json.dumps([event.event_date.isoformat(), event.title, event.pk])
+    return urlsafe_base64_encode(raw.encode())
 
-    Adds computed fields:
-    - taken: total seats already booked across all subscriptions
-    - remaining: seats still available (may be negative before max() in template)
-    - my_participants: seats booked by the current user (0 if anonymous)
 
-    SQL (approximate; actual SQL and quoting may vary by backend):
-
-    SELECT
-        E."id",
-        E."seats",
-        E."title",
-        E."description",
-        E."event_date",
-        E."created_by",
-        COALESCE(SUM(S."participants"), 0) AS "taken",
-        E."seats" - COALESCE(SUM(S."participants"), 0) AS "remaining",
-        COALESCE(SUM(CASE WHEN S."user" = %s THEN S."participants" ELSE 0 END), 0) AS "my_participants"
+def _decode_cursor(token: str):
+    """Return (event_date, title, id) from a cursor, or None if invalid."""
+    try:
+        day, title, pk = json.loads(urlsafe_base64_decode(token))
+        return date.fromisoformat(day), str(title), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def _public_page(q: str, after: str, today: date) -> dict:
+    """Events of one list page plus the next cursor, shared by all users.
+
+    Cached per events-list version (see `event.listing`), search and cursor.
+
+    SQL (approximate; only on a cache miss):
+
+    SELECT E.*, EM.*, U.*
     FROM "EVENT" E
-    LEFT OUTER JOIN "EVENT_SUBSCRIPTION" S ON (S."event" = E."id")
+    JOIN "EMPLOYEE" EM ON EM."username" = E."created_by"
+    JOIN "USER" U ON U."username" = EM."username"
     WHERE E."event_date" >= %s
-    GROUP BY E."id", E."seats", E."title", E."description", E."event_date", E."created_by"
-    ORDER BY E."event_date" ASC, E."title" ASC;
+      /* Optional search: one page of the upcoming ids ranked by
+         core.search, in that order */
+      /* AND E."id" IN (%page_ids) */
+      /* Next pages (no search) */
+      /* AND (E."event_date", E."title", E."id") > (%date, %title, %id) */
+    ORDER BY E."event_date" ASC, E."title" ASC, E."id" ASC
+    LIMIT %(EVENTS_PAGE_SIZE + 1)s;
     """
-    q = (request.GET.get("q") or "").strip()
-    today = timezone.localdate()
+    digest = hashlib.sha1(f"{q}|{after}".encode()).hexdigest()
+    key = f"event:list:{events_version()}:{today.isoformat()}:{digest}"
+    page = cache.get(key)
+    if page is not None:
+        return page
+
     qs = (
-        Event.objects.select_related("created_by")
+        Event.objects.select_related("created_by", "created_by__username")
         .filter(event_date__gte=today)
-        .annotate(
-            taken=Coalesce(
-                Sum("subscriptions__participants"), 0, output_field=IntegerField()
-            ),
-            remaining=F("seats")
-            - Coalesce(
-                Sum("subscriptions__participants"), 0, output_field=IntegerField()
-            ),
-            my_participants=Coalesce(
-                Sum(
-                    "subscriptions__participants",
-                    filter=Q(subscriptions__user_id=request.user.username),
-                ),
-                0,
-                output_field=IntegerField(),
-            ),
-        )
-        .order_by("event_date", "title")
+        .order_by("event_date", "title", "id")
     )
+    cursor = _decode_cursor(after)
     if q:
-        qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q))
-    return render(request, "events.html", {"events": qs, "q": q})
+        # Only upcoming events are ranked; pages follow the relevance order
+        # and the cursor resumes after its event's position in it (from the
+        # start if that event no longer matches).
+        ids = search("event", q, candidates=qs.values("id"))
+        start = 0
+        if cursor:
+            start = next((i + 1 for i, pk in enumerate(ids) if pk == cursor[2]), 0)
+        qs = ranked(qs, ids[start : start + EVENTS_PAGE_SIZE + 1])
+    elif cursor:
+        day, title, pk = cursor
+        qs = qs.filter(
+            Q(event_date__gt=day)
+            | Q(event_date=day, title__gt=title)
+            | Q(event_date=day, title=title, id__gt=pk)
+        )
+
+    events = list(qs[: EVENTS_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(events) > EVENTS_PAGE_SIZE:
+        events = events[:EVENTS_PAGE_SIZE]
+        next_cursor = _encode_cursor(events[-1])
+    page = {"events": events, "next_cursor": next_cursor}
+    cache.set(key, page, EVENTS_CACHE_TTL)
+    return page
+
+
+def event_view(request: HttpRequest) -> HttpResponse:
+    """Render the events list with search and capacity data.
+
+    Events are paginated with a keyset cursor on (event_date, title, id): the
+    `after` parameter carries the last event shown, so every page is one
+    index range scan of EVENTS_PAGE_SIZE rows however far it is. With
+    `partial=1` only the cards of the page are rendered ("load more").
+
+    The public page comes from `_public_page` (cached for all users); the
+    current user's seats are merged in from one small query.
+
+    Uses / adds:
+    - taken: seats already booked (denormalized counter on EVENT)
+    - remaining: seats still available (Event.remaining, never negative)
+    - my_participants: seats booked by the current user (0 if anonymous)
+
+    SQL (approximate; authenticated users only):
+
+    SELECT S."event", S."participants"
+    FROM "EVENT_SUBSCRIPTION" S
+    WHERE S."user" = %s AND S."event" IN (%visible_ids);
+    """
+    q = (request.GET.get("q") or "").strip()
+    page = _public_page(q, request.GET.get("after") or "", timezone.localdate())
+    events = page["events"]
+
+    mine = {}
+    if request.user.is_authenticated and events:
+        mine = dict(
+            EventSubscription.objects.filter(
+                user_id=request.user.username,
+                event_id__in=[e.pk for e in events],
+            ).values_list("event_id", "participants")
+        )
+    for e in events:
+        e.my_participants = mine.get(e.pk, 0)
+
+    context = {"events": events, "q": q, "next_cursor": page["next_cursor"]}
+    if request.GET.get("partial"):
+        return render(request, "event/partials/event_page.html", context)
+    return render(request, "events.html", context)
 
 
 @login_required
@@ -81,8 +153,9 @@ def event_view(request: HttpRequest) -> HttpResponse:
 def book_event(request: HttpRequest, event_id: int) -> HttpResponse:
     """Book one or more seats for the current authenticated user.
 
-    Validates input, enforces capacity using row locks (SELECT ... FOR UPDATE)
-    to avoid race conditions, then inserts/updates the user's subscription.
+    Validates input, then takes the seats with a conditional UPDATE of the
+    event's taken counter (see `event.seats`): concurrency is governed by that
+    single row, and only the user's own subscription row is written.
 
     SQL (approximate; executed within a transaction):
 
@@ -92,32 +165,20 @@ def book_event(request: HttpRequest, event_id: int) -> HttpResponse:
     WHERE E."id" = %s
     LIMIT 1;
 
-    -- Lock all subscriptions for this event and compute taken seats
-    SELECT COALESCE(SUM(S."participants"), 0) AS "taken"
-    FROM "EVENT_SUBSCRIPTION" S
-    WHERE S."event" = %s
-    FOR UPDATE;
+    -- Take the seats if they are still free (0 rows => not enough seats)
+    UPDATE "EVENT" SET "taken" = "taken" + %s
+    WHERE "id" = %s AND "taken" + %s <= "seats";
 
-    -- Find existing subscription for the current user (row-level lock)
-    SELECT S.*
-    FROM "EVENT_SUBSCRIPTION" S
-    WHERE S."event" = %s AND S."user" = %s
-    LIMIT 1
-    FOR UPDATE;
-
-    -- If exists: increment participants
+    -- Increment the user's subscription, or create it
     UPDATE "EVENT_SUBSCRIPTION"
     SET "participants" = "participants" + %s
     WHERE "event" = %s AND "user" = %s;
 
-    -- Else: create a new subscription
     INSERT INTO "EVENT_SUBSCRIPTION" ("event", "user", "subscription_date", "participants")
     VALUES (%s, %s, %s, %s);
     """
     event = get_object_or_404(Event, pk=event_id)
 
-    subs_qs = EventSubscription.objects.select_for_update().filter(event=event)
-
     try:
         participants = int(request.POST.get("participants", "0"))
     except ValueError:
@@ -126,35 +187,27 @@ def book_event(request: HttpRequest, event_id: int) -> HttpResponse:
         messages.error(request, "Invalid number of participants.")
         return redirect(request.POST.get("next") or "event_list")
 
-    taken = subs_qs.aggregate(taken=Coalesce(Sum("participants"), 0))["taken"]
-    remaining = event.seats - taken
-
-    if remaining <= 0:
-        messages.error(request, "Event is fully booked.")
-        return redirect(request.POST.get("next") or "event_list")
-    if participants > remaining:
-        messages.error(request, f"You can book at most {remaining} more.")
+    if not reserve_seats(event.pk, participants):
+        event.refresh_from_db(fields=["taken"])
+        remaining = event.remaining
+        if remaining <= 0:
+            messages.error(request, "Event is fully booked.")
+        else:
+            messages.error(request, f"You can book at most {remaining} more.")
         return redirect(request.POST.get("next") or "event_list")
 
-    sub = subs_qs.filter(user_id=request.user.username).first()
+    transaction.on_commit(bump_events_version)
+    transaction.on_commit(lambda: publish_seats(event.pk))
 
-    if sub:
-        sub.participants += participants
-        sub.save(update_fields=["participants"])
+    if add_participants(event.pk, request.user.username, participants):
         messages.success(
             request,
-            f"Added {participants} participant{'s' if participants != 1 else ''} to your booking for '{event.title}'.",
+            f"Booked {participants} participant{'s' if participants != 1 else ''} for '{event.title}'.",
         )
     else:
-        EventSubscription.objects.create(
-            event=event,
-            user_id=request.user.username,
-            subscription_date=timezone.now(),
-            participants=participants,
-        )
         messages.success(
             request,
-            f"Booked {participants} participant{'s' if participants != 1 else ''} for '{event.title}'.",
+            f"Added {participants} participant{'s' if participants != 1 else ''} to your booking for '{event.title}'.",
         )
     return redirect(request.POST.get("next") or "event_list")
 
@@ -166,7 +219,8 @@ def cancel_event(request: HttpRequest, event_id: int) -> HttpResponse:
     """Cancel the current user's booking for a future event.
 
     Protects past events from cancellation and uses row-level locking to
-    ensure consistent state when deleting the subscription.
+    ensure consistent state when deleting the subscription and releasing
+    its seats from the event's taken counter.
 
     SQL (approximate; executed within a transaction):
 
@@ -186,6 +240,8 @@ def cancel_event(request: HttpRequest, event_id: int) -> HttpResponse:
     -- Delete the subscription (freeing capacity)
     DELETE FROM "EVENT_SUBSCRIPTION"
     WHERE "event" = %s AND "user" = %s;
+
+    UPDATE "EVENT" SET "taken" = "taken" - %s WHERE "id" = %s;
     """
     event = get_object_or_404(Event, pk=event_id)
 
@@ -205,6 +261,9 @@ def cancel_event(request: HttpRequest, event_id: int) -> HttpResponse:
     canceled = sub.participants or 0
     title = event.title
     sub.delete()
+    release_seats(event.pk, canceled)
+    transaction.on_commit(bump_events_version)
+    transaction.on_commit(lambda: publish_seats(event.pk))
     messages.success(
         request,
         f"Canceled your booking ({canceled} participant{'s' if canceled != 1 else ''}) for '{title}'.",
@@ -11,3 +11,7 @@ class ProductConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "product"
+
+    def ready(self):
+        # Registers the signal receivers that invalidate the product catalog.
+        from . import catalog  # noqa: F401
@@ -0,0 +1,265 @@
+"""Pluggable storage for the product cart.
+
+The cart is a mapping {product_id (str): quantity}. `get_cart(request)`
+returns the store selected by settings.CART_STORE:
+
+- "session": the cart lives in the Django session (each mutation rewrites
+  the session row when sessions are database-backed);
+- "cookie": the cart lives in a signed cookie bound to the user, so it
+  costs no server-side storage at all;
+- "cache": every cart line is its own key in the "carts" cache alias and
+  quantities change with atomic `add`/`incr` calls, so mutations never
+  touch the primary database and concurrent requests never lose updates. The alias must be shared by every worker
+  (Redis, Memcached); `get_cart` refuses a process-local backend, which
+  would lose carts on every restart and split them between workers.
+
+Views mutate the cart through the store and pass their response through
+`persist()` before returning it (only the cookie store needs that).
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+CART_CACHE_ALIAS = "carts"
+CART_COOKIE = "cart"
+CART_TTL = 60 * 60 * 24 * 7
+CART_LOCK_TIMEOUT = 5
+CART_LOCK_WAIT = 1.0
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+class CartStore:
+    """Common interface of the cart backends."""
+
+    def __init__(self, request):
+        self.request = request
+
+    def items(self) -> dict:
+        """Return the cart as {product_id (str): quantity}."""
+        raise NotImplementedError
+
+    def add(self, product_id, qty: int) -> None:
+        """Increase a line by `qty`, creating it if needed."""
+        raise NotImplementedError
+
+    def set(self, product_id, qty: int) -> None:
+        """Set a line to `qty`; a quantity <= 0 removes it."""
+        raise NotImplementedError
+
+    def remove(self, product_id) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __bool__(self) -> bool:
+        return bool(self.items())
+
+    def persist(self, response):
+        """Attach pending state to the response (no-op for server-side stores)."""
+        return response
+
+
+class SessionCartStore(CartStore):
+    """Cart kept in the session under "cart"."""
+
+    def items(self) -> dict:
+        return dict(self.request.session.get("cart", {}))
+
+    def _save(self, cart: dict) -> None:
+        self.request.session["cart"] = cart
+        self.request.session.modified = True
+
+    def add(self, product_id, qty: int) -> None:
+        cart = self.items()
+        cart[str(product_id)] = cart.get(str(product_id), 0) + qty
+        self._save(cart)
+
+    def set(self, product_id, qty: int) -> None:
+        cart = self.items()
+        if qty <= 0:
+            cart.pop(str(product_id), None)
+        else:
+            cart[str(product_id)] = qty
+        self._save(cart)
+
+    def remove(self, product_id) -> None:
+        self.set(product_id, 0)
+
+    def clear(self) -> None:
+        self._save({})
+
+
+class CookieCartStore(SessionCartStore):
+    """Cart kept in a signed cookie; the signature is salted per user."""
+
+    def __init__(self, request):
+        super().__init__(request)
+        self._salt = f"product.cart:{request.user.get_username()}"
+        self._cart = None
+        self._dirty = False
+
+    def items(self) -> dict:
+        if self._cart is None:
+            raw = self.request.get_signed_cookie(CART_COOKIE, None, salt=self._salt)
+            try:
+                self._cart = json.loads(raw) if raw else {}
+            except ValueError:
+                self._cart = {}
+        return dict(self._cart)
+
+    def _save(self, cart: dict) -> None:
+        self._cart = cart
+        self._dirty = True
+
+    def persist(self, response):
+        if self._dirty:
+            if self._cart:
+                response.set_signed_cookie(
+                    CART_COOKIE,
+                    json.dumps(self._cart, separators=(",", ":")),
+                    salt=self._salt,
+                    max_age=CART_TTL,
+                    httponly=True,
+                    samesite="Lax",
+                )
+            else:
+                response.delete_cookie(CART_COOKIE, samesite="Lax")
+            self._dirty = False
+        return response
+
+
+class CacheCartStore(CartStore):
+    """Cart kept in the "carts" cache, one key per line plus an index.
+
+    Keys, for user U:
+    - cart:U             index {"gen": <token>, "lines": [product ids]}
+    - cart:U:<gen>:<pid> quantity of a line (created with add, bumped with incr)
+    - cart:U:lock        short-lived mutex guarding index rewrites
+
+    Quantities change with single atomic `add`/`incr`/`set` calls, so two
+    requests of the same user never lose each other's increments. The index
+    is rewritten only when a line appears or disappears, under the mutex, so
+    removed lines leave nothing behind. Every mutation restarts the index
+    TTL together with the line's. Line keys carry the index generation: if
+    the index expires or is culled, or the cart is cleared, a new generation
+    starts and leftover lines can never reappear.
+    """
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.cache = caches[CART_CACHE_ALIAS]
+        self.key = f"cart:{request.user.get_username()}"
+
+    def _qty_key(self, gen: str, product_id) -> str:
+        return f"{self.key}:{gen}:{product_id}"
+
+    def _index(self) -> dict:
+        """Return the index, starting a new generation if there is none."""
+        index = self.cache.get(self.key)
+        if index is None:
+            self.cache.add(self.key, {"gen": uuid4().hex, "lines": []}, CART_TTL)
+            index = self.cache.get(self.key) or {"gen": uuid4().hex, "lines": []}
+        return index
+
+    @contextmanager
+    def _locked(self):
+        lock = f"{self.key}:lock"
+        deadline = time.monotonic() + CART_LOCK_WAIT
+        acquired = self.cache.add(lock, 1, CART_LOCK_TIMEOUT)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.01)
+            acquired = self.cache.add(lock, 1, CART_LOCK_TIMEOUT)
+        try:
+            yield
+        finally:
+            if acquired:
+                self.cache.delete(lock)
+
+    def _index_line(self, index: dict, product_id: str, present: bool) -> None:
+        """Add or drop a line in the index and restart the index TTL."""
+        if (product_id in index["lines"]) == present:
+            self.cache.touch(self.key, CART_TTL)
+            return
+        with self._locked():
+            current = self.cache.get(self.key)
+            if current is None or current["gen"] != index["gen"]:
+                return  # cleared or expired meanwhile; the line is gone too
+            lines = set(current["lines"])
+            if present:
+                lines.add(product_id)
+            else:
+                lines.discard(product_id)
+            current["lines"] = sorted(lines)
+            self.cache.set(self.key, current, CART_TTL)
+
+    def items(self) -> dict:
+        index = self.cache.get(self.key)
+        if not index or not index["lines"]:
+            return {}
+        keys = {self._qty_key(index["gen"], pid): pid for pid in index["lines"]}
+        found = self.cache.get_many(list(keys))
+        return {keys[key]: qty for key, qty in found.items() if qty > 0}
+
+    def add(self, product_id, qty: int) -> None:
+        product_id = str(product_id)
+        index = self._index()
+        key = self._qty_key(index["gen"], product_id)
+        if not self.cache.add(key, qty, CART_TTL):
+            try:
+                self.cache.incr(key, qty)
+                self.cache.touch(key, CART_TTL)
+            except ValueError:
+                # The line expired between add() and incr(); recreate it.
+                self.cache.set(key, qty, CART_TTL)
+        self._index_line(index, product_id, True)
+
+    def set(self, product_id, qty: int) -> None:
+        if qty <= 0:
+            self.remove(product_id)
+            return
+        product_id = str(product_id)
+        index = self._index()
+        self.cache.set(self._qty_key(index["gen"], product_id), qty, CART_TTL)
+        self._index_line(index, product_id, True)
+
+    def remove(self, product_id) -> None:
+        product_id = str(product_id)
+        index = self.cache.get(self.key)
+        if index is None:
+            return
+        self.cache.delete(self._qty_key(index["gen"], product_id))
+        self._index_line(index, product_id, False)
+
+    def clear(self) -> None:
+        # Line keys of the old generation are unreachable and simply expire.
+        self.cache.delete(self.key)
+
+
+CART_STORES = {
+    "session": SessionCartStore,
+    "cookie": CookieCartStore,
+    "cache": CacheCartStore,
+}
+
+
+def get_cart(request) -> CartStore:
+    """Return the cart store configured by settings.CART_STORE."""
+    store = getattr(settings, "CART_STORE", "session")
+    if store == "cache":
+        backend = settings.CACHES.get(CART_CACHE_ALIAS, {}).get("BACKEND")
+        if backend in PROCESS_LOCAL_CACHES:
+            raise ImproperlyConfigured(
+                f'CART_STORE = "cache" needs a shared "{CART_CACHE_ALIAS}" cache '
+                f"(Redis, Memcached), not {backend}."
+            )
+    return CART_STORES[store](request)
@@ -0,0 +1,126 @@
+"""Process-local cache of the product catalog.
+
+PRODUCT is small and rarely changes, yet the product list, the cart pages,
+the cart endpoints and checkout all read it. `catalog` keeps, per process,
+the products sorted by (name, id) plus an id -> product map, tagged with a
+catalog version shared through Django's cache. Product saves and deletes
+(admin, shell, fixtures) bump the version through model signals; every
+process notices on its next read and reloads. A TTL bounds staleness should
+a version bump be missed (e.g. raw SQL changes).
+
+SQL (approximate; once per reload):
+
+SELECT P.* FROM "PRODUCT" P ORDER BY P."name" ASC, P."id" ASC;
+"""
+
+import threading
+import time
+from bisect import bisect_right
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Product
+
+CATALOG_VERSION_KEY = "product:catalog-version"
+CATALOG_TTL_SECONDS = 300
+
+
+def catalog_version() -> int:
+    """Current catalog version (shared through the default cache).
+
+    Starts from the current time in milliseconds so a cache flush never hands
+    out a version a process may still hold.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version() -> None:
+    """Make every process reload its catalog on the next read."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        catalog_version()
+
+
+class Catalog:
+    """Thread-safe, lazily loaded snapshot of PRODUCT."""
+
+    def __init__(self, ttl: float = CATALOG_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._version = None
+        self._products = []
+        self._keys = []
+        self._by_id = {}
+
+    def _populate(self, products, version) -> None:
+        """Replace the content with `products` read at `version`."""
+        ordered = sorted(products, key=lambda p: (p.name, p.pk))
+        self._products = ordered
+        self._keys = [(p.name, p.pk) for p in ordered]
+        self._by_id = {p.pk: p for p in ordered}
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def _current(self):
+        """Return (products, by_id, keys), reloading first if stale."""
+        version = catalog_version()
+        with self._lock:
+            if (
+                self._loaded_at is None
+                or self._version != version
+                or time.monotonic() - self._loaded_at > self.ttl
+            ):
+                self._populate(Product.objects.order_by("name", "id"), version)
+            return self._products, self._by_id, self._keys
+
+    def invalidate(self) -> None:
+        """Drop the content; the next read reloads it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def products(self) -> list:
+        """All products sorted by (name, id). Do not mutate the instances."""
+        return self._current()[0]
+
+    def page(self, after=None, limit: int = 24) -> list:
+        """Up to `limit` products following the (name, id) key `after`.
+
+        Keyset pagination over the sorted snapshot: one bisect, however deep
+        the page.
+        """
+        products, _, keys = self._current()
+        start = bisect_right(keys, tuple(after)) if after else 0
+        return products[start : start + limit]
+
+    def get(self, product_id):
+        """Return the product with `product_id`, or None."""
+        return self._current()[1].get(product_id)
+
+    def in_bulk(self, ids) -> dict:
+        """Map each existing id of `ids` to its product."""
+        by_id = self._current()[1]
+        return {pk: by_id[pk] for pk in ids if pk in by_id}
+
+    def prices(self) -> dict:
+        """Return {product_id: price} for every product."""
+        return {pk: p.price for pk, p in self._current()[1].items()}
+
+    def __contains__(self, product_id) -> bool:
+        return product_id in self._current()[1]
+
+
+catalog = Catalog()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def _product_changed(sender, **kwargs):
+    bump_catalog_version()
@@ -0,0 +1,80 @@
+"""Checkout insert benchmark.
+
+Usage:
+    python manage.py bench_checkout [--lines 1,10,100] [--repeat 20]
+
+For each cart size, places the same order repeatedly with the previous
+strategy (one INSERT per order line) and with the batched insert used by
+checkout (`product.orders.place_order`). Every order runs in its own
+transaction that is rolled back, so the database is left unchanged. Both
+strategies read prices from PRODUCT with one query, so only the inserts
+differ. Carts use distinct products, so a size is capped at the number of
+products.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from product.models import Orders, Product
+from product.orders import place_order
+from user.models import User
+
+
+def _row_by_row(username: str, cart: dict):
+    """The former checkout body: one statement per order line."""
+    products = Product.objects.in_bulk([int(pid) for pid in cart])
+    order = Orders.objects.create(username_id=username, date=timezone.now())
+    with connection.cursor() as cur:
+        for pid, qty in cart.items():
+            cur.execute(
+                """
+                INSERT INTO ORDER_DETAIL (`order`, `product`, `quantity`, `unit_price`)
+                VALUES (%s, %s, %s, %s)
+                """,
+                [order.id, int(pid), int(qty), str(products[int(pid)].price)],
+            )
+
+
+STRATEGIES = {
+    "row-by-row": _row_by_row,
+    "batched": place_order,
+}
+
+
+class Command(BaseCommand):
+    help = "Measure checkout latency for carts of different sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", default="1,10,100")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        username = (
+            User.objects.order_by("username").values_list("username", flat=True).first()
+        )
+        if username is None:
+            raise CommandError("At least one user is needed to place orders.")
+        sizes = [int(n) for n in options["lines"].split(",") if n.strip()]
+        product_ids = list(
+            Product.objects.order_by("id").values_list("id", flat=True)[: max(sizes)]
+        )
+        if not product_ids:
+            raise CommandError("At least one product is needed to place orders.")
+
+        self.stdout.write(f"{'strategy':<12}{'lines':>7}{'ms/order':>10}")
+        for name, strategy in STRATEGIES.items():
+            for size in sizes:
+                cart = {str(pid): 1 for pid in product_ids[:size]}
+                elapsed = self._run(strategy, username, cart, options["repeat"])
+                self.stdout.write(f"{name:<12}{len(cart):>7}{elapsed * 1000:>10.2f}")
+
+    def _run(self, strategy, username, cart, repeat) -> float:
+        began = time.perf_counter()
+        for _ in range(repeat):
+            with transaction.atomic():
+                strategy(username, cart)
+                transaction.set_rollback(True)
+        return (time.perf_counter() - began) / repeat
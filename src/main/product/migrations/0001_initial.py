@@ -8,50 +8,94 @@ class Migration(migrations.Migration):
 
     initial = True
 
-    dependencies = [
-    ]
+    dependencies = []
 
     operations = [
         migrations.CreateModel(
-            name='OrderDetail',
+            name="OrderDetail",
             fields=[
-                ('pk', models.CompositePrimaryKey('order', 'product', blank=True, editable=False, primary_key=True, serialize=False)),
-                ('quantity', models.IntegerField(validators=[django.core.validators.MinValueValidator(1)])),
-                ('unit_price', models.DecimalField(decimal_places=2, max_digits=8, validators=[django.core.validators.MinValueValidator(0.01)])),
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "order",
+                        "product",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "quantity",
+                    models.IntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)]
+                    ),
+                ),
+                (
+                    "unit_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=8,
+                        validators=[django.core.validators.MinValueValidator(0.01)],
+                    ),
+                ),
             ],
             options={
-                'verbose_name': 'Order detail',
-                'verbose_name_plural': 'Order details',
-                'db_table': 'ORDER_DETAIL',
-                'managed': False,
+                "verbose_name": "Order detail",
+                "verbose_name_plural": "Order details",
+                "db_table": "ORDER_DETAIL",
+                "managed": False,
             },
         ),
         migrations.CreateModel(
-            name='Orders',
+            name="Orders",
             fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('date', models.DateTimeField(blank=True, null=True)),
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateTimeField(blank=True, null=True)),
             ],
             options={
-                'verbose_name': 'Order',
-                'verbose_name_plural': 'Orders',
-                'db_table': 'ORDERS',
-                'managed': False,
+                "verbose_name": "Order",
+                "verbose_name_plural": "Orders",
+                "db_table": "ORDERS",
+                "managed": False,
             },
         ),
         migrations.CreateModel(
-            name='Product',
+            name="Product",
             fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
-                ('name', models.CharField(max_length=100)),
-                ('description', models.TextField()),
-                ('price', models.DecimalField(decimal_places=2, max_digits=8, validators=[django.core.validators.MinValueValidator(0.01)])),
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("description", models.TextField()),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=8,
+                        validators=[django.core.validators.MinValueValidator(0.01)],
+                    ),
+                ),
             ],
             options={
-                'verbose_name': 'Product',
-                'verbose_name_plural': 'Products',
-                'db_table': 'PRODUCT',
-                'managed': False,
+                "verbose_name": "Product",
+                "verbose_name_plural": "Products",
+                "db_table": "PRODUCT",
+                "managed": False,
             },
         ),
     ]
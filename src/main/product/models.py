@@ -56,6 +56,11 @@ class OrderDetail(models.Model):
         verbose_name = "Order detail"
         verbose_name_plural = "Order details"
 
+    @property
+    def line_total(self):
+        """Quantity times unit price."""
+        return self.quantity * self.unit_price
+
     def __str__(self) -> str:
         return f"OrderDetail(order={getattr(self.order, 'id', '?')}, product={getattr(self.product, 'id', '?')})"
 
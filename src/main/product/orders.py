@@ -0,0 +1,61 @@
+"""Order placement for the product cart.
+
+`place_order` writes the order header and all of its lines with one batched
+INSERT (`bulk_create`), so the number of statements in the checkout
+transaction no longer grows with the cart size. The created lines are
+returned with their products attached, ready for the confirmation page.
+Prices are read from PRODUCT inside the checkout transaction, never from the
+process-local catalog cache, so an order is always charged current prices.
+
+SQL (approximate; within the caller's transaction):
+
+SELECT * FROM "PRODUCT" WHERE "id" IN (%s, %s, ...);
+
+INSERT INTO "ORDERS" ("username", "date") VALUES (%s, %s);
+
+INSERT INTO "ORDER_DETAIL" ("order", "product", "quantity", "unit_price")
+VALUES (%s, %s, %s, %s), (%s, %s, %s, %s), ...;
+"""
+
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .models import OrderDetail, Orders, Product
+
+
+def order_lines(order: Orders, cart: dict, products: dict) -> list:
+    """Build (unsaved) OrderDetail rows for the cart lines with a known product.
+
+    cart: {product_id (str or int): quantity}; products: {id: Product}.
+    """
+    lines = []
+    for pid, qty in cart.items():
+        product = products.get(int(pid))
+        if product is None:
+            continue
+        lines.append(
+            OrderDetail(
+                order=order,
+                product=product,
+                quantity=int(qty),
+                unit_price=product.price,
+            )
+        )
+    return lines
+
+
+def place_order(username: str, cart: dict):
+    """Create an order for the cart; returns (order, lines, total).
+
+    Returns (None, [], 0) when no cart line refers to an existing product.
+    Must run inside a transaction.
+    """
+    ids = [int(pid) for pid in cart]
+    products = Product.objects.in_bulk(ids)
+    if not products:
+        return None, [], Decimal("0.00")
+    order = Orders.objects.create(username_id=username, date=timezone.now())
+    lines = OrderDetail.objects.bulk_create(order_lines(order, cart, products))
+    total = sum((line.line_total for line in lines), Decimal("0.00"))
+    return order, lines, total
@@ -1,6 +1,9 @@
+// Cart interactions go through the JSON endpoints (one request, no redirect);
+// if a request fails the form is submitted normally instead.
 document.addEventListener('DOMContentLoaded', () => {
     const debounce = (fn, delay = 300) => { let t; return (...args) => { clearTimeout(t); t = setTimeout(() => fn(...args), delay); }; };
     const updateFormSelector = 'form[action$="/cart/update/"]';
+    const cart = document.getElementById('cart');
 
     const guardedSubmit = (form) => {
         if (!form || form.dataset.submitting === '1') return;
@@ -8,11 +11,71 @@ document.addEventListener('DOMContentLoaded', () => {
         form.requestSubmit();
     };
 
+    const postJson = (url, form) => fetch(url, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: { Accept: 'application/json' },
+        credentials: 'same-origin',
+    }).then((r) => (r.ok ? r.json() : Promise.reject(r.status)));
+
+    const render = (data, row) => {
+        if (!cart) return;
+        if (!data.count) {
+            window.location.reload();
+            return;
+        }
+        cart.querySelectorAll('.cart-total').forEach((el) => { el.textContent = data.total; });
+        if (!row) return;
+        if (data.line) {
+            row.querySelector('.line-total').textContent = data.line.line_total;
+        } else {
+            row.remove();
+        }
+    };
+
+    // Quantity changes: debounced JSON update of the line and the totals.
     document.querySelectorAll(`${updateFormSelector} input[name="qty"]`).forEach(input => {
-        const submit = debounce(() => guardedSubmit(input.form));
-        input.addEventListener('input', submit);
-        // Removed 'change' handler to avoid double submit on blur/navigation
+        const form = input.form;
+        const send = debounce(() => {
+            if (!cart || input.value === '') return;
+            postJson(cart.dataset.update, form)
+                .then((data) => render(data, form.closest('tr')))
+                .catch(() => guardedSubmit(form));
+        });
+        input.addEventListener('input', send);
+        form.addEventListener('submit', (evt) => {
+            if (form.dataset.submitting === '1' || !cart) return;
+            evt.preventDefault();
+            send();
+        });
     });
 
-    // No plus/minus buttons: rely on user typing. The debounced input handler will submit.
-});
\ No newline at end of file
+    // Remove buttons.
+    document.querySelectorAll('form[action$="/cart/remove/"]').forEach((form) => {
+        form.addEventListener('submit', (evt) => {
+            if (form.dataset.submitting === '1' || !cart) return;
+            evt.preventDefault();
+            postJson(cart.dataset.remove, form)
+                .then((data) => render(data, form.closest('tr')))
+                .catch(() => guardedSubmit(form));
+        });
+    });
+
+    // "Add to cart" on the product cards: stay on the page. Delegated, so
+    // cards appended by infinite scroll are covered too.
+    document.addEventListener('submit', (evt) => {
+        const form = evt.target.closest('form[data-json]');
+        if (!form || form.dataset.submitting === '1') return;
+        evt.preventDefault();
+        const button = form.querySelector('button[type="submit"]');
+        postJson(form.dataset.json, form)
+            .then((data) => {
+                if (!button) return;
+                button.dataset.label = button.dataset.label || button.textContent;
+                button.textContent = `In cart: ${data.line ? data.line.qty : 0}`;
+                clearTimeout(button.resetTimer);
+                button.resetTimer = setTimeout(() => { button.textContent = button.dataset.label; }, 1500);
+            })
+            .catch(() => guardedSubmit(form));
+    });
+});
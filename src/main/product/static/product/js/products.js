@@ -0,0 +1,51 @@
+// Infinite scroll for the product list: when the "Load more" link comes into
+// view, fetch the next keyset page as JSON and append its cards. Without JS
+// the link still works as a plain next-page link.
+(function () {
+    const more = document.getElementById('products-more');
+    const grid = document.getElementById('products-grid');
+    if (!more || !grid) return;
+
+    let loading = false;
+    let observer = null;
+    const loadNext = () => {
+        if (loading || !more.dataset.next) return;
+        loading = true;
+        more.classList.add('disabled');
+        const params = new URLSearchParams({ after: more.dataset.next, size: more.dataset.size });
+        if (more.dataset.q) params.set('q', more.dataset.q);
+        fetch(`${more.dataset.url}?${params}`, { headers: { Accept: 'application/json' } })
+            .then((r) => (r.ok ? r.json() : Promise.reject(r.status)))
+            .then((data) => {
+                const page = document.createElement('template');
+                page.innerHTML = data.html;
+                grid.append(page.content);
+                if (data.next) {
+                    more.dataset.next = data.next;
+                    more.href = `?${new URLSearchParams({ ...Object.fromEntries(params), after: data.next })}`;
+                    more.classList.remove('disabled');
+                    if (observer) {
+                        // Re-arm: fires again if the link is still in view.
+                        observer.unobserve(more);
+                        observer.observe(more);
+                    }
+                } else {
+                    more.dataset.next = '';
+                    more.remove();
+                }
+            })
+            .catch(() => more.classList.remove('disabled'))
+            .finally(() => { loading = false; });
+    };
+
+    more.addEventListener('click', (evt) => {
+        evt.preventDefault();
+        loadNext();
+    });
+    if ('IntersectionObserver' in window) {
+        observer = new IntersectionObserver((entries) => {
+            if (entries.some((e) => e.isIntersecting)) loadNext();
+        }, { rootMargin: '400px' });
+        observer.observe(more);
+    }
+})();
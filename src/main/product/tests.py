@@ -4,11 +4,28 @@ Lightweight tests verify URL routing and authentication requirements
 without depending on unmanaged database tables.
 """
 
-from django.test import TestCase
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
 from django.urls import reverse, resolve
 from django.contrib.auth import get_user_model
 
 from . import views
+from .cart import (
+    CART_CACHE_ALIAS,
+    CART_COOKIE,
+    CacheCartStore,
+    CookieCartStore,
+    get_cart,
+)
+from .models import Orders, Product
+from .orders import order_lines
+from .catalog import bump_catalog_version, catalog, catalog_version
 
 
 class UrlsTests(TestCase):
@@ -23,6 +40,7 @@ class UrlsTests(TestCase):
         self.assertEqual(reverse("update_cart"), "/cart/update/")
         self.assertEqual(reverse("remove_from_cart"), "/cart/remove/")
         self.assertEqual(reverse("checkout"), "/cart/checkout/")
+        self.assertEqual(reverse("update_cart_json"), "/cart/api/update/")
 
 
 class AuthGuardTests(TestCase):
@@ -39,3 +57,167 @@ class AuthGuardTests(TestCase):
         resp = self.client.post(reverse("checkout"))
         self.assertEqual(resp.status_code, 302)
         self.assertIn("/login", resp.url)
+
+
+class OrderLinesTests(SimpleTestCase):
+    """Cart lines become order rows priced at the current product price."""
+
+    def test_lines_skip_unknown_products(self):
+        order = Orders(id=7)
+        products = {1: Product(id=1, name="Honey", price=Decimal("4.50"))}
+        lines = order_lines(order, {"1": 3, "2": 1}, products)
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0].order_id, 7)
+        self.assertEqual(lines[0].product_id, 1)
+        self.assertEqual(lines[0].line_total, Decimal("13.50"))
+
+
+class CartStoreTests(SimpleTestCase):
+    """Cart backends keep {product_id: qty} lines per user."""
+
+    def _request(self, username="ann", cookies=None):
+        request = RequestFactory().get("/cart/")
+        request.user = SimpleNamespace(get_username=lambda: username)
+        request.COOKIES.update(cookies or {})
+        return request
+
+    def test_cache_store_increments_lines(self):
+        caches[CART_CACHE_ALIAS].clear()
+        cart = CacheCartStore(self._request())
+        cart.add(1, 2)
+        cart.add(1, 3)
+        cart.add(5, 1)
+        cart.set(5, 4)
+        self.assertEqual(cart.items(), {"1": 5, "5": 4})
+        cart.remove(1)
+        self.assertEqual(CacheCartStore(self._request()).items(), {"5": 4})
+        self.assertEqual(CacheCartStore(self._request("bob")).items(), {})
+        cart.clear()
+        cart.add(5, 1)
+        self.assertEqual(cart.items(), {"5": 1})
+
+    def test_cache_store_interleaved_adds_keep_both(self):
+        caches[CART_CACHE_ALIAS].clear()
+        first = CacheCartStore(self._request())
+        second = CacheCartStore(self._request())
+        index_line = first._index_line
+
+        def interleaved(index, product_id, present):
+            # The other request runs between this add's increment and its
+            # index update.
+            second.add(1, 3)
+            second.add(2, 1)
+            index_line(index, product_id, present)
+
+        first._index_line = interleaved
+        first.add(1, 2)
+        self.assertEqual(CacheCartStore(self._request()).items(), {"1": 5, "2": 1})
+
+    def test_cache_store_drops_lines_from_index(self):
+        caches[CART_CACHE_ALIAS].clear()
+        cart = CacheCartStore(self._request())
+        cart.add(3, 1)
+        cart.add(4, 1)
+        cart.remove(3)
+        self.assertEqual(caches[CART_CACHE_ALIAS].get("cart:ann")["lines"], ["4"])
+        caches[CART_CACHE_ALIAS].delete("cart:ann")
+        cart.add(4, 2)
+        self.assertEqual(cart.items(), {"4": 2})
+
+    @override_settings(CART_STORE="cache")
+    def test_cache_store_needs_shared_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_cart(self._request())
+
+    def test_cookie_store_is_bound_to_user(self):
+        cart = CookieCartStore(self._request())
+        cart.add(2, 1)
+        response = cart.persist(HttpResponse())
+        cookie = {CART_COOKIE: response.cookies[CART_COOKIE].value}
+        self.assertEqual(
+            CookieCartStore(self._request(cookies=cookie)).items(), {"2": 1}
+        )
+        self.assertEqual(CookieCartStore(self._request("bob", cookie)).items(), {})
+
+
+class CartSummaryTests(SimpleTestCase):
+    """JSON cart responses are priced from the catalog cache."""
+
+    def setUp(self):
+        products = [
+            Product(id=1, name="Honey", price=Decimal("4.50")),
+            Product(id=2, name="Eggs", price=Decimal("2.00")),
+        ]
+        catalog._populate(products, catalog_version())
+        self.addCleanup(catalog.invalidate)
+
+    def test_line_and_total(self):
+        summary = views._cart_summary({"1": 3, "2": 1, "9": 5}, 1)
+        self.assertEqual(
+            summary,
+            {
+                "line": {
+                    "product_id": 1,
+                    "qty": 3,
+                    "unit_price": "4.50",
+                    "line_total": "13.50",
+                },
+                "total": "15.50",
+                "count": 3,
+            },
+        )
+
+    def test_removed_line_is_null(self):
+        self.assertIsNone(views._cart_summary({"2": 1}, 1)["line"])
+
+
+class CatalogTests(SimpleTestCase):
+    """The catalog serves products by (name, id) until the version moves."""
+
+    def setUp(self):
+        self.addCleanup(catalog.invalidate)
+
+    def test_sorted_and_versioned(self):
+        catalog._populate(
+            [
+                Product(id=3, name="Jam", price=Decimal("3.00")),
+                Product(id=1, name="Honey", price=Decimal("4.50")),
+                Product(id=2, name="Honey", price=Decimal("5.00")),
+            ],
+            catalog_version(),
+        )
+        self.assertEqual([p.pk for p in catalog.products()], [1, 2, 3])
+        self.assertEqual(catalog.in_bulk([3, 9, 1]).keys(), {3, 1})
+        self.assertIn(2, catalog)
+        bump_catalog_version()
+        self.assertNotEqual(catalog._version, catalog_version())
+
+
+class ProductPageTests(SimpleTestCase):
+    """Product pages follow (name, id) keys, or relevance order with a query."""
+
+    def setUp(self):
+        catalog._populate(
+            [
+                Product(id=i, name=name, description="", price=Decimal("1.00"))
+                for i, name in enumerate(["Apples", "Eggs", "Eggs", "Honey", "Jam"], 1)
+            ],
+            catalog_version(),
+        )
+        self.addCleanup(catalog.invalidate)
+
+    def _walk(self, q=""):
+        seen, after = [], ""
+        while True:
+            page = views._product_page(q, after, 2)
+            seen.append([p.pk for p in page["products"]])
+            after = page["next_cursor"]
+            if not after:
+                return seen, page["total"]
+
+    def test_keyset_pages_cover_catalog_once(self):
+        self.assertEqual(self._walk(), ([[1, 2], [3, 4], [5]], 5))
+
+    @patch("product.views.search", return_value=[4, 2, 5])
+    def test_search_pages_keep_relevance_order(self, _search):
+        self.assertEqual(self._walk("x"), ([[4, 2], [5]], 3))
@@ -1,29 +1,41 @@
 """URL patterns for the Product app.
 
 Routes:
-- GET  /products/          -> product catalog with optional search
+- GET  /products/          -> product catalog with optional search (paged)
+- GET  /products/page/     -> JSON: next product page for infinite scroll
 - GET  /cart/              -> current user's shopping cart
 - POST /cart/add/          -> add a product/qty to cart
 - POST /cart/update/       -> update quantities in cart
 - POST /cart/remove/       -> remove a product from cart
 - POST /cart/checkout/     -> create order and order details (auth)
+- POST /cart/api/add/      -> JSON: add to cart, returns line and totals
+- POST /cart/api/update/   -> JSON: set a quantity, returns line and totals
+- POST /cart/api/remove/   -> JSON: remove a line, returns totals
 """
 
 from django.urls import path
 from .views import (
     product_view,
+    product_page_json,
     cart_view,
     add_to_cart,
     update_cart,
     remove_from_cart,
     checkout,
+    add_to_cart_json,
+    update_cart_json,
+    remove_from_cart_json,
 )
 
 urlpatterns = [
     path("products/", product_view, name="product_list"),
+    path("products/page/", product_page_json, name="product_page"),
     path("cart/", cart_view, name="cart"),
     path("cart/add/", add_to_cart, name="add_to_cart"),
     path("cart/update/", update_cart, name="update_cart"),
     path("cart/remove/", remove_from_cart, name="remove_from_cart"),
     path("cart/checkout/", checkout, name="checkout"),
+    path("cart/api/add/", add_to_cart_json, name="add_to_cart_json"),
+    path("cart/api/update/", update_cart_json, name="update_cart_json"),
+    path("cart/api/remove/", remove_from_cart_json, name="remove_from_cart_json"),
 ]
@@ -1,68 +1,142 @@
 from django.shortcuts import render, redirect
-from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db import transaction, connection
+from django.views.decorators.http import require_POST
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from decimal import Decimal
-from django.utils import timezone
+import json
 
-from .models import Product, Orders
+from core.search import search
+from .cart import get_cart
+from .catalog import catalog
+from .orders import place_order
 
 """Views for the Product app.
 
 Contains:
-- product_view: list/search for products
+- product_view: list/search for products, one keyset page at a time
+- product_page_json: next product page for infinite scroll
 - cart_view: render cart contents and totals
-- add_to_cart/update_cart/remove_from_cart: mutate session-based cart
-- checkout: create an order and insert order details (parameterized SQL)
+- add_to_cart/update_cart/remove_from_cart: mutate the cart (see product.cart)
+- add_to_cart_json/update_cart_json/remove_from_cart_json: JSON variants for cart.js
+- checkout: create an order with all its details in one batched insert
 """
 
+PRODUCTS_PAGE_SIZE = 24
+PRODUCTS_MAX_PAGE_SIZE = 96
 
-def _get_cart(session) -> dict:
-    return session.setdefault("cart", {})
 
+def _encode_cursor(product) -> str:
+    """Opaque keyset cursor pointing just after `product`."""
+    return urlsafe_base64_encode(json.dumps([product.name, product.pk]).encode())
 
-def _save_cart(session, cart: dict) -> None:
-    session["cart"] = cart
-    session.modified = True
+
+def _decode_cursor(token: str):
+    """Return (name, id) from a cursor, or None if invalid."""
+    try:
+        name, pk = json.loads(urlsafe_base64_decode(token))
+        return str(name), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def _page_size(request: HttpRequest) -> int:
+    """The `size` query parameter, clamped to [1, PRODUCTS_MAX_PAGE_SIZE]."""
+    try:
+        size = int(request.GET.get("size", PRODUCTS_PAGE_SIZE))
+    except ValueError:
+        size = PRODUCTS_PAGE_SIZE
+    return max(1, min(size, PRODUCTS_MAX_PAGE_SIZE))
+
+
+def _product_page(q: str, after: str, size: int) -> dict:
+    """One page of the product list plus the next cursor and the match count.
+
+    Without a query pages are keyset ranges of the catalog ordered by
+    (name, id). With one, results keep their relevance order and the cursor
+    resumes after its product's position in that order (from the start if
+    that product no longer matches).
+    """
+    cursor = _decode_cursor(after) if after else None
+    if q:
+        results = list(catalog.in_bulk(search("product", q)).values())
+        start = 0
+        if cursor:
+            start = next((i + 1 for i, p in enumerate(results) if p.pk == cursor[1]), 0)
+        window = results[start : start + size + 1]
+        total = len(results)
+    else:
+        window = catalog.page(cursor, size + 1)
+        total = len(catalog.products())
+    next_cursor = None
+    if len(window) > size:
+        window = window[:size]
+        next_cursor = _encode_cursor(window[-1])
+    return {"products": window, "next_cursor": next_cursor, "total": total}
 
 
 def product_view(request: HttpRequest) -> HttpResponse:
-    """Render product list with optional case-insensitive name search.
-
-    SQL (approximate):
-    SELECT P.*
-    FROM "PRODUCT" P
-    /* Optional filter */
-    /* WHERE P."name" ILIKE %q% */
-    ORDER BY P."name" ASC;
+    """Render one page of the product list with optional search (see core.search).
+
+    Without a query products are listed by name; with one they are ranked
+    by matched terms of their name and description. Terms match word
+    prefixes, not substrings: "win" finds "Wine", "ine" does not. Products are read from
+    the process-local catalog (see product.catalog), not from PRODUCT.
+    `after` carries the last product shown and `size` the page size
+    (default PRODUCTS_PAGE_SIZE); product_page_json serves the next pages.
     """
     q = request.GET.get("q", "").strip()
-    products = Product.objects.all().order_by("name")
-    if q:
-        products = products.filter(name__icontains=q)
-    return render(request, "products.html", {"products": products, "q": q})
+    size = _page_size(request)
+    page = _product_page(q, request.GET.get("after") or "", size)
+    return render(request, "products.html", {**page, "q": q, "size": size})
+
+
+def product_page_json(request: HttpRequest) -> JsonResponse:
+    """Next page of the product list for infinite scroll.
+
+    Same parameters as product_view. Returns the products as data and as
+    rendered cards, plus the cursor of the following page (null at the end).
+    """
+    q = request.GET.get("q", "").strip()
+    page = _product_page(q, request.GET.get("after") or "", _page_size(request))
+    html = render_to_string(
+        "product/partials/product_list.html",
+        {"products": page["products"]},
+        request=request,
+    )
+    return JsonResponse(
+        {
+            "products": [
+                {
+                    "id": p.pk,
+                    "name": p.name,
+                    "description": p.description,
+                    "price": f"{p.price:.2f}",
+                }
+                for p in page["products"]
+            ],
+            "html": html,
+            "next": page["next_cursor"],
+        }
+    )
 
 
 @login_required(login_url="login")
 def cart_view(request: HttpRequest) -> HttpResponse:
     """Render the cart page, computing line totals and grand total.
 
-    SQL (approximate; only executed if there are product IDs in cart):
-    SELECT P.*
-    FROM "PRODUCT" P
-    WHERE P."id" IN (%ids)
-    ORDER BY P."name" ASC;
+    Products come from the catalog cache, so the page runs no PRODUCT query.
     """
-    cart = _get_cart(request.session)
-    ids = [int(pid) for pid in cart.keys()]
-    products = Product.objects.filter(id__in=ids).order_by("name") if ids else []
+    cart = get_cart(request).items()
+    by_id = catalog.in_bulk(int(pid) for pid in cart)
     items = []
     total = Decimal("0.00")
-    by_id = {str(p.id): p for p in products}
     for pid, qty in cart.items():
-        p = by_id.get(str(pid))
+        p = by_id.get(int(pid))
         if not p:
             continue
         line_total = Decimal(qty) * p.price
@@ -80,7 +154,11 @@ def add_to_cart(request: HttpRequest) -> HttpResponse:
     qty_raw = request.POST.get("qty", "1")
     if not pid:
         return HttpResponseBadRequest("Missing product_id")
-    if not Product.objects.filter(id=pid).exists():
+    try:
+        pid = int(pid)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid product")
+    if pid not in catalog:
         return HttpResponseBadRequest("Invalid product")
 
     try:
@@ -88,11 +166,10 @@ def add_to_cart(request: HttpRequest) -> HttpResponse:
     except (TypeError, ValueError):
         qty = 1
 
-    cart = _get_cart(request.session)
-    cart[str(pid)] = cart.get(str(pid), 0) + qty
-    _save_cart(request.session, cart)
+    cart = get_cart(request)
+    cart.add(pid, qty)
     messages.success(request, "Added to cart.")
-    return redirect(request.POST.get("next") or reverse("cart"))
+    return cart.persist(redirect(request.POST.get("next") or reverse("cart")))
 
 
 @login_required(login_url="login")
@@ -108,14 +185,10 @@ def update_cart(request: HttpRequest) -> HttpResponse:
         qty = int(qty)
     except ValueError:
         return HttpResponseBadRequest("Invalid qty")
-    cart = _get_cart(request.session)
-    if qty <= 0:
-        cart.pop(str(pid), None)
-    else:
-        cart[str(pid)] = qty
-    _save_cart(request.session, cart)
+    cart = get_cart(request)
+    cart.set(pid, qty)
     messages.success(request, "Cart updated.")
-    return redirect(reverse("cart"))
+    return cart.persist(redirect(reverse("cart")))
 
 
 @login_required(login_url="login")
@@ -124,11 +197,84 @@ def remove_from_cart(request: HttpRequest) -> HttpResponse:
     if request.method != "POST":
         return HttpResponseBadRequest("Invalid method")
     pid = request.POST.get("product_id")
-    cart = _get_cart(request.session)
-    cart.pop(str(pid), None)
-    _save_cart(request.session, cart)
+    cart = get_cart(request)
+    cart.remove(pid)
     messages.success(request, "Item removed from cart.")
-    return redirect(reverse("cart"))
+    return cart.persist(redirect(reverse("cart")))
+
+
+def _cart_summary(items: dict, pid) -> dict:
+    """JSON body for the cart endpoints: the changed line plus cart totals.
+
+    Prices come from the catalog cache (see product.catalog); lines whose
+    product no longer exists are left out of the totals, as in cart_view.
+    """
+    prices = catalog.prices()
+    total = Decimal("0.00")
+    for line_pid, qty in items.items():
+        price = prices.get(int(line_pid))
+        if price is not None:
+            total += Decimal(qty) * price
+    qty = items.get(str(pid), 0)
+    price = prices.get(int(pid))
+    line = None
+    if qty and price is not None:
+        line = {
+            "product_id": int(pid),
+            "qty": qty,
+            "unit_price": f"{price:.2f}",
+            "line_total": f"{Decimal(qty) * price:.2f}",
+        }
+    return {"line": line, "total": f"{total:.2f}", "count": len(items)}
+
+
+def _json_qty(request: HttpRequest, default=None):
+    """Parse (product_id, qty) from the POST body; qty may be None if absent."""
+    try:
+        pid = int(request.POST.get("product_id", ""))
+    except ValueError:
+        return None, None
+    try:
+        qty = int(request.POST.get("qty", default))
+    except (TypeError, ValueError):
+        qty = None
+    return pid, qty
+
+
+@login_required(login_url="login")
+@require_POST
+def add_to_cart_json(request: HttpRequest) -> JsonResponse:
+    """JSON variant of add_to_cart; returns the changed line and totals."""
+    pid, qty = _json_qty(request, "1")
+    if pid is None or pid not in catalog:
+        return JsonResponse({"error": "Invalid product."}, status=400)
+    cart = get_cart(request)
+    cart.add(pid, max(1, qty or 1))
+    return cart.persist(JsonResponse(_cart_summary(cart.items(), pid)))
+
+
+@login_required(login_url="login")
+@require_POST
+def update_cart_json(request: HttpRequest) -> JsonResponse:
+    """JSON variant of update_cart; qty <= 0 removes the line."""
+    pid, qty = _json_qty(request)
+    if pid is None or qty is None or (qty > 0 and pid not in catalog):
+        return JsonResponse({"error": "Invalid product or quantity."}, status=400)
+    cart = get_cart(request)
+    cart.set(pid, qty)
+    return cart.persist(JsonResponse(_cart_summary(cart.items(), pid)))
+
+
+@login_required(login_url="login")
+@require_POST
+def remove_from_cart_json(request: HttpRequest) -> JsonResponse:
+    """JSON variant of remove_from_cart."""
+    pid, _ = _json_qty(request)
+    if pid is None:
+        return JsonResponse({"error": "Invalid product."}, status=400)
+    cart = get_cart(request)
+    cart.remove(pid)
+    return cart.persist(JsonResponse(_cart_summary(cart.items(), pid)))
 
 
 @login_required(login_url="login")
@@ -136,46 +282,37 @@ def remove_from_cart(request: HttpRequest) -> HttpResponse:
 def checkout(request: HttpRequest) -> HttpResponse:
     """Create an order with details from the current cart and clear it.
 
+    All order lines are written with one multi-row INSERT (see
+    `product.orders.place_order`); the confirmation page is rendered from
+    the created rows without reading them back.
+
     SQL (approximate; within a transaction):
     -- Create order (executed via ORM)
     INSERT INTO "ORDERS" ("username", "date") VALUES (%s, %s) RETURNING id;  -- backend-dependent
 
-    -- Insert order lines (executed with a parameterized cursor)
+    -- Insert all order lines at once
     INSERT INTO ORDER_DETAIL (`order`, `product`, `quantity`, `unit_price`)
-    VALUES (%s, %s, %s, %s);
+    VALUES (%s, %s, %s, %s), (%s, %s, %s, %s), ...;
     """
     if request.method != "POST":
         return HttpResponseBadRequest("Invalid method")
-    cart = _get_cart(request.session)
-    if not cart:
+    cart = get_cart(request)
+    items = cart.items()
+    if not items:
         messages.error(request, "Your cart is empty.")
         return redirect(reverse("cart"))
 
-    ids = [int(pid) for pid in cart.keys()]
-    products = {p.id: p for p in Product.objects.filter(id__in=ids)}
-    if not products:
+    order, lines, total = place_order(request.user.username, items)
+    if order is None:
         messages.error(request, "No valid products in cart.")
         return redirect(reverse("cart"))
 
-    order = Orders.objects.create(
-        username_id=request.user.username,
-        date=timezone.now(),
-    )
-
-    with connection.cursor() as cur:
-        for pid_str, qty in cart.items():
-            pid = int(pid_str)
-            p = products.get(pid)
-            if not p:
-                continue
-            cur.execute(
-                """
-                INSERT INTO ORDER_DETAIL (`order`, `product`, `quantity`, `unit_price`)
-                VALUES (%s, %s, %s, %s)
-                """,
-                [order.id, pid, int(qty), str(p.price)],
-            )
-
-    _save_cart(request.session, {})
+    cart.clear()
     messages.success(request, "Order placed successfully.")
-    return redirect(reverse("cart"))
+    return cart.persist(
+        render(
+            request,
+            "order_confirmation.html",
+            {"order": order, "lines": lines, "total": total},
+        )
+    )
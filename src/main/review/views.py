@@ -7,11 +7,11 @@ approximate SQL to document what Django executes under the hood.
 from django.shortcuts import get_object_or_404, redirect, render
 from django.http import Http404, HttpRequest, HttpResponse, HttpResponseForbidden
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from django.contrib import messages
 
+from core.search import ranked, search
 from user.views import _ensure_datetime
 from .models import Review
 from service.models import BookingDetail
@@ -23,7 +23,9 @@ def review_view(request: HttpRequest) -> HttpResponse:
     """List and filter reviews for services and events.
 
     Supported GET filters: target(service|event|all), service_type, rating_min,
-    rating_max, username, q, order(newest|oldest|rating_desc|rating_asc), page.
+    rating_max, username, q, order(relevance|newest|oldest|rating_desc|rating_asc),
+    page. `q` goes through the SEARCH_TOKEN index (see core.search); with
+    order=relevance matches are ranked by matched terms.
 
     Approx SQL (simplified):
         SELECT r.*
@@ -62,16 +64,28 @@ def review_view(request: HttpRequest) -> HttpResponse:
     if username:
         qs = qs.filter(user__username__icontains=username)
 
-    if q:
-        qs = qs.filter(Q(comment__icontains=q) | Q(event__title__icontains=q))
-
     ordering_map = {
         "newest": "-created_at",
         "oldest": "created_at",
         "rating_desc": "-rating",
         "rating_asc": "rating",
     }
-    qs = qs.order_by(ordering_map.get(order, "-created_at"))
+    if q:
+        # Comment matches first (ranked), then reviews of matching events.
+        ids = search("review", q)
+        event_ids = search("event", q)
+        if event_ids:
+            ids += [
+                pk
+                for pk in Review.objects.filter(event_id__in=event_ids)
+                .exclude(pk__in=ids)
+                .values_list("pk", flat=True)
+            ]
+        qs = qs.filter(pk__in=ids)
+    if q and order == "relevance":
+        qs = ranked(qs, ids)
+    else:
+        qs = qs.order_by(ordering_map.get(order, "-created_at"))
 
     paginator = Paginator(qs, 10)
     page_obj = paginator.get_page(page)
@@ -4,7 +4,10 @@ This improves display helpers, pagination, and inline filtering to show only the
 relevant inline (Restaurant or Room) based on Service.type.
 """
 
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
+
+from .cancellation import CancellationRefused, cancel_bookings
 from .models import Booking, Service, Restaurant, Room
 
 
@@ -34,11 +37,22 @@ class BookingAdmin(admin.ModelAdmin):
     autocomplete_fields = ("username",)
     readonly_fields = ("booking_date",)
     list_per_page = 50
+    actions = ("cancel_selected",)
 
     @admin.display(description="User", ordering="username")
     def username_display(self, obj):
         return getattr(obj.username, "username", "") or ""
 
+    @admin.action(description="Cancel selected bookings (not started)")
+    def cancel_selected(self, request, queryset):
+        try:
+            with transaction.atomic():
+                cancelled = cancel_bookings(queryset.values_list("id", flat=True))
+        except CancellationRefused as exc:
+            self.message_user(request, str(exc), level=messages.ERROR)
+            return
+        self.message_user(request, f"{cancelled} bookings cancelled.")
+
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
@@ -0,0 +1,370 @@
+"""Per-process availability index for rooms and restaurant tables.
+
+The index keeps, for every service, the booked intervals sorted by start
+together with a running maximum of their end datetimes. Answering "is this
+service free in [start, end)?" is then a bisect plus one lookup, so searches
+never run an overlap query against BOOKING_DETAIL.
+
+The index is loaded lazily with two queries and kept current by the booking
+write paths through `record_booking_change`, which also bumps a booking-change
+version counter stored in Django's cache. A process whose index was built for
+another version (i.e. a different worker wrote meanwhile) reloads it. The
+index is advisory: the write paths still validate against the database, so a
+stale index can only hide or show a result, never cause a double booking.
+
+SQL (approximate; executed once per load):
+
+SELECT S."id", S."type", RO."max_capacity", R."max_capacity"
+FROM "SERVICE" S
+LEFT JOIN "ROOM" RO ON RO."service" = S."id"
+LEFT JOIN "RESTAURANT" R ON R."service" = S."id";
+
+SELECT BD."service", BD."start_date", BD."end_date"
+FROM "BOOKING_DETAIL" BD
+WHERE BD."end_date" >= %(today)s
+ORDER BY BD."service", BD."start_date";
+"""
+
+import logging
+import threading
+import time as monotonic_time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from core.pubsub import publish
+
+from .models import Service, BookingDetail
+from .occupancy import refresh_occupancy, services_active_now
+from .results_cache import invalidate_intervals
+
+INDEX_TTL_SECONDS = 300
+BOOKING_VERSION_KEY = "service:booking-version"
+
+# Room stays run from check-in afternoon to check-out morning.
+CHECK_IN_TIME = time(14, 0)
+CHECK_OUT_TIME = time(10, 0)
+
+logger = logging.getLogger(__name__)
+
+
+def stay_bounds(check_in: date, check_out: date) -> tuple:
+    """Booked (start, end) datetimes of a room stay, as the write paths store it.
+
+    A same-day stay lasts one night, like `inventory.stay_nights`. Room
+    searches compare these bounds half-open against BOOKING_DETAIL, the same
+    rule the booking views enforce, so a check-out morning and a check-in
+    afternoon on the same day do not collide.
+    """
+    check_out = max(check_out, check_in + timedelta(days=1))
+    return (
+        datetime.combine(check_in, CHECK_IN_TIME),
+        datetime.combine(check_out, CHECK_OUT_TIME),
+    )
+
+
+def booking_version() -> int:
+    """Current booking-change version (shared through the default cache).
+
+    The counter starts from the current time in milliseconds so a cache flush
+    never hands out a version seen before.
+    """
+    version = cache.get(BOOKING_VERSION_KEY)
+    if version is None:
+        cache.add(BOOKING_VERSION_KEY, int(monotonic_time.time() * 1000), None)
+        version = cache.get(BOOKING_VERSION_KEY)
+    return version
+
+
+def bump_booking_version() -> int:
+    """Advance the booking-change version and return the new value."""
+    try:
+        return cache.incr(BOOKING_VERSION_KEY)
+    except ValueError:
+        booking_version()
+        return cache.incr(BOOKING_VERSION_KEY)
+
+
+def _aware(value: datetime) -> datetime:
+    """Interpret naive datetimes like the ORM does (default time zone)."""
+    if timezone.is_naive(value):
+        return timezone.make_aware(value, timezone.get_default_timezone())
+    return value
+
+
+class _Timeline:
+    """Sorted booked intervals of a single service."""
+
+    __slots__ = ("starts", "ends", "max_end")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.max_end = []
+
+    @classmethod
+    def from_intervals(cls, intervals) -> "_Timeline":
+        """Build a timeline from (start, end) pairs in one pass after sorting."""
+        tl = cls()
+        for start, end in sorted(intervals):
+            tl.starts.append(start)
+            tl.ends.append(end)
+            tl.max_end.append(end if not tl.max_end else max(end, tl.max_end[-1]))
+        return tl
+
+    def _refresh_from(self, i: int) -> None:
+        running = self.max_end[i - 1] if i > 0 else None
+        for j in range(i, len(self.ends)):
+            end = self.ends[j]
+            running = end if running is None or end > running else running
+            self.max_end[j] = running
+
+    def add(self, start: datetime, end: datetime) -> None:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.max_end.insert(i, end)
+        self._refresh_from(i)
+
+    def remove(self, start: datetime, end: datetime) -> bool:
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ends[i] == end:
+                del self.starts[i]
+                del self.ends[i]
+                del self.max_end[i]
+                self._refresh_from(i)
+                return True
+            i += 1
+        return False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Return True if any interval overlaps [start, end)."""
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.max_end[i - 1] > start
+
+    def stay_windows(self, first_day: date, last_day: date, nights: int, limit: int):
+        """Earliest non-overlapping stays of `nights` with check-in in range.
+
+        One sweep over the sorted intervals: a candidate check-in either fits
+        before the next booking or jumps past that booking's end. Stays use
+        `stay_bounds` and the half-open overlap of the room search.
+        """
+        windows = []
+        check_in = first_day
+        i = 0
+        n = len(self.starts)
+        while check_in <= last_day and len(windows) < limit:
+            check_out = check_in + timedelta(days=nights)
+            stay_start, stay_end = map(_aware, stay_bounds(check_in, check_out))
+            while i < n and self.ends[i] <= stay_start:
+                i += 1
+            blocker = None
+            for j in range(i, n):
+                if self.starts[j] >= stay_end:
+                    break
+                if self.ends[j] > stay_start:
+                    blocker = (
+                        self.ends[j] if blocker is None else max(blocker, self.ends[j])
+                    )
+            if blocker is None:
+                windows.append((check_in, check_out))
+                check_in = check_out
+                continue
+            resume = timezone.localtime(blocker, timezone.get_default_timezone()).date()
+            if _aware(datetime.combine(resume, CHECK_IN_TIME)) < blocker:
+                resume += timedelta(days=1)
+            check_in = max(resume, check_in + timedelta(days=1))
+        return windows
+
+
+class AvailabilityIndex:
+    """Thread-safe, lazily loaded interval index over BOOKING_DETAIL."""
+
+    def __init__(self, ttl: float = INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._version = None
+        self._services = {}
+        self._timelines = {}
+
+    def _populate(self, services, rows, version) -> None:
+        """Replace the index content.
+
+        services: iterable of (service_id, type, capacity)
+        rows: iterable of (service_id, start_dt, end_dt)
+        version: booking version the rows were read at
+        """
+        self._version = version
+        self._services = {sid: (stype, cap or 0) for sid, stype, cap in services}
+        intervals = {}
+        for sid, start, end in rows:
+            intervals.setdefault(sid, []).append((_aware(start), _aware(end)))
+        self._timelines = {
+            sid: _Timeline.from_intervals(pairs) for sid, pairs in intervals.items()
+        }
+        self._loaded_at = monotonic_time.monotonic()
+
+    def _timeline(self, service_id: int) -> _Timeline:
+        tl = self._timelines.get(service_id)
+        if tl is None:
+            tl = self._timelines[service_id] = _Timeline()
+        return tl
+
+    def load(self) -> None:
+        """(Re)build the index from the database."""
+        version = booking_version()
+        services = [
+            (sid, stype, room_cap if stype == "ROOM" else table_cap)
+            for sid, stype, room_cap, table_cap in Service.objects.values_list(
+                "id", "type", "room__max_capacity", "restaurant__max_capacity"
+            )
+        ]
+        today = datetime.combine(timezone.localdate(), time.min)
+        rows = (
+            BookingDetail.objects.filter(end_date__gte=today)
+            .order_by("service_id", "start_date")
+            .values_list("service_id", "start_date", "end_date")
+        )
+        with self._lock:
+            self._populate(services, rows, version)
+
+    def invalidate(self) -> None:
+        """Drop the content; the next read reloads it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if (
+            loaded_at is None
+            or monotonic_time.monotonic() - loaded_at > self.ttl
+            or booking_version() != self._version
+        ):
+            self.load()
+
+    def apply(self, version: int, added=(), removed=()) -> None:
+        """Apply this process's own committed change, tagged with `version`.
+
+        If another change happened since the index was built, the index is
+        dropped instead and reloaded on the next read.
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if self._version != version - 1:
+                self._loaded_at = None
+                return
+            for service_id, start, end in added:
+                self.add(service_id, start, end)
+            for service_id, start, end in removed:
+                self.remove(service_id, start, end)
+            self._version = version
+
+    def add(self, service_id: int, start: datetime, end: datetime) -> None:
+        """Record a new booked interval (call after the row is committed)."""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._timeline(service_id).add(_aware(start), _aware(end))
+
+    def remove(self, service_id: int, start: datetime, end: datetime) -> None:
+        """Forget a booked interval (call after the row is deleted)."""
+        with self._lock:
+            if self._loaded_at is not None and service_id in self._timelines:
+                self._timelines[service_id].remove(_aware(start), _aware(end))
+
+    def is_free(self, service_id: int, start: datetime, end: datetime) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            tl = self._timelines.get(service_id)
+            return tl is None or not tl.overlaps(_aware(start), _aware(end))
+
+    def free_services(
+        self,
+        service_type: str,
+        start: datetime,
+        end: datetime,
+        people: int,
+    ) -> list:
+        """Return ids of services of a type free in the window, sorted by id."""
+        start, end = _aware(start), _aware(end)
+        with self._lock:
+            self._ensure_loaded()
+            free = []
+            for sid, (stype, capacity) in self._services.items():
+                if stype != service_type or capacity < people:
+                    continue
+                tl = self._timelines.get(sid)
+                if tl is None or not tl.overlaps(start, end):
+                    free.append(sid)
+        free.sort()
+        return free
+
+    def free_stay_windows(
+        self,
+        nights: int,
+        people: int,
+        first_day: date,
+        last_day: date,
+        limit: int = 3,
+    ) -> dict:
+        """Map room service id -> earliest free (check_in, check_out) windows.
+
+        Only rooms with enough capacity and at least one window are returned;
+        check-in days are bounded by [first_day, last_day].
+        """
+        empty = _Timeline()
+        with self._lock:
+            self._ensure_loaded()
+            result = {}
+            for sid, (stype, capacity) in self._services.items():
+                if stype != "ROOM" or capacity < people:
+                    continue
+                tl = self._timelines.get(sid, empty)
+                windows = tl.stay_windows(first_day, last_day, nights, limit)
+                if windows:
+                    result[sid] = windows
+        return result
+
+
+availability_index = AvailabilityIndex()
+
+
+def record_booking_change(added=(), removed=()) -> int:
+    """Publish a committed booking change; returns the new booking version.
+
+    added/removed: iterables of (service_id, start_dt, end_dt). With
+    FREE_SERVICES_SNAPSHOT on, changes that cover the present also refresh the
+    SERVICE_OCCUPANCY snapshot; the booking is already committed, so a failed
+    refresh is only logged (the periodic `refresh_occupancy` repairs it).
+    Live listeners of the "services" topic receive the touched intervals.
+    """
+    added, removed = list(added), list(removed)
+    changed = added + removed
+    version = bump_booking_version()
+    availability_index.apply(version, added, removed)
+    invalidate_intervals(changed)
+    if settings.FREE_SERVICES_SNAPSHOT:
+        current = services_active_now(changed)
+        if current:
+            try:
+                with transaction.atomic():
+                    refresh_occupancy(current)
+            except DatabaseError:
+                logger.exception(
+                    "Occupancy refresh failed for services %s", sorted(current)
+                )
+    publish(
+        "services",
+        [
+            {"service": sid, "start": start, "end": end, "booked": booked}
+            for booked, rows in ((True, added), (False, removed))
+            for sid, start, end in rows
+        ],
+    )
+    return version
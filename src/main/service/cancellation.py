@@ -0,0 +1,70 @@
+"""Set-based cancellation of one or many bookings.
+
+Ownership and start dates of the whole batch are validated with a single
+aggregated query; the inventory rows, details and bookings are then removed
+with one statement per table inside the caller's transaction.
+
+SQL (approximate; validation):
+
+SELECT COUNT(DISTINCT B."id"),
+       COUNT(DISTINCT B."id") FILTER (WHERE B."username" <> %(user)s),
+       COUNT(BD."service") FILTER (WHERE BD."start_date" < %(now)s)
+FROM "BOOKING" B
+LEFT JOIN "BOOKING_DETAIL" BD ON BD."booking" = B."id"
+WHERE B."id" IN (%ids);
+
+SQL (approximate; removal):
+
+SELECT "service", "start_date", "end_date" FROM "BOOKING_DETAIL" WHERE "booking" IN (%ids);
+DELETE FROM "ROOM_NIGHT" WHERE "booking" IN (%ids);
+UPDATE "TABLE_SLOT" SET "booking" = NULL WHERE "booking" IN (%ids);
+DELETE FROM "BOOKING_DETAIL" WHERE "booking" IN (%ids);
+DELETE FROM "BOOKING" WHERE "id" IN (%ids);
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .availability import record_booking_change
+from .models import Booking, BookingDetail, RoomNight, TableSlot
+
+
+class CancellationRefused(Exception):
+    """Raised when a batch contains foreign, missing or started bookings."""
+
+
+def cancel_bookings(booking_ids, username=None, now=None) -> int:
+    """Cancel every booking in `booking_ids`, or none of them.
+
+    username: owner the bookings must belong to; None skips the ownership
+    check (staff). Returns the number of cancelled bookings. Must run inside
+    a transaction.
+    """
+    ids = set(booking_ids)
+    if not ids:
+        return 0
+    now = now or timezone.now()
+
+    aggregates = {
+        "found": Count("id", distinct=True),
+        "started": Count("details", filter=Q(details__start_date__lt=now)),
+    }
+    if username is not None:
+        aggregates["foreign"] = Count(
+            "id", distinct=True, filter=~Q(username_id=username)
+        )
+    checks = Booking.objects.filter(id__in=ids).aggregate(**aggregates)
+    if checks["found"] != len(ids) or checks.get("foreign"):
+        raise CancellationRefused("You can only cancel your own bookings.")
+    if checks["started"]:
+        raise CancellationRefused("Cannot cancel a booking that has already started.")
+
+    details = BookingDetail.objects.filter(booking_id__in=ids)
+    freed = list(details.values_list("service_id", "start_date", "end_date"))
+    RoomNight.objects.filter(booking_id__in=ids).delete()
+    TableSlot.objects.filter(booking_id__in=ids).update(booking=None)
+    details.delete()
+    Booking.objects.filter(id__in=ids).delete()
+    transaction.on_commit(lambda: record_booking_change(removed=freed))
+    return len(ids)
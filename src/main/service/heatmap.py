@@ -0,0 +1,116 @@
+"""Occupancy matrix (heatmap) of rooms and restaurant tables.
+
+`build_matrix` expands bookings into one dense row per service: a cell per
+day for rooms (the nights of a stay) and a cell per (day, meal) for tables.
+Each booking only marks the edges of its span in a difference array; one
+prefix sum per row then yields the counts, so a booking costs O(1)
+regardless of its length and the whole matrix is built in a single pass
+over the rows. A cell above 1 means the service is overbooked there.
+
+`occupancy_matrix` feeds it from a single BOOKING_DETAIL range query and
+caches the result per booking version (see `service.availability`), so any
+booking write invalidates it.
+
+SQL (approximate):
+
+SELECT S."id", S."type", RO."code", R."code"
+FROM "SERVICE" S
+LEFT JOIN "ROOM" RO ON RO."service" = S."id"
+LEFT JOIN "RESTAURANT" R ON R."service" = S."id"
+WHERE S."type" IN ('ROOM', 'RESTAURANT');
+
+SELECT BD."service", BD."start_date", BD."end_date"
+FROM "BOOKING_DETAIL" BD
+WHERE BD."start_date" < %(window_end)s AND BD."end_date" > %(window_start)s;
+"""
+
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .availability import _aware, booking_version
+from .models import BookingDetail, Service
+
+HEATMAP_CACHE_TTL = 3600
+
+
+def _local(value: datetime) -> datetime:
+    return timezone.localtime(_aware(value), timezone.get_default_timezone())
+
+
+def build_matrix(first_day: date, days: int, services, rows, meal_times) -> dict:
+    """Return {"rooms": {id: [per day]}, "tables": {id: [per day x meal]}}.
+
+    services: iterable of (service_id, type)
+    rows: iterable of (service_id, start_dt, end_dt)
+    meal_times: ordered meal start times; a table booking falls in the last
+    meal starting at or before its start time.
+    """
+    meals = len(meal_times)
+    width = {"ROOM": days, "RESTAURANT": days * meals}
+    diffs = {}
+    kinds = {}
+    for sid, stype in services:
+        if stype in width:
+            kinds[sid] = stype
+            diffs[sid] = [0] * (width[stype] + 1)
+
+    for sid, start, end in rows:
+        stype = kinds.get(sid)
+        if stype is None:
+            continue
+        start, end = _local(start), _local(end)
+        if stype == "ROOM":
+            first = (start.date() - first_day).days
+            last = (end.date() - first_day).days
+            last = max(last, first + 1)
+        else:
+            meal = sum(1 for t in meal_times[1:] if t <= start.time())
+            first = (start.date() - first_day).days * meals + meal
+            last = first + 1
+        first, last = max(first, 0), min(last, width[stype])
+        if first >= last:
+            continue
+        diff = diffs[sid]
+        diff[first] += 1
+        diff[last] -= 1
+
+    matrix = {"rooms": {}, "tables": {}}
+    for sid, diff in diffs.items():
+        key = "rooms" if kinds[sid] == "ROOM" else "tables"
+        matrix[key][sid] = list(accumulate(diff[:-1]))
+    return matrix
+
+
+def occupancy_matrix(first_day: date, days: int, meal_times) -> dict:
+    """Cached occupancy matrix for [first_day, first_day + days)."""
+    key = f"service:heatmap:{booking_version()}:{first_day.isoformat()}:{days}"
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    services = list(
+        Service.objects.filter(type__in=("ROOM", "RESTAURANT"))
+        .order_by("type", "id")
+        .values_list("id", "type", "room__code", "restaurant__code")
+    )
+    window_start = datetime.combine(first_day, time.min)
+    window_end = datetime.combine(first_day + timedelta(days=days), time.min)
+    rows = BookingDetail.objects.filter(
+        start_date__lt=window_end, end_date__gt=window_start
+    ).values_list("service_id", "start_date", "end_date")
+
+    result = build_matrix(
+        first_day,
+        days,
+        [(sid, stype) for sid, stype, _, _ in services],
+        rows.iterator(),
+        meal_times,
+    )
+    result["codes"] = {
+        sid: room_code or table_code for sid, _, room_code, table_code in services
+    }
+    cache.set(key, result, HEATMAP_CACHE_TTL)
+    return result
@@ -0,0 +1,99 @@
+"""Discrete booking inventory for services.
+
+Rooms are sold by the night: booking a stay inserts one ROOM_NIGHT row per
+night, and the (service, night) primary key turns a concurrent double booking
+into a duplicate-key error instead of a check-then-insert race.
+
+Restaurant tables are sold by meal: TABLE_SLOT holds one row per (table,
+day, meal), opened ahead of time by `open_table_slots`. Searches and claims
+are equality lookups on that key instead of datetime range scans.
+
+SQL (approximate; claim_room_nights):
+
+INSERT INTO "ROOM_NIGHT" ("service", "night", "booking")
+VALUES (%s, %s, %s), (%s, %s, %s), ...;  -- IntegrityError => already taken
+
+SQL (approximate; claim_table_slot):
+
+UPDATE "TABLE_SLOT" SET "booking" = %s
+WHERE "service" = %s AND "slot_date" = %s AND "meal" = %s
+  AND "booking" IS NULL;  -- 0 rows => taken (or not opened yet, then INSERT)
+"""
+
+from datetime import date, timedelta
+
+from django.db import IntegrityError, transaction
+
+from .models import RoomNight, Service, TableSlot
+
+
+class SlotTaken(Exception):
+    """Raised when part of the requested inventory is already booked."""
+
+
+def stay_nights(check_in: date, check_out: date) -> list:
+    """Return the nights of a stay (at least one, check-out day excluded)."""
+    nights = max(1, (check_out - check_in).days)
+    return [check_in + timedelta(days=i) for i in range(nights)]
+
+
+def claim_room_nights(booking, service, check_in: date, check_out: date) -> list:
+    """Insert the ROOM_NIGHT rows of a stay for `booking`.
+
+    Must run inside a transaction: on conflict the insert fails, SlotTaken is
+    raised and the caller's atomic block rolls everything back.
+    """
+    rows = [
+        RoomNight(service=service, night=night, booking=booking)
+        for night in stay_nights(check_in, check_out)
+    ]
+    try:
+        RoomNight.objects.bulk_create(rows)
+    except IntegrityError as exc:
+        raise SlotTaken("Room already booked for one of the selected nights.") from exc
+    return rows
+
+
+def claim_table_slot(booking, service, day: date, meal: str) -> None:
+    """Assign the (service, day, meal) slot to `booking`.
+
+    Free slots are claimed with a conditional UPDATE. Slots that were never
+    opened are inserted on the fly; a duplicate key there also means taken.
+    """
+    claimed = TableSlot.objects.filter(
+        service=service, slot_date=day, meal=meal, booking__isnull=True
+    ).update(booking=booking)
+    if claimed:
+        return
+    try:
+        with transaction.atomic():
+            TableSlot.objects.create(
+                service=service, slot_date=day, meal=meal, booking=booking
+            )
+    except IntegrityError as exc:
+        raise SlotTaken("Table already booked for the selected meal.") from exc
+
+
+def reserved_table_ids(day: date, meal: str):
+    """Queryset of restaurant service ids already booked for a day and meal."""
+    return TableSlot.objects.filter(
+        slot_date=day, meal=meal, booking__isnull=False
+    ).values_list("service_id", flat=True)
+
+
+def open_table_slots(first_day: date, days: int, meals) -> int:
+    """Create the free TABLE_SLOT rows for `days` days starting at `first_day`.
+
+    Existing rows are left untouched. Returns the number of rows attempted.
+    """
+    table_ids = list(
+        Service.objects.filter(type="RESTAURANT").values_list("id", flat=True)
+    )
+    rows = [
+        TableSlot(service_id=sid, slot_date=first_day + timedelta(days=i), meal=meal)
+        for i in range(days)
+        for meal in meals
+        for sid in table_ids
+    ]
+    TableSlot.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+    return len(rows)
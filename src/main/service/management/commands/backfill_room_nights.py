@@ -0,0 +1,101 @@
+"""Build ROOM_NIGHT rows from existing room bookings.
+
+Usage:
+    python manage.py backfill_room_nights [--batch-size 1000] [--include-past]
+
+Rows already present for the same booking are kept, so the command is safe to
+re-run. A night already held by another booking (overlapping legacy stays) is
+not inserted: each one is printed as ``service,night,booking,held_by`` so it
+can be resolved by hand.
+"""
+
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from service.inventory import stay_nights
+from service.models import BookingDetail, RoomNight
+
+
+def _local_date(value):
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+class Command(BaseCommand):
+    help = "Backfill ROOM_NIGHT from room BookingDetail rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--include-past",
+            action="store_true",
+            help="Also expand stays that ended before today.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        details = BookingDetail.objects.filter(service__type="ROOM")
+        if not options["include_past"]:
+            today = datetime.combine(timezone.localdate(), time.min)
+            details = details.filter(end_date__gte=today)
+
+        self.expanded = self.inserted = self.present = 0
+        self.conflicts = []
+        batch = {}
+        rows = details.order_by("service_id", "start_date").values_list(
+            "booking_id", "service_id", "start_date", "end_date"
+        )
+        for booking_id, service_id, start_dt, end_dt in rows.iterator(
+            chunk_size=batch_size
+        ):
+            for night in stay_nights(_local_date(start_dt), _local_date(end_dt)):
+                self.expanded += 1
+                key = (service_id, night)
+                if key in batch and batch[key] != booking_id:
+                    self.conflicts.append((service_id, night, booking_id, batch[key]))
+                    continue
+                batch[key] = booking_id
+            if len(batch) >= batch_size:
+                self._flush(batch)
+                batch = {}
+        if batch:
+            self._flush(batch)
+
+        for service_id, night, booking_id, held_by in self.conflicts:
+            self.stdout.write(f"{service_id},{night:%Y-%m-%d},{booking_id},{held_by}")
+        summary = (
+            f"Expanded {self.expanded} room nights, inserted {self.inserted}, "
+            f"already present {self.present}, conflicting {len(self.conflicts)}."
+        )
+        if self.conflicts:
+            self.stderr.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def _flush(self, batch):
+        """Insert the free nights of `batch`; record the ones held by others."""
+        held = {
+            (service_id, night): booking_id
+            for service_id, night, booking_id in RoomNight.objects.filter(
+                service_id__in={sid for sid, _ in batch},
+                night__in={night for _, night in batch},
+            ).values_list("service_id", "night", "booking_id")
+        }
+        new_rows = []
+        for (service_id, night), booking_id in batch.items():
+            holder = held.get((service_id, night))
+            if holder is None:
+                new_rows.append(
+                    RoomNight(service_id=service_id, night=night, booking_id=booking_id)
+                )
+            elif holder == booking_id:
+                self.present += 1
+            else:
+                self.conflicts.append((service_id, night, booking_id, holder))
+        # ignore_conflicts only covers rows claimed by a concurrent booking
+        # between the lookup above and this insert.
+        RoomNight.objects.bulk_create(new_rows, ignore_conflicts=True)
+        self.inserted += len(new_rows)
@@ -0,0 +1,108 @@
+"""Report overlapping BookingDetail rows on the same service.
+
+Usage:
+    python manage.py find_overbookings [--chunk-size 2000] [--include-past]
+                                       [--output conflicts.csv]
+
+Reads BOOKING_DETAIL ordered by (service, start_date, booking) in keyset
+batches of --chunk-size rows and runs the sweep-line in
+`service.overbooking` over them. Each batch is a separate query resuming
+after the last row of the previous one, so client memory stays bounded even
+with mysqlclient, which buffers a whole result set (and therefore ignores
+`.iterator(chunk_size=...)`). Every conflicting pair is written as a CSV row
+(to --output or stdout) for staff to reconcile; nothing is modified.
+
+SQL (approximate; one query per batch):
+
+SELECT BD."service", BD."booking", BD."start_date", BD."end_date"
+FROM "BOOKING_DETAIL" BD
+WHERE BD."end_date" >= %(today)s  -- unless --include-past
+  AND (BD."service", BD."start_date", BD."booking") > (%s, %s, %s)
+ORDER BY BD."service", BD."start_date", BD."booking"
+LIMIT %(chunk_size)s;
+"""
+
+import csv
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from service.models import BookingDetail
+from service.overbooking import find_overlaps
+
+HEADER = [
+    "service",
+    "booking",
+    "start_date",
+    "end_date",
+    "conflicting_booking",
+    "conflicting_start_date",
+    "conflicting_end_date",
+]
+
+
+def _keyset_rows(details, chunk_size: int):
+    """Yield (service, booking, start, end) rows of `details` batch by batch."""
+    details = details.order_by("service_id", "start_date", "booking_id")
+    after = None
+    while True:
+        page = details
+        if after:
+            service_id, start, booking_id = after
+            page = page.filter(
+                Q(service_id__gt=service_id)
+                | Q(service_id=service_id, start_date__gt=start)
+                | Q(service_id=service_id, start_date=start, booking_id__gt=booking_id)
+            )
+        batch = list(
+            page.values_list("service_id", "booking_id", "start_date", "end_date")[
+                :chunk_size
+            ]
+        )
+        yield from batch
+        if len(batch) < chunk_size:
+            return
+        service_id, booking_id, start, _ = batch[-1]
+        after = (service_id, start, booking_id)
+
+
+class Command(BaseCommand):
+    help = "Find overlapping bookings of the same service (sweep-line)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--include-past",
+            action="store_true",
+            help="Also check bookings that ended before today.",
+        )
+        parser.add_argument("--output", help="CSV file (default: stdout).")
+
+    def handle(self, *args, **options):
+        details = BookingDetail.objects.all()
+        if not options["include_past"]:
+            today = datetime.combine(timezone.localdate(), time.min)
+            details = details.filter(end_date__gte=today)
+        rows = _keyset_rows(details, max(1, options["chunk_size"]))
+
+        out = open(options["output"], "w", newline="") if options["output"] else None
+        try:
+            writer = csv.writer(out or self.stdout)
+            writer.writerow(HEADER)
+            conflicts = 0
+            services = set()
+            for service_id, first, second in find_overlaps(rows):
+                writer.writerow([service_id, *first, *second])
+                conflicts += 1
+                services.add(service_id)
+        finally:
+            if out:
+                out.close()
+
+        summary = f"{conflicts} overlapping pairs on {len(services)} services."
+        if conflicts:
+            self.stderr.write(self.style.WARNING(summary))
+        else:
+            self.stderr.write(self.style.SUCCESS(summary))
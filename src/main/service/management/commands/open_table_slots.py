@@ -0,0 +1,73 @@
+"""Open restaurant TABLE_SLOT rows for the coming days.
+
+Usage:
+    python manage.py open_table_slots [--days 30] [--start YYYY-MM-DD]
+
+Creates a free slot for every table, day and meal in the window (existing
+rows are kept), then marks the slots already covered by restaurant
+BOOKING_DETAIL rows as booked so older bookings are honoured.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from service.availability import _aware, bump_booking_version
+from service.inventory import open_table_slots
+from service.models import BookingDetail, TableSlot
+from service.results_cache import invalidate_days
+from service.views import MEAL_START_TIMES, get_meal_slot
+
+
+class Command(BaseCommand):
+    help = "Bulk-create free restaurant slots for the next N days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--start", help="First day (default: today).")
+
+    def handle(self, *args, **options):
+        first_day = timezone.localdate()
+        if options["start"]:
+            first_day = parse_date(options["start"])
+            if first_day is None:
+                raise CommandError("--start must be a YYYY-MM-DD date.")
+        days = options["days"]
+        if days <= 0:
+            raise CommandError("--days must be positive.")
+        last_day = first_day + timedelta(days=days - 1)
+
+        created = open_table_slots(first_day, days, list(MEAL_START_TIMES))
+
+        synced = 0
+        details = BookingDetail.objects.filter(
+            service__type="RESTAURANT",
+            start_date__gte=datetime.combine(first_day, time.min),
+            start_date__lte=datetime.combine(last_day, time.max),
+        ).values_list("booking_id", "service_id", "start_date", "end_date")
+        for booking_id, service_id, start_dt, end_dt in details.iterator():
+            day = timezone.localtime(_aware(start_dt)).date()
+            for meal in MEAL_START_TIMES:
+                slot_start, slot_end = get_meal_slot(day, meal)
+                if _aware(slot_start) < _aware(end_dt) and _aware(slot_end) > _aware(
+                    start_dt
+                ):
+                    synced += TableSlot.objects.filter(
+                        service_id=service_id,
+                        slot_date=day,
+                        meal=meal,
+                        booking__isnull=True,
+                    ).update(booking_id=booking_id)
+
+        if synced:
+            bump_booking_version()
+            invalidate_days(first_day, last_day)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Opened slots {first_day} → {last_day} ({created} rows checked), "
+                f"marked {synced} slots from existing bookings."
+            )
+        )
@@ -0,0 +1,22 @@
+"""Recompute the SERVICE_OCCUPANCY snapshot for every service.
+
+Usage:
+    python manage.py refresh_occupancy
+
+Bookings start and end as time passes (check-in at 14:00, check-out at
+10:00, meal slots), which no write path reports. Schedule this command at
+least at those boundaries (e.g. every 15 minutes via cron) when
+FREE_SERVICES_SNAPSHOT is enabled.
+"""
+
+from django.core.management.base import BaseCommand
+
+from service.occupancy import refresh_occupancy
+
+
+class Command(BaseCommand):
+    help = "Refresh the per-service occupancy snapshot."
+
+    def handle(self, *args, **options):
+        written = refresh_occupancy()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {written} services."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-16 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomNight",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "service",
+                        "night",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("night", models.DateField()),
+            ],
+            options={
+                "verbose_name": "Room night",
+                "verbose_name_plural": "Room nights",
+                "db_table": "ROOM_NIGHT",
+                "managed": False,
+            },
+        ),
+    ]
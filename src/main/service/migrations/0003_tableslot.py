@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-16 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service", "0002_roomnight"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableSlot",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "service",
+                        "slot_date",
+                        "meal",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("slot_date", models.DateField()),
+                (
+                    "meal",
+                    models.CharField(
+                        choices=[
+                            ("breakfast", "Breakfast"),
+                            ("lunch", "Lunch"),
+                            ("dinner", "Dinner"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Table slot",
+                "verbose_name_plural": "Table slots",
+                "db_table": "TABLE_SLOT",
+                "managed": False,
+            },
+        ),
+    ]
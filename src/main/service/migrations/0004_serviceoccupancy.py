@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-16 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service", "0003_tableslot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ServiceOccupancy",
+            fields=[
+                (
+                    "service",
+                    models.OneToOneField(
+                        db_column="service",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="occupancy",
+                        serialize=False,
+                        to="service.service",
+                    ),
+                ),
+                ("people_now", models.IntegerField(default=0)),
+                ("reservations_now", models.IntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Service occupancy",
+                "verbose_name_plural": "Service occupancy",
+                "db_table": "SERVICE_OCCUPANCY",
+                "managed": False,
+            },
+        ),
+    ]
@@ -1,7 +1,8 @@
 """Unmanaged models mapping existing Service-related tables.
 
 Tables:
-- SERVICE, RESTAURANT, ROOM, BOOKING, BOOKING_DETAIL
+- SERVICE, RESTAURANT, ROOM, BOOKING, BOOKING_DETAIL, ROOM_NIGHT, TABLE_SLOT,
+  SERVICE_OCCUPANCY
 """
 
 from django.db import models
@@ -136,3 +137,106 @@ class Room(models.Model):
 
     def __str__(self) -> str:
         return f"Room(service={self.service_id}, code={self.code})"
+
+
+class RoomNight(models.Model):
+    """One booked night of a room.
+
+    Maps to ROOM_NIGHT(service, night, booking). The (service, night) primary
+    key makes a second booking of the same night fail on insert.
+    """
+
+    pk = models.CompositePrimaryKey("service", "night")
+    service = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        db_column="service",
+        related_name="room_nights",
+    )
+    night = models.DateField()
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        db_column="booking",
+        related_name="room_nights",
+    )
+
+    class Meta:
+        managed = False
+        db_table = "ROOM_NIGHT"
+        verbose_name = "Room night"
+        verbose_name_plural = "Room nights"
+
+    def __str__(self) -> str:
+        return f"RoomNight(service={self.service_id}, night={self.night})"
+
+
+class TableSlot(models.Model):
+    """A restaurant table for one meal of one day.
+
+    Maps to TABLE_SLOT(service, slot_date, meal, booking). Free slots have a
+    NULL booking; claiming a slot is a conditional UPDATE on the primary key.
+    """
+
+    pk = models.CompositePrimaryKey("service", "slot_date", "meal")
+    service = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        db_column="service",
+        related_name="table_slots",
+    )
+    slot_date = models.DateField()
+    meal = models.CharField(
+        max_length=10,
+        choices=[
+            ("breakfast", "Breakfast"),
+            ("lunch", "Lunch"),
+            ("dinner", "Dinner"),
+        ],
+    )
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.SET_NULL,
+        db_column="booking",
+        blank=True,
+        null=True,
+        related_name="table_slots",
+    )
+
+    class Meta:
+        managed = False
+        db_table = "TABLE_SLOT"
+        verbose_name = "Table slot"
+        verbose_name_plural = "Table slots"
+
+    def __str__(self) -> str:
+        return f"TableSlot(service={self.service_id}, {self.slot_date} {self.meal})"
+
+
+class ServiceOccupancy(models.Model):
+    """Maintained snapshot of who occupies a service right now.
+
+    Maps to SERVICE_OCCUPANCY(service, people_now, reservations_now,
+    refreshed_at). Kept current by `service.occupancy.refresh_occupancy`
+    and read by the free_services_snapshot view.
+    """
+
+    service = models.OneToOneField(
+        Service,
+        on_delete=models.CASCADE,
+        db_column="service",
+        primary_key=True,
+        related_name="occupancy",
+    )
+    people_now = models.IntegerField(default=0)
+    reservations_now = models.IntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "SERVICE_OCCUPANCY"
+        verbose_name = "Service occupancy"
+        verbose_name_plural = "Service occupancy"
+
+    def __str__(self) -> str:
+        return f"ServiceOccupancy(service={self.service_id}, people={self.people_now})"
@@ -0,0 +1,91 @@
+"""Maintained occupancy snapshot behind the free_services_snapshot view.
+
+The free_services_now view aggregates every BOOKING_DETAIL row active at
+NOW() on each read. SERVICE_OCCUPANCY stores the same aggregate per service
+instead; it changes only when
+
+- a booking that covers the present is created or cancelled, which the
+  write paths report through `record_booking_change`, or
+- a booking starts or ends with time passing (check-in/check-out, meal slot
+  boundaries), which the periodic `refresh_occupancy` command picks up.
+
+SQL (approximate; refresh_occupancy):
+
+SELECT BD."service", SUM(BD."people"), COUNT(*)
+FROM "BOOKING_DETAIL" BD
+WHERE BD."start_date" <= %(now)s AND BD."end_date" >= %(now)s
+  [AND BD."service" IN (%ids)]
+GROUP BY BD."service";
+
+INSERT INTO "SERVICE_OCCUPANCY" ("service", "people_now", "reservations_now", "refreshed_at")
+VALUES (%s, %s, %s, %s), ...
+ON DUPLICATE KEY UPDATE "people_now" = VALUES("people_now"), ...;
+"""
+
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import BookingDetail, Service, ServiceOccupancy
+
+
+def refresh_occupancy(service_ids=None, now=None) -> int:
+    """Recompute the snapshot rows of `service_ids` (all services if None).
+
+    Returns the number of rows written.
+    """
+    now = now or timezone.now()
+    active = BookingDetail.objects.filter(start_date__lte=now, end_date__gte=now)
+    services = Service.objects.all()
+    if service_ids is not None:
+        service_ids = set(service_ids)
+        if not service_ids:
+            return 0
+        active = active.filter(service_id__in=service_ids)
+        services = services.filter(id__in=service_ids)
+
+    totals = {
+        row["service_id"]: row
+        for row in active.values("service_id").annotate(
+            people=Sum("people"), reservations=Count("*")
+        )
+    }
+    rows = []
+    for sid in services.values_list("id", flat=True):
+        row = totals.get(sid, {})
+        rows.append(
+            ServiceOccupancy(
+                service_id=sid,
+                people_now=row.get("people") or 0,
+                reservations_now=row.get("reservations") or 0,
+                refreshed_at=now,
+            )
+        )
+    # MySQL upserts on any unique key and rejects an explicit conflict target.
+    target = (
+        ["service"]
+        if connection.features.supports_update_conflicts_with_target
+        else None
+    )
+    ServiceOccupancy.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=target,
+        update_fields=["people_now", "reservations_now", "refreshed_at"],
+    )
+    return len(rows)
+
+
+def services_active_now(intervals, now=None) -> set:
+    """Service ids of the (service_id, start_dt, end_dt) intervals covering now."""
+    now = now or timezone.now()
+    tz = timezone.get_default_timezone()
+    active = set()
+    for sid, start, end in intervals:
+        if timezone.is_naive(start):
+            start = timezone.make_aware(start, tz)
+        if timezone.is_naive(end):
+            end = timezone.make_aware(end, tz)
+        if start <= now <= end:
+            active.add(sid)
+    return active
@@ -0,0 +1,32 @@
+"""Sweep-line detection of overlapping bookings on the same service.
+
+BOOKING_DETAIL has no constraint against two bookings of one service
+overlapping in time. `find_overlaps` finds every such pair in one pass over
+rows ordered by (service, start_date): a min-heap holds the end dates of the
+bookings still open at the current start, so each row is pushed and popped
+once (O(n log n)) and memory is bounded by the largest number of
+simultaneously open bookings of a single service.
+"""
+
+import heapq
+
+
+def find_overlaps(rows):
+    """Yield (service_id, first, second) for every overlapping pair.
+
+    rows: iterable of (service_id, booking_id, start_dt, end_dt) ordered by
+    service and start; first/second are the (booking_id, start_dt, end_dt)
+    of the earlier and the later booking. Touching intervals do not overlap.
+    """
+    current = None
+    active = []
+    for service_id, booking_id, start, end in rows:
+        if service_id != current:
+            current = service_id
+            active = []
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        later = (booking_id, start, end)
+        for other_end, other_booking, other_start in active:
+            yield service_id, (other_booking, other_start, other_end), later
+        heapq.heappush(active, (end, booking_id, start))
@@ -0,0 +1,88 @@
+"""Cache for computed availability search results.
+
+Results are stored in the "availability" cache alias (LRU culling plus a TTL,
+see settings.CACHES) under a key made of the normalized search parameters and
+the generation numbers of every day the search window covers. A booking
+change bumps the generations of the days it touches, so only the entries whose
+window overlaps the change stop matching; everything else stays cached until
+it ages out.
+"""
+
+import hashlib
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.cache import caches
+from django.utils import timezone
+
+CACHE_ALIAS = "availability"
+DAY_KEY = "avail:day:{}"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _days(first: date, last: date) -> list:
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _local_date(value) -> date:
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+def _fresh_generation() -> int:
+    """Starting value for a day counter that was never set or got evicted.
+
+    Time-based, so a counter recreated after eviction never matches the
+    generation of an entry cached before.
+    """
+    return time.time_ns() // 1000
+
+
+def _generations(first: date, last: date) -> str:
+    cache = _cache()
+    keys = [DAY_KEY.format(d.isoformat()) for d in _days(first, last)]
+    found = cache.get_many(keys)
+    for k in keys:
+        if k not in found:
+            cache.add(k, _fresh_generation(), None)
+            found[k] = cache.get(k)
+    gens = ",".join(str(found[k]) for k in keys)
+    return hashlib.sha1(gens.encode()).hexdigest()[:16]
+
+
+def cached_search(kind: str, first: date, last: date, params: tuple, compute):
+    """Return compute() for a search over days [first, last], cached.
+
+    params must identify the search (dates, people, meal, ...); it is part
+    of the key together with the day generations.
+    """
+    raw = ":".join(str(p) for p in params)
+    key = f"avail:{kind}:{raw}:{_generations(first, last)}"
+    result = _cache().get(key)
+    if result is None:
+        result = compute()
+        _cache().set(key, result)
+    return result
+
+
+def invalidate_days(first, last) -> None:
+    """Bump the generation of every day in [first, last] (dates or datetimes)."""
+    cache = _cache()
+    for day in _days(_local_date(first), _local_date(last)):
+        key = DAY_KEY.format(day.isoformat())
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_generation(), None)
+
+
+def invalidate_intervals(intervals) -> None:
+    """Invalidate the days touched by (service_id, start_dt, end_dt) intervals."""
+    for _, start, end in intervals:
+        invalidate_days(start, end)
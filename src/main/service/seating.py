@@ -0,0 +1,59 @@
+"""Seating engine for restaurant parties larger than a single table.
+
+`seat_party` picks the smallest set of free tables whose capacities add up to
+the party size, preferring the fewest empty seats among equally small sets.
+It is a 0/1 knapsack over seats (clipped at the party size), memoized on the
+free-capacity multiset, so every search for the same slot state is answered
+from cache.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=512)
+def _pack(capacities: tuple, people: int):
+    """Indices into `capacities` of the best subset seating `people`, or None.
+
+    best[s] holds (tables, seats, chosen) for the cheapest subset reaching s
+    seats, where s is clipped at `people`.
+    """
+    best = {0: (0, 0, ())}
+    for i, cap in enumerate(capacities):
+        for seats in sorted(best, reverse=True):
+            tables, total, chosen = best[seats]
+            target = min(people, seats + cap)
+            candidate = (tables + 1, total + cap, chosen + (i,))
+            current = best.get(target)
+            if current is None or candidate[:2] < current[:2]:
+                best[target] = candidate
+    result = best.get(people)
+    return result[2] if result else None
+
+
+def seat_party(tables, people: int):
+    """Return the service ids of the minimal table set seating `people`.
+
+    tables: iterable of (service_id, max_capacity) for the free tables.
+    Returns None when the free tables cannot seat the party.
+    """
+    tables = sorted(tables, key=lambda t: (t[1], t[0]))
+    if people <= 0 or sum(cap for _, cap in tables) < people:
+        return None
+    chosen = _pack(tuple(cap for _, cap in tables), people)
+    if chosen is None:
+        return None
+    return sorted(tables[i][0] for i in chosen)
+
+
+def split_party(capacities, people: int) -> list:
+    """Distribute `people` over tables, filling the largest tables first.
+
+    capacities: list of table capacities; returns guests per table, same order.
+    """
+    order = sorted(range(len(capacities)), key=lambda i: -capacities[i])
+    guests = [0] * len(capacities)
+    left = people
+    for i in order:
+        guests[i] = min(capacities[i], left)
+        left -= guests[i]
+    return guests
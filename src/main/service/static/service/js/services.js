@@ -24,3 +24,85 @@
         }, false);
     });
 })();
+
+
+// Restaurant week view: one fetch returns the whole (date x meal) grid.
+(() => {
+    const box = document.getElementById('table-week');
+    if (!box) return;
+
+    const meals = ['breakfast', 'lunch', 'dinner'];
+    const labels = { breakfast: 'Breakfast', lunch: 'Lunch', dinner: 'Dinner' };
+    const start = box.dataset.start;
+    const people = box.dataset.people || '1';
+    // Date maths in UTC: a local-midnight Date turns into the previous day
+    // through toISOString() east of UTC.
+    const end = new Date(start + 'T00:00:00Z');
+    end.setUTCDate(end.getUTCDate() + 6);
+    const to = end.toISOString().slice(0, 10);
+
+    const params = new URLSearchParams({ from: start, to, meals: meals.join(','), people });
+    const load = () => fetch(`${box.dataset.url}?${params}`, { headers: { Accept: 'application/json' } })
+        .then((r) => (r.ok ? r.json() : Promise.reject(r.status)))
+        .then((data) => {
+            const cells = {};
+            data.slots.forEach((s) => { cells[`${s.date}|${s.meal}`] = s; });
+            const days = [...new Set(data.slots.map((s) => s.date))];
+
+            const table = document.createElement('table');
+            table.className = 'table table-sm align-middle text-center mb-0 table-week';
+            const head = table.createTHead().insertRow();
+            head.insertCell().textContent = `Week · ${people} pax`;
+            data.meals.forEach((m) => { head.insertCell().textContent = labels[m] || m; });
+
+            const body = table.createTBody();
+            days.forEach((day) => {
+                const row = body.insertRow();
+                row.insertCell().textContent = new Date(day + 'T00:00:00').toLocaleDateString();
+                data.meals.forEach((m) => {
+                    const slot = cells[`${day}|${m}`];
+                    const cell = row.insertCell();
+                    const free = slot ? slot.free_tables.length : 0;
+                    const link = document.createElement('a');
+                    link.href = `${box.dataset.searchUrl}?table_date=${day}&table_meal=${m}&table_people=${people}`;
+                    link.className = `chip ${free ? 'chip-success' : 'chip-muted'} text-decoration-none`;
+                    link.textContent = free ? `${free} · ${slot.free_seats} seats` : 'Full';
+                    cell.appendChild(link);
+                });
+            });
+
+            const wrap = document.createElement('div');
+            wrap.className = 'table-responsive';
+            wrap.appendChild(table);
+            box.replaceChildren(wrap);
+        })
+        .catch(() => box.replaceChildren());
+
+    load();
+    document.addEventListener('services:changed', (evt) => {
+        const touched = evt.detail.some((c) => c.start.slice(0, 10) <= to && c.end.slice(0, 10) >= start);
+        if (touched) load();
+    });
+})();
+
+// Live availability: the server pushes the intervals of every committed
+// booking change; the week grid reloads and search results get a notice.
+(() => {
+    const notice = document.getElementById('live-notice');
+    if (!notice || !notice.dataset.live || !window.EventSource) return;
+
+    const source = new EventSource(notice.dataset.live);
+    source.onmessage = (msg) => {
+        let changes;
+        try {
+            changes = JSON.parse(msg.data).data;
+        } catch (e) {
+            return;
+        }
+        document.dispatchEvent(new CustomEvent('services:changed', { detail: changes }));
+        if (notice.dataset.results) {
+            notice.classList.remove('d-none');
+        }
+    };
+    window.addEventListener('beforeunload', () => source.close());
+})();
@@ -4,13 +4,77 @@ These tests avoid DB usage and focus on routing and auth guards:
 - service_list resolves and returns 200 OK.
 - quick_book requires login and redirects anonymous users.
 - cancel_booking requires login and redirects anonymous users.
+
+The availability index is exercised in memory (no DB) by populating it
+directly. The booking write paths (cancellation, basket checkout, multi-table
+booking) run against the database and are skipped when its unmanaged tables
+are missing.
 """
 
-from django.test import TestCase
+import threading
+from decimal import Decimal
+from unittest import skipIf
+from unittest.mock import patch
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 from django.urls import reverse, resolve
 from django.contrib.auth.models import AnonymousUser
 from django.test import RequestFactory
 
+from user.models import Person, User
+
+from . import views
+from .cancellation import CancellationRefused, cancel_bookings
+from .models import (
+    Booking,
+    BookingDetail,
+    Restaurant,
+    Room,
+    RoomNight,
+    Service,
+    TableSlot,
+)
+from .availability import (
+    AvailabilityIndex,
+    booking_version,
+    record_booking_change,
+    stay_bounds,
+)
+from .heatmap import build_matrix
+from .inventory import stay_nights
+from .locks import ServiceBusy, service_locks
+from .occupancy import services_active_now
+from .overbooking import find_overlaps
+from .results_cache import cached_search, invalidate_days
+from .seating import seat_party, split_party
+
+BOOKING_TABLES = (
+    "PERSON",
+    "USER",
+    "SERVICE",
+    "ROOM",
+    "RESTAURANT",
+    "BOOKING",
+    "BOOKING_DETAIL",
+    "ROOM_NIGHT",
+    "TABLE_SLOT",
+)
+
+
+def _tables_exist(*names) -> bool:
+    """Return True if every named database table exists."""
+    with connection.cursor() as cur:
+        tables = set(connection.introspection.table_names(cursor=cur))
+    return set(names) <= tables
+
+
+def _aware(*args) -> datetime:
+    return timezone.make_aware(datetime(*args))
+
 
 class ServiceRoutingAuthTests(TestCase):
     """Verify that main service routes resolve and enforce auth where needed."""
@@ -30,8 +94,546 @@ class ServiceRoutingAuthTests(TestCase):
 
         self.assertTrue(url.endswith("/book/1/quick/"))
 
+    def test_table_availability_rejects_bad_range(self):
+        url = reverse("service:table_availability")
+        request = self.factory.get(url, {"from": "2030-01-05", "to": "2030-01-01"})
+        response = views.table_availability(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_availability_api_answers_304_until_a_booking_changes(self):
+        url = reverse("service:availability_api")
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        record_booking_change()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_cancel_bookings_requires_login(self):
+        url = reverse("service:cancel_bookings")
+        self.assertTrue(url.endswith("/cancel-bookings/"))
+        request = self.factory.get(url)
+        request.user = AnonymousUser()
+        self.assertEqual(views.cancel_bookings_view(request).status_code, 302)
+
+    def test_basket_checkout_requires_login(self):
+        response = self.client.post(reverse("service:basket_checkout"))
+        self.assertEqual(response.status_code, 302)
+        self.assertNotIn("service_basket", self.client.session)
+
     def test_cancel_booking_requires_login(self):
         url = reverse("service:cancel_booking", kwargs={"booking_id": 1})
         request = self.factory.post(url)
         request.user = AnonymousUser()
         self.assertTrue(url.endswith("/cancel-booking/1/"))
+
+
+class AvailabilityIndexTests(SimpleTestCase):
+    """Interval lookups of the in-memory availability index."""
+
+    def setUp(self):
+        self.index = AvailabilityIndex()
+        self.index._populate(
+            [(1, "ROOM", 2), (2, "ROOM", 4), (3, "RESTAURANT", 4)],
+            [
+                (1, datetime(2030, 1, 1, 14), datetime(2030, 1, 5, 10)),
+                (3, datetime(2030, 1, 2, 19, 30), datetime(2030, 1, 2, 21, 30)),
+            ],
+            booking_version(),
+        )
+
+    def test_rooms_free_by_capacity_and_overlap(self):
+        free = self.index.free_services(
+            "ROOM", datetime(2030, 1, 3), datetime(2030, 1, 4, 23), 1
+        )
+        self.assertEqual(free, [2])
+        free = self.index.free_services(
+            "ROOM", datetime(2030, 1, 6), datetime(2030, 1, 7), 3
+        )
+        self.assertEqual(free, [2])
+
+    def test_adjacent_table_slots_do_not_overlap(self):
+        self.assertTrue(
+            self.index.is_free(
+                3, datetime(2030, 1, 2, 21, 30), datetime(2030, 1, 2, 23)
+            )
+        )
+        self.assertFalse(
+            self.index.is_free(3, datetime(2030, 1, 2, 20), datetime(2030, 1, 2, 22))
+        )
+
+    def test_load_order_does_not_matter(self):
+        self.index._populate(
+            [(2, "ROOM", 4)],
+            [
+                (2, datetime(2030, 3, 5, 14), datetime(2030, 3, 6, 10)),
+                (2, datetime(2030, 3, 1, 14), datetime(2030, 3, 4, 10)),
+            ],
+            booking_version(),
+        )
+        self.assertFalse(
+            self.index.is_free(2, datetime(2030, 3, 2, 14), datetime(2030, 3, 3, 10))
+        )
+        self.assertTrue(
+            self.index.is_free(2, datetime(2030, 3, 4, 14), datetime(2030, 3, 5, 10))
+        )
+
+    def test_add_and_remove_keep_index_current(self):
+        start, end = datetime(2030, 2, 1, 14), datetime(2030, 2, 3, 10)
+        self.index.add(2, start, end)
+        self.assertFalse(self.index.is_free(2, start, end))
+        self.index.remove(2, start, end)
+        self.assertTrue(self.index.is_free(2, start, end))
+
+
+class StayNightsTests(SimpleTestCase):
+    """Expansion of a stay into the ROOM_NIGHT rows it claims."""
+
+    def test_checkout_day_is_not_a_night(self):
+        self.assertEqual(
+            stay_nights(date(2030, 1, 1), date(2030, 1, 3)),
+            [date(2030, 1, 1), date(2030, 1, 2)],
+        )
+
+    def test_same_day_stay_claims_one_night(self):
+        self.assertEqual(
+            stay_nights(date(2030, 1, 1), date(2030, 1, 1)), [date(2030, 1, 1)]
+        )
+
+
+class SeatingTests(SimpleTestCase):
+    """Minimal multi-table packing for large parties."""
+
+    def test_prefers_fewest_tables_then_fewest_empty_seats(self):
+        tables = [(1, 2), (2, 4), (3, 4), (4, 6), (5, 8)]
+        self.assertEqual(seat_party(tables, 10), [2, 4])
+        self.assertEqual(seat_party(tables, 14), [4, 5])
+        self.assertEqual(seat_party(tables, 3), [2])
+
+    def test_party_too_large_returns_none(self):
+        self.assertIsNone(seat_party([(1, 2), (2, 4)], 7))
+
+    def test_split_party_fills_largest_tables_first(self):
+        self.assertEqual(split_party([4, 6], 9), [3, 6])
+
+
+class StayWindowTests(SimpleTestCase):
+    """Gap-finding sweep behind the flexible-date room search."""
+
+    def test_earliest_windows_skip_booked_stays(self):
+        index = AvailabilityIndex()
+        index._populate(
+            [(1, "ROOM", 2), (2, "ROOM", 1)],
+            [(1, datetime(2030, 1, 2, 14), datetime(2030, 1, 4, 10))],
+            booking_version(),
+        )
+        windows = index.free_stay_windows(2, 2, date(2030, 1, 1), date(2030, 1, 10))
+        self.assertEqual(list(windows), [1])
+        self.assertEqual(
+            windows[1],
+            [
+                (date(2030, 1, 4), date(2030, 1, 6)),
+                (date(2030, 1, 6), date(2030, 1, 8)),
+                (date(2030, 1, 8), date(2030, 1, 10)),
+            ],
+        )
+
+    def test_windows_agree_with_room_search(self):
+        index = AvailabilityIndex()
+        index._populate(
+            [(1, "ROOM", 2)],
+            [(1, datetime(2030, 1, 2, 14), datetime(2030, 1, 4, 10))],
+            booking_version(),
+        )
+        windows = index.free_stay_windows(1, 1, date(2030, 1, 1), date(2030, 1, 5))
+        offered = {check_in for check_in, _ in windows[1]}
+        for day in (date(2030, 1, d) for d in range(1, 6)):
+            free = index.free_services(
+                "ROOM", *stay_bounds(day, day + timedelta(days=1)), 1
+            )
+            self.assertEqual(day in offered, free == [1], day)
+
+
+class ResultsCacheTests(SimpleTestCase):
+    """Search results stay cached until a day of their window is invalidated."""
+
+    def test_only_overlapping_searches_are_recomputed(self):
+        calls = []
+
+        def compute(tag):
+            calls.append(tag)
+            return tag
+
+        def search(tag, first, last):
+            return cached_search("test", first, last, (tag,), lambda: compute(tag))
+
+        search("a", date(2031, 5, 1), date(2031, 5, 3))
+        search("b", date(2031, 5, 10), date(2031, 5, 10))
+        search("a", date(2031, 5, 1), date(2031, 5, 3))
+        self.assertEqual(calls, ["a", "b"])
+
+        invalidate_days(datetime(2031, 5, 2, 12), datetime(2031, 5, 2, 13))
+        search("a", date(2031, 5, 1), date(2031, 5, 3))
+        search("b", date(2031, 5, 10), date(2031, 5, 10))
+        self.assertEqual(calls, ["a", "b", "a"])
+
+
+class ServiceLockTests(SimpleTestCase):
+    """In-process fallback of the per-service booking locks."""
+
+    def _hold_in_thread(self, service_id, release):
+        held = threading.Event()
+
+        def run():
+            with service_locks([service_id]):
+                held.set()
+                release.wait(5)
+
+        threading.Thread(target=run, daemon=True).start()
+        held.wait(5)
+
+    def test_same_service_waits_other_services_do_not(self):
+        release = threading.Event()
+        self._hold_in_thread(9001, release)
+        try:
+            with self.assertRaises(ServiceBusy):
+                with service_locks([9001], timeout=0.05):
+                    pass
+            with service_locks([9002], timeout=0.05):
+                pass
+        finally:
+            release.set()
+
+
+class OverlapSweepTests(SimpleTestCase):
+    """Sweep-line overbooking detection over (service, start)-ordered rows."""
+
+    def test_reports_each_overlapping_pair_per_service(self):
+        d = lambda day, hour: datetime(2030, 1, day, hour)
+        rows = [
+            (1, 10, d(1, 14), d(3, 10)),
+            (1, 11, d(2, 14), d(4, 10)),
+            (1, 12, d(4, 10), d(5, 10)),
+            (2, 13, d(2, 12), d(2, 14)),
+            (2, 14, d(2, 13), d(2, 15)),
+        ]
+        pairs = [(sid, a[0], b[0]) for sid, a, b in find_overlaps(rows)]
+        self.assertEqual(pairs, [(1, 10, 11), (2, 13, 14)])
+
+
+class OccupancySnapshotTests(SimpleTestCase):
+    """Only changes covering the present touch the occupancy snapshot."""
+
+    def test_services_active_now(self):
+        now = timezone.make_aware(datetime(2030, 1, 2, 20))
+        intervals = [
+            (1, datetime(2030, 1, 1, 14), datetime(2030, 1, 3, 10)),
+            (2, datetime(2030, 1, 2, 12, 30), datetime(2030, 1, 2, 14, 30)),
+            (3, datetime(2030, 1, 5, 14), datetime(2030, 1, 6, 10)),
+        ]
+        self.assertEqual(services_active_now(intervals, now), {1})
+
+
+class OccupancyRefreshTests(TestCase):
+    """Booking changes refresh the snapshot only when it is in use."""
+
+    def _current(self):
+        now = timezone.now()
+        return [(1, now - timedelta(hours=1), now + timedelta(hours=1))]
+
+    @override_settings(FREE_SERVICES_SNAPSHOT=False)
+    def test_snapshot_off_skips_refresh(self):
+        with patch("service.availability.refresh_occupancy") as refresh:
+            record_booking_change(added=self._current())
+        refresh.assert_not_called()
+
+    @override_settings(FREE_SERVICES_SNAPSHOT=True)
+    def test_failed_refresh_is_logged_not_raised(self):
+        with patch(
+            "service.availability.refresh_occupancy",
+            side_effect=DatabaseError("no SERVICE_OCCUPANCY"),
+        ) as refresh, self.assertLogs("service.availability", "ERROR"):
+            record_booking_change(added=self._current())
+        refresh.assert_called_once_with({1})
+
+
+class OccupancyMatrixTests(SimpleTestCase):
+    """Difference-array expansion of bookings into per-day/per-meal cells."""
+
+    def test_rooms_by_night_and_tables_by_meal(self):
+        meals = [time(8, 0), time(12, 30), time(19, 30)]
+        matrix = build_matrix(
+            date(2030, 1, 1),
+            3,
+            [(1, "ROOM"), (2, "RESTAURANT")],
+            [
+                (1, datetime(2029, 12, 30, 14), datetime(2030, 1, 2, 10)),
+                (1, datetime(2030, 1, 1, 14), datetime(2030, 1, 2, 10)),
+                (2, datetime(2030, 1, 2, 12, 30), datetime(2030, 1, 2, 14, 30)),
+            ],
+            meals,
+        )
+        self.assertEqual(matrix["rooms"][1], [2, 0, 0])
+        self.assertEqual(matrix["tables"][2], [0, 0, 0, 0, 1, 0, 0, 0, 0])
+
+
+class BookingFixtures(TestCase):
+    """Users, one room and two tables, plus helpers to book them directly."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for username, cf in (("ann", "ANNCF00000000001"), ("bob", "BOBCF00000000001")):
+            person = Person.objects.create(cf=cf, name=username, surname="Test")
+            User.objects.create(
+                cf=person, username=username, email=f"{username}@x.it", password="pwd"
+            )
+        cls.ann = get_user_model().objects.create_user(username="ann", password="pwd")
+        cls.room = Service.objects.create(price=Decimal("80.00"), type="ROOM")
+        Room.objects.create(service=cls.room, code="R1", max_capacity=2)
+        cls.big_table = Service.objects.create(price=Decimal("0"), type="RESTAURANT")
+        Restaurant.objects.create(service=cls.big_table, code="T1", max_capacity=4)
+        cls.small_table = Service.objects.create(price=Decimal("0"), type="RESTAURANT")
+        Restaurant.objects.create(service=cls.small_table, code="T2", max_capacity=2)
+
+    def _book_room(self, username, check_in, check_out):
+        booking = Booking.objects.create(username_id=username)
+        start, end = map(timezone.make_aware, stay_bounds(check_in, check_out))
+        BookingDetail.objects.create(
+            booking=booking,
+            service=self.room,
+            start_date=start,
+            end_date=end,
+            people=2,
+            unit_price=self.room.price,
+        )
+        for night in stay_nights(check_in, check_out):
+            RoomNight.objects.create(service=self.room, night=night, booking=booking)
+        return booking
+
+    def _book_table(self, username, table, day, meal="dinner"):
+        booking = Booking.objects.create(username_id=username)
+        start, end = map(timezone.make_aware, views.get_meal_slot(day, meal))
+        BookingDetail.objects.create(
+            booking=booking,
+            service=table,
+            start_date=start,
+            end_date=end,
+            people=2,
+            unit_price=table.price,
+        )
+        TableSlot.objects.create(
+            service=table, slot_date=day, meal=meal, booking=booking
+        )
+        return booking
+
+
+@skipIf(not _tables_exist(*BOOKING_TABLES), "Booking tables are unmanaged or missing.")
+class CancelBookingsTests(BookingFixtures):
+    """Batch cancellation is all-or-nothing and frees the inventory."""
+
+    def setUp(self):
+        self.stay = self._book_room("ann", date(2030, 3, 1), date(2030, 3, 3))
+        self.dinner = self._book_table("ann", self.big_table, date(2030, 3, 1))
+
+    def _left(self, *bookings):
+        ids = [b.id for b in bookings]
+        return (
+            Booking.objects.filter(id__in=ids).count(),
+            BookingDetail.objects.filter(booking_id__in=ids).count(),
+        )
+
+    def test_cancels_every_booking_and_frees_inventory(self):
+        with patch("service.cancellation.record_booking_change") as record:
+            with self.captureOnCommitCallbacks(execute=True):
+                cancelled = cancel_bookings(
+                    [self.stay.id, self.dinner.id],
+                    username="ann",
+                    now=_aware(2030, 1, 1),
+                )
+        self.assertEqual(cancelled, 2)
+        self.assertEqual(self._left(self.stay, self.dinner), (0, 0))
+        self.assertFalse(RoomNight.objects.filter(service=self.room).exists())
+        slot = TableSlot.objects.get(service=self.big_table)
+        self.assertIsNone(slot.booking_id)
+        freed = record.call_args.kwargs["removed"]
+        self.assertEqual(
+            sorted(sid for sid, _, _ in freed), [self.room.id, self.big_table.id]
+        )
+
+    def test_foreign_booking_refuses_the_whole_batch(self):
+        other = self._book_room("bob", date(2030, 4, 1), date(2030, 4, 2))
+        with self.assertRaises(CancellationRefused):
+            cancel_bookings(
+                [self.stay.id, other.id], username="ann", now=_aware(2030, 1, 1)
+            )
+        self.assertEqual(self._left(self.stay, other), (2, 2))
+        self.assertEqual(RoomNight.objects.count(), 3)
+
+    def test_missing_booking_refuses_the_whole_batch(self):
+        with self.assertRaises(CancellationRefused):
+            cancel_bookings(
+                [self.stay.id, self.dinner.id + 1000],
+                username="ann",
+                now=_aware(2030, 1, 1),
+            )
+        self.assertEqual(self._left(self.stay), (1, 1))
+
+    def test_started_booking_refuses_the_whole_batch(self):
+        with self.assertRaises(CancellationRefused):
+            cancel_bookings(
+                [self.stay.id, self.dinner.id],
+                username="ann",
+                now=_aware(2030, 3, 1, 20),
+            )
+        self.assertEqual(self._left(self.stay, self.dinner), (2, 2))
+        self.assertEqual(TableSlot.objects.get().booking_id, self.dinner.id)
+
+    def test_staff_may_cancel_any_booking(self):
+        other = self._book_room("bob", date(2030, 4, 1), date(2030, 4, 2))
+        cancelled = cancel_bookings([other.id], username=None, now=_aware(2030, 1, 1))
+        self.assertEqual(cancelled, 1)
+        self.assertEqual(self._left(other), (0, 0))
+
+    def test_view_cancels_the_selected_bookings(self):
+        self.client.force_login(self.ann)
+        response = self.client.post(
+            reverse("service:cancel_bookings"),
+            {"booking_ids": [self.stay.id, self.dinner.id], "next": "/services/"},
+        )
+        self.assertRedirects(response, "/services/", fetch_redirect_response=False)
+        self.assertEqual(self._left(self.stay, self.dinner), (0, 0))
+
+
+@skipIf(not _tables_exist(*BOOKING_TABLES), "Booking tables are unmanaged or missing.")
+class BasketCheckoutTests(BookingFixtures):
+    """The whole basket becomes one booking, or nothing is booked."""
+
+    def setUp(self):
+        self.client.force_login(self.ann)
+        session = self.client.session
+        session["service_basket"] = [
+            {
+                "service": self.room.id,
+                "start": "2030-05-01",
+                "end": "2030-05-03",
+                "meal": "",
+                "people": 2,
+            },
+            {
+                "service": self.big_table.id,
+                "start": "2030-05-01",
+                "end": "2030-05-01",
+                "meal": "dinner",
+                "people": 3,
+            },
+        ]
+        session.save()
+
+    def _checkout(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("service:basket_checkout"))
+
+    def test_books_every_line_in_one_booking(self):
+        response = self._checkout()
+        self.assertRedirects(
+            response, reverse("service:service_list"), fetch_redirect_response=False
+        )
+        booking = Booking.objects.get(username_id="ann")
+        self.assertEqual(
+            sorted(booking.details.values_list("service_id", "people")),
+            [(self.room.id, 2), (self.big_table.id, 3)],
+        )
+        self.assertEqual(
+            list(
+                RoomNight.objects.filter(booking=booking).values_list(
+                    "night", flat=True
+                )
+            ),
+            [date(2030, 5, 1), date(2030, 5, 2)],
+        )
+        self.assertEqual(TableSlot.objects.get(service=self.big_table).booking, booking)
+        self.assertEqual(self.client.session["service_basket"], [])
+
+    def test_overlapping_line_books_nothing(self):
+        self._book_room("bob", date(2030, 5, 2), date(2030, 5, 4))
+        response = self._checkout()
+        self.assertRedirects(
+            response, reverse("service:basket"), fetch_redirect_response=False
+        )
+        self.assertFalse(Booking.objects.filter(username_id="ann").exists())
+        self.assertFalse(TableSlot.objects.filter(service=self.big_table).exists())
+        self.assertEqual(len(self.client.session["service_basket"]), 2)
+
+    def test_taken_table_slot_rolls_back_the_room(self):
+        # The slot is held without a BOOKING_DETAIL row, so only the claim
+        # catches it, after the room nights were already inserted.
+        holder = Booking.objects.create(username_id="bob")
+        TableSlot.objects.create(
+            service=self.big_table,
+            slot_date=date(2030, 5, 1),
+            meal="dinner",
+            booking=holder,
+        )
+        self._checkout()
+        self.assertFalse(Booking.objects.filter(username_id="ann").exists())
+        self.assertFalse(RoomNight.objects.exists())
+
+    def test_party_above_capacity_is_refused(self):
+        session = self.client.session
+        session["service_basket"][1]["people"] = 5
+        session.save()
+        self._checkout()
+        self.assertFalse(Booking.objects.exists())
+
+
+@skipIf(not _tables_exist(*BOOKING_TABLES), "Booking tables are unmanaged or missing.")
+class BookTablesTests(BookingFixtures):
+    """A large party books several tables in one booking."""
+
+    def setUp(self):
+        self.client.force_login(self.ann)
+
+    def _book(self, people, *tables):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(
+                reverse("service:book_tables"),
+                {
+                    "date": "2030-06-01",
+                    "meal": "dinner",
+                    "people": people,
+                    "tables": ",".join(str(t.id) for t in tables),
+                },
+            )
+
+    def test_claims_every_table_and_splits_the_party(self):
+        self._book(5, self.big_table, self.small_table)
+        booking = Booking.objects.get(username_id="ann")
+        self.assertEqual(
+            sorted(booking.details.values_list("service_id", "people")),
+            [(self.big_table.id, 4), (self.small_table.id, 1)],
+        )
+        self.assertEqual(
+            sorted(
+                TableSlot.objects.filter(booking=booking).values_list(
+                    "service_id", flat=True
+                )
+            ),
+            [self.big_table.id, self.small_table.id],
+        )
+
+    def test_taken_table_books_nothing(self):
+        self._book_table("bob", self.small_table, date(2030, 6, 1))
+        self._book(5, self.big_table, self.small_table)
+        self.assertFalse(Booking.objects.filter(username_id="ann").exists())
+        self.assertFalse(TableSlot.objects.filter(service=self.big_table).exists())
+
+    def test_tables_too_small_for_the_party_are_refused(self):
+        self._book(7, self.big_table, self.small_table)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_rooms_cannot_be_booked_as_tables(self):
+        self._book(3, self.big_table, self.room)
+        self.assertFalse(Booking.objects.exists())
@@ -2,8 +2,17 @@
 
 Routes:
 - /services/ → Browse available services with filters
+- /services/availability/ → JSON room/table search with ETag (conditional GET)
+- /services/tables/availability/ → JSON grid of free tables per date and meal
+- /services/occupancy/ → Staff heatmap of bookings per service and day
+- /services/occupancy/data/ → Same occupancy matrix as JSON (staff only)
 - /book/<id>/quick/ → Quick booking flow (auth required)
+- /book/tables/ → Book several tables for one large party (auth required)
+- /basket/ → Services collected for one multi-service booking (auth required)
+- /basket/add/, /basket/remove/ → Edit the basket (auth + POST required)
+- /basket/checkout/ → Book the whole basket at once (auth + POST required)
 - /cancel-booking/<id>/ → Cancel booking (auth + POST required)
+- /cancel-bookings/ → Cancel several bookings at once (auth + POST required)
 """
 
 from django.urls import path
@@ -13,10 +22,32 @@ app_name = "service"
 
 urlpatterns = [
     path("services/", views.service_list, name="service_list"),
+    path("services/availability/", views.availability_api, name="availability_api"),
+    path(
+        "services/tables/availability/",
+        views.table_availability,
+        name="table_availability",
+    ),
+    path("services/occupancy/", views.occupancy_heatmap, name="occupancy_heatmap"),
+    path(
+        "services/occupancy/data/",
+        views.occupancy_heatmap_api,
+        name="occupancy_heatmap_api",
+    ),
     path("book/<int:service_id>/quick/", views.quick_book, name="quick_book"),
+    path("book/tables/", views.book_tables, name="book_tables"),
+    path("basket/", views.basket_view, name="basket"),
+    path("basket/add/", views.basket_add, name="basket_add"),
+    path("basket/remove/", views.basket_remove, name="basket_remove"),
+    path("basket/checkout/", views.basket_checkout, name="basket_checkout"),
     path(
         "cancel-booking/<int:booking_id>/",
         views.cancel_booking,
         name="cancel_booking",
     ),
+    path(
+        "cancel-bookings/",
+        views.cancel_bookings_view,
+        name="cancel_bookings",
+    ),
 ]
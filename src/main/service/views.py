@@ -5,15 +5,38 @@ Approximate SQL is provided in comments for clarity on what operations occur.
 
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.dateparse import parse_date
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import etag, require_GET, require_POST
+from django.http import JsonResponse
 from django.contrib import messages
 
 from django.utils import timezone
-from .models import Service, Booking, BookingDetail
+from .models import Service, Booking, BookingDetail, TableSlot
+from .availability import (
+    CHECK_IN_TIME,
+    CHECK_OUT_TIME,
+    availability_index,
+    booking_version,
+    record_booking_change,
+    stay_bounds,
+)
+from .inventory import (
+    SlotTaken,
+    claim_room_nights,
+    claim_table_slot,
+    reserved_table_ids,
+)
+from .cancellation import CancellationRefused, cancel_bookings
+from .heatmap import occupancy_matrix
+from .locks import ServiceBusy, service_locks
+from .results_cache import cached_search
+from .seating import seat_party, split_party
 from datetime import datetime, time, timedelta
+import hashlib
 from django.urls import reverse
 from django.db import transaction
+from django.db.models import Q
 
 MEAL_START_TIMES = {
     "breakfast": time(8, 0),
@@ -25,6 +48,11 @@ MEAL_LABELS = {
     "lunch": "Lunch",
     "dinner": "Dinner",
 }
+FLEX_MAX_HORIZON_DAYS = 180
+TABLE_GRID_MAX_DAYS = 31
+HEATMAP_DEFAULT_DAYS = 30
+HEATMAP_MAX_DAYS = 92
+BUSY_MESSAGE = "This service is being booked right now, please try again."
 
 
 def get_meal_slot(date_obj, meal_key):
@@ -40,96 +68,186 @@ def get_meal_slot(date_obj, meal_key):
     return start_dt, end_dt
 
 
+def _flexible_room_search(request) -> dict:
+    """Resolve the "nearest free window" room search from GET params.
+
+    Params: flex_from (first check-in day), flex_days (horizon), flex_nights
+    and flex_people. One sweep over the availability index returns the
+    earliest free stays per room, replacing repeated date-by-date probes.
+    """
+    flex_from = parse_date((request.GET.get("flex_from") or "").strip())
+    flex_nights_str = (request.GET.get("flex_nights") or "").strip()
+    flex_people_str = (request.GET.get("flex_people") or "").strip()
+    flex_days_str = (request.GET.get("flex_days") or "").strip()
+
+    flex_nights = int(flex_nights_str) if flex_nights_str.isdigit() else None
+    flex_people = int(flex_people_str) if flex_people_str.isdigit() else None
+    flex_days = int(flex_days_str) if flex_days_str.isdigit() else 30
+    flex_days = max(1, min(flex_days, FLEX_MAX_HORIZON_DAYS))
+
+    flex_rooms = []
+    if flex_from and flex_nights and flex_people:
+        windows = availability_index.free_stay_windows(
+            flex_nights,
+            flex_people,
+            flex_from,
+            flex_from + timedelta(days=flex_days - 1),
+        )
+        rooms = (
+            Service.objects.filter(id__in=windows).select_related("room").order_by("id")
+        )
+        for s in rooms:
+            s.windows = windows[s.id]
+            s.total_price = s.price * flex_nights
+        flex_rooms = sorted(rooms, key=lambda s: (s.windows[0][0], s.id))
+
+    return {
+        "flex_from": flex_from,
+        "flex_days": flex_days,
+        "flex_nights": flex_nights,
+        "flex_people": flex_people,
+        "flex_rooms": flex_rooms,
+    }
+
+
+def _parse_search(params) -> dict:
+    """Normalize the room/table search parameters of a GET query."""
+    room_start_str = (params.get("room_start") or "").strip()
+    room_end_str = (params.get("room_end") or "").strip()
+    room_people_str = (params.get("room_people") or "").strip()
+
+    table_date_str = (params.get("table_date") or "").strip()
+    table_people_str = (params.get("table_people") or "").strip()
+    table_meal = (params.get("table_meal") or "").strip().lower()
+
+    if table_meal not in {"breakfast", "lunch", "dinner"}:
+        table_meal = None
+
+    return {
+        "room_start": parse_date(room_start_str) if room_start_str else None,
+        "room_end": parse_date(room_end_str) if room_end_str else None,
+        "room_people": int(room_people_str) if room_people_str.isdigit() else None,
+        "table_date": parse_date(table_date_str) if table_date_str else None,
+        "table_people": (int(table_people_str) if table_people_str.isdigit() else None),
+        "table_meal": table_meal,
+    }
+
+
+def _search_rooms(room_start, room_end, room_people):
+    """Return (available_rooms, nights, error) for a room search.
+
+    Free rooms are resolved with the in-process availability index (see
+    `service.availability`), so no overlap query runs against BOOKING_DETAIL;
+    only the matching services are fetched. Results are cached per normalized
+    search until a booking touches one of its days (see `results_cache`).
+    """
+    if room_end < room_start:
+        return [], None, "End date must be on or after start date."
+
+    return cached_search(
+        "rooms",
+        room_start,
+        room_end,
+        (room_start, room_end, room_people),
+        lambda: _compute_rooms(room_start, room_end, room_people),
+    )
+
+
+def _compute_rooms(room_start, room_end, room_people):
+    room_nights = max(1, (room_end - room_start).days)
+    start_dt, end_dt = stay_bounds(room_start, room_end)
+
+    free_room_ids = availability_index.free_services(
+        "ROOM", start_dt, end_dt, room_people
+    )
+    rooms = list(
+        Service.objects.filter(id__in=free_room_ids)
+        .select_related("room")
+        .order_by("id")
+    )
+    for s in rooms:
+        s.total_price = s.price * room_nights
+    return rooms, room_nights, None
+
+
+def _search_tables(table_date, table_people, table_meal):
+    """Return (available_tables, table_combo) for a restaurant search.
+
+    Free tables come from the TABLE_SLOT inventory with an equality lookup on
+    (slot_date, meal). When no single table seats the party, `seat_party`
+    suggests the minimal set of free tables that can be booked together.
+    Results are cached per (date, people, meal) until that day changes.
+    """
+    return cached_search(
+        "tables",
+        table_date,
+        table_date,
+        (table_date, table_people, table_meal),
+        lambda: _compute_tables(table_date, table_people, table_meal),
+    )
+
+
+def _compute_tables(table_date, table_people, table_meal):
+    free_tables = list(
+        Service.objects.filter(type="RESTAURANT")
+        .exclude(id__in=reserved_table_ids(table_date, table_meal))
+        .select_related("restaurant")
+        .order_by("id")
+    )
+    available_tables = [
+        t for t in free_tables if t.restaurant.max_capacity >= table_people
+    ]
+    table_combo = []
+    if not available_tables:
+        combo_ids = seat_party(
+            [(t.id, t.restaurant.max_capacity) for t in free_tables],
+            table_people,
+        )
+        if combo_ids:
+            table_combo = [t for t in free_tables if t.id in combo_ids]
+    return available_tables, table_combo
+
+
 def service_list(request):
     """List available services with simple room/table filters.
 
-    SQL (approximate for restaurant tables):
-    SELECT s.* FROM SERVICE s
+    Rooms are searched with `_search_rooms` (availability index), tables with
+    `_search_tables` (TABLE_SLOT inventory plus multi-table suggestions) and
+    the flexible-date room search with `_flexible_room_search`.
+
+    SQL (approximate for restaurant tables; capacity is filtered in Python):
+    SELECT s.*, r.* FROM SERVICE s
     LEFT JOIN RESTAURANT r ON r.service = s.id
-    WHERE s.type = 'RESTAURANT' AND r.max_capacity >= %(people)s
+    WHERE s.type = 'RESTAURANT'
       AND s.id NOT IN (
-                    SELECT service FROM BOOKING_DETAIL
-        WHERE start_date < %(end)s AND end_date > %(start)s
+        SELECT service FROM TABLE_SLOT
+        WHERE slot_date = %(date)s AND meal = %(meal)s AND booking IS NOT NULL
       )
     ORDER BY s.id;
     """
-    room_start_str = (request.GET.get("room_start") or "").strip()
-    room_end_str = (request.GET.get("room_end") or "").strip()
-    room_people_str = (request.GET.get("room_people") or "").strip()
-
-    table_date_str = (request.GET.get("table_date") or "").strip()
-    table_people_str = (request.GET.get("table_people") or "").strip()
-    table_meal = (request.GET.get("table_meal") or "").strip().lower()
-
-    room_start = parse_date(room_start_str) if room_start_str else None
-    room_end = parse_date(room_end_str) if room_end_str else None
-    room_people = int(room_people_str) if room_people_str.isdigit() else None
-
-    table_date = parse_date(table_date_str) if table_date_str else None
-    table_people = int(table_people_str) if table_people_str.isdigit() else None
-    if table_meal not in {"breakfast", "lunch", "dinner"}:
-        table_meal = None
+    search = _parse_search(request.GET)
+    room_start = search["room_start"]
+    room_end = search["room_end"]
+    room_people = search["room_people"]
+    table_date = search["table_date"]
+    table_people = search["table_people"]
+    table_meal = search["table_meal"]
 
     available_rooms = []
     available_tables = []
+    table_combo = []
     room_nights = None
     room_error = None
     table_error = None
 
     if room_start and room_end and room_people:
-        if room_end < room_start:
-            room_error = "End date must be on or after start date."
-        else:
-            delta_days = (room_end - room_start).days
-            room_nights = max(1, delta_days)
-            start_dt = datetime.combine(room_start, time.min)
-            end_dt = datetime.combine(room_end, time.max)
-
-            reserved_room_ids = (
-                BookingDetail.objects.filter(
-                    service__type="ROOM",
-                    start_date__lte=end_dt,
-                    end_date__gte=start_dt,
-                )
-                .values_list("service_id", flat=True)
-                .distinct()
-            )
-
-            qs_rooms = (
-                Service.objects.filter(
-                    type="ROOM",
-                    room__max_capacity__gte=room_people,
-                )
-                .exclude(id__in=reserved_room_ids)
-                .select_related("room")
-                .order_by("id")
-            )
-
-            for s in qs_rooms:
-                s.total_price = s.price * room_nights
-            available_rooms = list(qs_rooms)
-
-    if table_date and table_people and table_meal:
-        start_dt, end_dt = get_meal_slot(table_date, table_meal)
-
-        reserved_table_ids = (
-            BookingDetail.objects.filter(
-                service__type="RESTAURANT",
-                start_date__lt=end_dt,
-                end_date__gt=start_dt,
-            )
-            .values_list("service_id", flat=True)
-            .distinct()
+        available_rooms, room_nights, room_error = _search_rooms(
+            room_start, room_end, room_people
         )
 
-        available_tables = list(
-            Service.objects.filter(
-                type="RESTAURANT",
-                restaurant__max_capacity__gte=table_people,
-            )
-            .exclude(id__in=reserved_table_ids)
-            .select_related("restaurant")
-            .order_by("id")
+    if table_date and table_people and table_meal:
+        available_tables, table_combo = _search_tables(
+            table_date, table_people, table_meal
         )
         table_meal_label = MEAL_LABELS.get(table_meal)
     elif table_date and table_people and not table_meal:
@@ -154,17 +272,172 @@ def service_list(request):
             "table_meal_label": table_meal_label,
             "table_error": table_error,
             "available_tables": available_tables,
+            "table_combo": table_combo,
+            "table_combo_ids": ",".join(str(t.id) for t in table_combo),
+            "table_combo_seats": sum(t.restaurant.max_capacity for t in table_combo),
+            **_flexible_room_search(request),
         },
     )
 
 
+def _availability_etag(request):
+    """Strong ETag: booking-change version plus the normalized search.
+
+    Computed from the cache only, so a matching If-None-Match is answered
+    with 304 before any database query runs.
+    """
+    search = sorted((k, str(v)) for k, v in _parse_search(request.GET).items())
+    digest = hashlib.sha1(repr(search).encode()).hexdigest()[:16]
+    return f"{booking_version()}-{digest}"
+
+
+@require_GET
+@etag(_availability_etag)
+def availability_api(request):
+    """JSON twin of `service_list` for kiosks and partner integrations.
+
+    Accepts the same room_* and table_* parameters and returns the same
+    room and table results. Responses carry a strong ETag derived from the
+    booking-change version; conditional GETs get 304 until a booking changes.
+    """
+    search = _parse_search(request.GET)
+    payload = {"version": booking_version(), "rooms": None, "tables": None}
+
+    if search["room_start"] and search["room_end"] and search["room_people"]:
+        rooms, nights, error = _search_rooms(
+            search["room_start"], search["room_end"], search["room_people"]
+        )
+        payload["rooms"] = {
+            "start": search["room_start"].isoformat(),
+            "end": search["room_end"].isoformat(),
+            "people": search["room_people"],
+            "nights": nights,
+            "error": error,
+            "results": [
+                {
+                    "id": s.id,
+                    "code": s.room.code,
+                    "capacity": s.room.max_capacity,
+                    "price": str(s.price),
+                    "total_price": str(s.total_price),
+                }
+                for s in rooms
+            ],
+        }
+
+    if search["table_date"] and search["table_people"] and search["table_meal"]:
+        tables, combo = _search_tables(
+            search["table_date"], search["table_people"], search["table_meal"]
+        )
+
+        def _table(s):
+            return {
+                "id": s.id,
+                "code": s.restaurant.code,
+                "capacity": s.restaurant.max_capacity,
+                "price": str(s.price),
+            }
+
+        payload["tables"] = {
+            "date": search["table_date"].isoformat(),
+            "meal": search["table_meal"],
+            "people": search["table_people"],
+            "results": [_table(s) for s in tables],
+            "combo": [_table(s) for s in combo],
+        }
+
+    return JsonResponse(payload)
+
+
+@require_GET
+def table_availability(request):
+    """JSON grid of free tables per (date, meal) for a date range.
+
+    Query params: from, to (inclusive, at most TABLE_GRID_MAX_DAYS days),
+    meals (comma-separated, default all) and people (minimum table size).
+    The whole grid costs two queries: the restaurant tables and the booked
+    TABLE_SLOT rows of the range; cells are filled in Python.
+
+    SQL (approximate):
+    SELECT s.id, r.code, r.max_capacity FROM SERVICE s
+    JOIN RESTAURANT r ON r.service = s.id
+    WHERE s.type = 'RESTAURANT';
+
+    SELECT slot_date, meal, service FROM TABLE_SLOT
+    WHERE slot_date BETWEEN %(from)s AND %(to)s AND meal IN (%(meals)s)
+      AND booking IS NOT NULL;
+    """
+    first_day = parse_date(request.GET.get("from") or "")
+    last_day = parse_date(request.GET.get("to") or "") or first_day
+    meals = [
+        m
+        for m in (request.GET.get("meals") or ",".join(MEAL_START_TIMES)).split(",")
+        if m in MEAL_START_TIMES
+    ]
+    people_str = (request.GET.get("people") or "").strip()
+    people = int(people_str) if people_str.isdigit() else 1
+
+    if not first_day or last_day < first_day or not meals:
+        return JsonResponse({"error": "Invalid date range or meals."}, status=400)
+    days = min((last_day - first_day).days + 1, TABLE_GRID_MAX_DAYS)
+    last_day = first_day + timedelta(days=days - 1)
+
+    tables = [
+        {"id": sid, "code": code, "capacity": cap}
+        for sid, code, cap in Service.objects.filter(
+            type="RESTAURANT", restaurant__max_capacity__gte=people
+        )
+        .order_by("id")
+        .values_list("id", "restaurant__code", "restaurant__max_capacity")
+    ]
+
+    booked = {}
+    for day, meal, sid in TableSlot.objects.filter(
+        slot_date__range=(first_day, last_day),
+        meal__in=meals,
+        booking__isnull=False,
+    ).values_list("slot_date", "meal", "service_id"):
+        booked.setdefault((day, meal), set()).add(sid)
+
+    slots = []
+    for i in range(days):
+        day = first_day + timedelta(days=i)
+        for meal in meals:
+            taken = booked.get((day, meal), ())
+            free = [t for t in tables if t["id"] not in taken]
+            slots.append(
+                {
+                    "date": day.isoformat(),
+                    "meal": meal,
+                    "free_tables": [t["id"] for t in free],
+                    "free_seats": sum(t["capacity"] for t in free),
+                }
+            )
+
+    return JsonResponse(
+        {
+            "from": first_day.isoformat(),
+            "to": last_day.isoformat(),
+            "people": people,
+            "meals": meals,
+            "tables": tables,
+            "slots": slots,
+        }
+    )
+
+
 @login_required
 def quick_book(request, service_id):
     """Quick booking flow for a service (Room or Restaurant).
 
     Guard rails:
     - User must be authenticated.
-    - Validates date params and checks for overlapping bookings.
+    - Validates date params and checks for overlapping bookings while
+      holding the service's advisory lock (see `service.locks`), so the
+      check and the insert are serialized per service.
+    - Rooms claim one ROOM_NIGHT row per night and tables claim their
+      TABLE_SLOT; if the inventory is already taken the whole booking is
+      rolled back.
     - Creates a Booking and a BookingDetail, then redirects.
     """
     service = get_object_or_404(Service, id=service_id)
@@ -206,17 +479,13 @@ def quick_book(request, service_id):
     if is_room:
         delta_days = (end_date - start_date).days
         nights = max(1, delta_days)
-        start_dt = datetime.combine(start_date, time(14, 0))
+        start_dt = datetime.combine(start_date, CHECK_IN_TIME)
         end_base_date = (
             end_date if end_date > start_date else (start_date + timedelta(days=1))
         )
-        end_dt = datetime.combine(end_base_date, time(10, 0))
+        end_dt = datetime.combine(end_base_date, CHECK_OUT_TIME)
         total_price = service.price * nights
         redirect_url = f"{reverse('service:service_list')}?room_start={start_date}&room_end={end_date}&room_people={people}"
-
-        overlap_exists = BookingDetail.objects.filter(
-            service=service, start_date__lte=end_dt, end_date__gte=start_dt
-        ).exists()
     else:
         if meal_param not in MEAL_START_TIMES:
             messages.error(
@@ -229,23 +498,34 @@ def quick_book(request, service_id):
         start_dt, end_dt = get_meal_slot(start_date, meal_param)
         redirect_url = f"{reverse('service:service_list')}?table_date={start_date}&table_people={people}&table_meal={meal_param}"
 
-        overlap_exists = BookingDetail.objects.filter(
-            service=service, start_date__lt=end_dt, end_date__gt=start_dt
-        ).exists()
-
-    if overlap_exists:
+    try:
+        with service_locks([service.id]), transaction.atomic():
+            if BookingDetail.objects.filter(
+                service=service, start_date__lt=end_dt, end_date__gt=start_dt
+            ).exists():
+                raise SlotTaken()
+            booking = Booking.objects.create(username_id=request.user.username)
+            if is_room:
+                claim_room_nights(booking, service, start_date, end_base_date)
+            else:
+                claim_table_slot(booking, service, start_date, meal_param)
+            BookingDetail.objects.create(
+                booking=booking,
+                service=service,
+                start_date=start_dt,
+                end_date=end_dt,
+                people=people,
+                unit_price=service.price,
+            )
+            transaction.on_commit(
+                lambda: record_booking_change(added=[(service.id, start_dt, end_dt)])
+            )
+    except SlotTaken:
         messages.error(request, "Selected time slot is no longer available.")
         return redirect(redirect_url)
-
-    booking = Booking.objects.create(username_id=request.user.username)
-    BookingDetail.objects.create(
-        booking=booking,
-        service=service,
-        start_date=start_dt,
-        end_date=end_dt,
-        people=people,
-        unit_price=service.price,
-    )
+    except ServiceBusy:
+        messages.error(request, BUSY_MESSAGE)
+        return redirect(redirect_url)
 
     if is_room:
         messages.success(
@@ -272,28 +552,419 @@ def cancel_booking(request, booking_id):
     - Authenticated user and owner of the booking.
     - Only if booking has not started.
     """
+    try:
+        cancel_bookings([booking_id], username=request.user.username)
+    except CancellationRefused as exc:
+        messages.error(request, str(exc))
+        return redirect(request.POST.get("next") or "profile")
 
-    booking_details = BookingDetail.objects.filter(booking_id=booking_id)
+    messages.success(request, "Booking cancelled successfully.")
+    return redirect(request.POST.get("next") or "profile")
 
-    if (
-        not booking_details.exists()
-        or booking_details.first().booking.username_id != request.user.username
-    ):
-        messages.error(request, "You can only cancel your own bookings.")
-        return redirect(request.POST.get("next") or "profile")
 
-    if booking_details.first().start_date < timezone.now():
-        messages.error(request, "Cannot cancel a booking that has already started.")
-        return redirect(request.POST.get("next") or "profile")
+@login_required
+@require_POST
+@transaction.atomic
+def cancel_bookings_view(request):
+    """Cancel several bookings at once (POST booking_ids, repeated).
 
-    booking_details.delete()
+    Users may cancel only their own bookings; staff may cancel anyone's.
+    Either every selected booking is cancelled or none is.
+    """
+    ids = {int(b) for b in request.POST.getlist("booking_ids") if b.isdigit()}
+    next_url = request.POST.get("next") or "profile"
+    if not ids:
+        messages.error(request, "Select at least one booking to cancel.")
+        return redirect(next_url)
 
+    owner = None if request.user.is_staff else request.user.username
     try:
-        booking = Booking.objects.get(id=booking_id)
-        if not booking.details.exists():
-            booking.delete()
-    except Booking.DoesNotExist:
-        pass
+        cancelled = cancel_bookings(ids, username=owner)
+    except CancellationRefused as exc:
+        messages.error(request, str(exc))
+        return redirect(next_url)
 
-    messages.success(request, "Booking cancelled successfully.")
-    return redirect(request.POST.get("next") or "profile")
+    messages.success(
+        request,
+        f"{cancelled} booking{'s' if cancelled != 1 else ''} cancelled successfully.",
+    )
+    return redirect(next_url)
+
+
+@login_required
+def book_tables(request):
+    """Book several restaurant tables for one party in a single Booking.
+
+    Query params: date, meal, people and tables (comma-separated service ids,
+    as suggested by `seat_party`). Claims every TABLE_SLOT and inserts all
+    BookingDetail rows with one bulk insert, in one transaction.
+
+    SQL (approximate; executed within a transaction):
+
+    INSERT INTO "BOOKING" ("username", "booking_date") VALUES (%s, %s);
+    UPDATE "TABLE_SLOT" SET "booking" = %s
+    WHERE "service" = %s AND "slot_date" = %s AND "meal" = %s AND "booking" IS NULL;
+    INSERT INTO "BOOKING_DETAIL" ("booking", "service", "start_date", "end_date", "people", "unit_price")
+    VALUES (%s, %s, %s, %s, %s, %s), (%s, %s, %s, %s, %s, %s), ...;
+    """
+    day = parse_date(request.GET.get("date") or "")
+    meal = (request.GET.get("meal") or "").strip().lower()
+    people_param = (request.GET.get("people") or "").strip()
+    people = int(people_param) if people_param.isdigit() else 0
+    table_ids = {
+        int(t) for t in (request.GET.get("tables") or "").split(",") if t.isdigit()
+    }
+
+    redirect_url = f"{reverse('service:service_list')}?table_date={day}&table_people={people}&table_meal={meal}"
+    if not day or meal not in MEAL_START_TIMES or people <= 0 or not table_ids:
+        messages.error(request, "Invalid table selection for booking.")
+        return redirect("service:service_list")
+
+    tables = list(
+        Service.objects.filter(id__in=table_ids, type="RESTAURANT")
+        .select_related("restaurant")
+        .order_by("id")
+    )
+    guests = split_party([t.restaurant.max_capacity for t in tables], people)
+    if len(tables) != len(table_ids) or sum(guests) < people or 0 in guests:
+        messages.error(request, "The selected tables cannot seat your party.")
+        return redirect(redirect_url)
+
+    start_dt, end_dt = get_meal_slot(day, meal)
+    try:
+        with service_locks(table_ids), transaction.atomic():
+            booking = Booking.objects.create(username_id=request.user.username)
+            for table in tables:
+                claim_table_slot(booking, table, day, meal)
+            BookingDetail.objects.bulk_create(
+                [
+                    BookingDetail(
+                        booking=booking,
+                        service=table,
+                        start_date=start_dt,
+                        end_date=end_dt,
+                        people=n,
+                        unit_price=table.price,
+                    )
+                    for table, n in zip(tables, guests)
+                ]
+            )
+            added = [(table.id, start_dt, end_dt) for table in tables]
+            transaction.on_commit(lambda: record_booking_change(added=added))
+    except SlotTaken:
+        messages.error(request, "One of the selected tables is no longer available.")
+        return redirect(redirect_url)
+    except ServiceBusy:
+        messages.error(request, BUSY_MESSAGE)
+        return redirect(redirect_url)
+
+    messages.success(
+        request,
+        f"{len(tables)} tables booked for {MEAL_LABELS.get(meal)} on {day:%Y-%m-%d} for {people} people.",
+    )
+    return redirect(redirect_url)
+
+
+def _heatmap_window(params):
+    """Return (first_day, days) from the from/days query params."""
+    first_day = parse_date(params.get("from") or "") or timezone.localdate()
+    days_str = (params.get("days") or "").strip()
+    days = int(days_str) if days_str.isdigit() else HEATMAP_DEFAULT_DAYS
+    return first_day, min(max(days, 1), HEATMAP_MAX_DAYS)
+
+
+@staff_member_required(login_url="/login")
+@require_GET
+def occupancy_heatmap_api(request):
+    """JSON occupancy matrix: bookings per room and day, per table and meal.
+
+    Query params: from (default today) and days (at most HEATMAP_MAX_DAYS).
+    See `service.heatmap` for how the matrix is built and cached.
+    """
+    first_day, days = _heatmap_window(request.GET)
+    matrix = occupancy_matrix(first_day, days, list(MEAL_START_TIMES.values()))
+    codes = matrix["codes"]
+    return JsonResponse(
+        {
+            "from": first_day.isoformat(),
+            "days": days,
+            "meals": list(MEAL_START_TIMES),
+            "rooms": [
+                {"id": sid, "code": codes[sid], "nights": cells}
+                for sid, cells in matrix["rooms"].items()
+            ],
+            "tables": [
+                {"id": sid, "code": codes[sid], "meals": cells}
+                for sid, cells in matrix["tables"].items()
+            ],
+        }
+    )
+
+
+@staff_member_required(login_url="/login")
+def occupancy_heatmap(request):
+    """Staff page showing the occupancy matrix as a heatmap."""
+    first_day, days = _heatmap_window(request.GET)
+    meal_keys = list(MEAL_START_TIMES)
+    matrix = occupancy_matrix(first_day, days, list(MEAL_START_TIMES.values()))
+    codes = matrix["codes"]
+    step = len(meal_keys)
+    context = {
+        "heatmap_from": first_day,
+        "heatmap_days": days,
+        "dates": [first_day + timedelta(days=i) for i in range(days)],
+        "meal_labels": [MEAL_LABELS[m] for m in meal_keys],
+        "room_rows": [
+            {"code": codes[sid], "cells": cells}
+            for sid, cells in matrix["rooms"].items()
+        ],
+        "table_rows": [
+            {
+                "code": codes[sid],
+                "cells": [cells[i : i + step] for i in range(0, len(cells), step)],
+            }
+            for sid, cells in matrix["tables"].items()
+        ],
+    }
+    return render(request, "occupancy.html", context)
+
+
+def _get_basket(session) -> list:
+    return session.setdefault("service_basket", [])
+
+
+def _save_basket(session, basket: list) -> None:
+    session["service_basket"] = basket
+    session.modified = True
+
+
+def _line_window(service, start_date, end_date, meal):
+    """Return (start_dt, end_dt, units) for a basket line, or None if invalid.
+
+    units is the number of nights for rooms and 1 for tables.
+    """
+    if service.type == "ROOM":
+        if not start_date or not end_date or end_date < start_date:
+            return None
+        end_base_date = (
+            end_date if end_date > start_date else (start_date + timedelta(days=1))
+        )
+        return (
+            datetime.combine(start_date, CHECK_IN_TIME),
+            datetime.combine(end_base_date, CHECK_OUT_TIME),
+            (end_base_date - start_date).days,
+        )
+    start_dt, end_dt = get_meal_slot(start_date, meal)
+    if start_dt is None:
+        return None
+    return start_dt, end_dt, 1
+
+
+def _basket_lines(basket: list) -> list:
+    """Resolve the session basket into lines with services, windows and totals.
+
+    Lines whose service disappeared or whose dates became invalid are dropped.
+
+    SQL (approximate):
+    SELECT S.*, RO.*, R.*
+    FROM "SERVICE" S
+    LEFT JOIN "ROOM" RO ON RO."service" = S."id"
+    LEFT JOIN "RESTAURANT" R ON R."service" = S."id"
+    WHERE S."id" IN (%ids);
+    """
+    services = Service.objects.select_related("room", "restaurant").in_bulk(
+        [item["service"] for item in basket]
+    )
+    lines = []
+    for item in basket:
+        service = services.get(item["service"])
+        if service is None:
+            continue
+        start_date = parse_date(item["start"])
+        end_date = parse_date(item["end"])
+        window = _line_window(service, start_date, end_date, item["meal"])
+        if window is None:
+            continue
+        start_dt, end_dt, units = window
+        lines.append(
+            {
+                "service": service,
+                "start": start_date,
+                "end": end_date,
+                "meal": item["meal"],
+                "meal_label": MEAL_LABELS.get(item["meal"]),
+                "people": item["people"],
+                "start_dt": start_dt,
+                "end_dt": end_dt,
+                "units": units,
+                "line_total": service.price * units,
+            }
+        )
+    return lines
+
+
+@login_required
+def basket_view(request):
+    """Show the services collected for a single multi-service booking."""
+    lines = _basket_lines(_get_basket(request.session))
+    total = sum((line["line_total"] for line in lines), 0)
+    return render(request, "basket.html", {"lines": lines, "total": total})
+
+
+@login_required
+@require_POST
+def basket_add(request):
+    """Add a room stay (start/end) or a table meal (date/meal) to the basket.
+
+    A service can appear only once per booking (BOOKING_DETAIL is keyed by
+    booking and service), so a second line for the same service is refused.
+    """
+    service = get_object_or_404(Service, id=request.POST.get("service_id"))
+    next_url = request.POST.get("next") or reverse("service:service_list")
+    people_param = (request.POST.get("people") or "").strip()
+    people = max(1, int(people_param)) if people_param.isdigit() else 1
+
+    if service.type == "ROOM":
+        start = parse_date(request.POST.get("start") or "")
+        end = parse_date(request.POST.get("end") or "")
+        meal = ""
+    else:
+        start = end = parse_date(request.POST.get("date") or "")
+        meal = (request.POST.get("meal") or "").strip().lower()
+
+    if _line_window(service, start, end, meal) is None:
+        messages.error(request, "Invalid date selection for booking.")
+        return redirect(next_url)
+
+    basket = _get_basket(request.session)
+    if any(item["service"] == service.id for item in basket):
+        messages.error(request, "This service is already in your basket.")
+        return redirect(next_url)
+
+    basket.append(
+        {
+            "service": service.id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "meal": meal,
+            "people": people,
+        }
+    )
+    _save_basket(request.session, basket)
+    messages.success(request, "Added to your basket.")
+    return redirect(next_url)
+
+
+@login_required
+@require_POST
+def basket_remove(request):
+    """Remove the line for a service from the basket."""
+    service_id = request.POST.get("service_id") or ""
+    basket = [
+        item
+        for item in _get_basket(request.session)
+        if str(item["service"]) != service_id
+    ]
+    _save_basket(request.session, basket)
+    return redirect("service:basket")
+
+
+@login_required
+@require_POST
+def basket_checkout(request):
+    """Book every basket line at once: one Booking, one bulk insert of details.
+
+    All lines are checked for overlapping bookings with a single query; the
+    ROOM_NIGHT/TABLE_SLOT claims then guard against concurrent writers, and
+    any conflict rolls the whole booking back.
+
+    SQL (approximate; executed within a transaction):
+
+    SELECT BD."service"
+    FROM "BOOKING_DETAIL" BD
+    WHERE (BD."service" = %s AND BD."start_date" < %s AND BD."end_date" > %s)
+       OR (BD."service" = %s AND BD."start_date" < %s AND BD."end_date" > %s)
+       OR ...;
+
+    INSERT INTO "BOOKING" ("username", "booking_date") VALUES (%s, %s);
+    INSERT INTO "ROOM_NIGHT" ... / UPDATE "TABLE_SLOT" ...;  -- per line
+    INSERT INTO "BOOKING_DETAIL" ("booking", "service", "start_date", "end_date", "people", "unit_price")
+    VALUES (%s, %s, %s, %s, %s, %s), (%s, %s, %s, %s, %s, %s), ...;
+    """
+    lines = _basket_lines(_get_basket(request.session))
+    if not lines:
+        messages.error(request, "Your basket is empty.")
+        return redirect("service:basket")
+
+    for line in lines:
+        service = line["service"]
+        details = service.room if service.type == "ROOM" else service.restaurant
+        if line["people"] > details.max_capacity:
+            messages.error(
+                request, f"{details.code} cannot host {line['people']} people."
+            )
+            return redirect("service:basket")
+
+    overlap = Q()
+    for line in lines:
+        overlap |= Q(
+            service_id=line["service"].id,
+            start_date__lt=line["end_dt"],
+            end_date__gt=line["start_dt"],
+        )
+
+    try:
+        with service_locks(line["service"].id for line in lines), transaction.atomic():
+            taken = set(
+                BookingDetail.objects.filter(overlap).values_list(
+                    "service_id", flat=True
+                )
+            )
+            if taken:
+                raise SlotTaken()
+            booking = Booking.objects.create(username_id=request.user.username)
+            for line in lines:
+                if line["service"].type == "ROOM":
+                    claim_room_nights(
+                        booking,
+                        line["service"],
+                        line["start"],
+                        line["end_dt"].date(),
+                    )
+                else:
+                    claim_table_slot(
+                        booking, line["service"], line["start"], line["meal"]
+                    )
+            BookingDetail.objects.bulk_create(
+                [
+                    BookingDetail(
+                        booking=booking,
+                        service=line["service"],
+                        start_date=line["start_dt"],
+                        end_date=line["end_dt"],
+                        people=line["people"],
+                        unit_price=line["service"].price,
+                    )
+                    for line in lines
+                ]
+            )
+            added = [
+                (line["service"].id, line["start_dt"], line["end_dt"]) for line in lines
+            ]
+            transaction.on_commit(lambda: record_booking_change(added=added))
+    except SlotTaken:
+        messages.error(
+            request,
+            "Some services in your basket are no longer available. Nothing was booked.",
+        )
+        return redirect("service:basket")
+    except ServiceBusy:
+        messages.error(request, BUSY_MESSAGE)
+        return redirect("service:basket")
+
+    _save_basket(request.session, [])
+    messages.success(
+        request,
+        f"Booked {len(lines)} service{'s' if len(lines) != 1 else ''} in one booking.",
+    )
+    return redirect("service:service_list")
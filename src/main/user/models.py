@@ -9,6 +9,7 @@ This file mirrors the explanatory style used in Event app code, adding
 clear docstrings for maintenance without changing behavior.
 """
 
+from django.conf import settings
 from django.db import models
 
 
@@ -51,7 +52,11 @@ class FullyBookedEvent(models.Model):
 
 
 class FreeServiceNow(models.Model):
-    """Projection of services with their current availability state."""
+    """Projection of services with their current availability state.
+
+    Reads the free_services_now view, or the free_services_snapshot view over
+    the maintained SERVICE_OCCUPANCY table when FREE_SERVICES_SNAPSHOT is set.
+    """
 
     service_id = models.IntegerField(primary_key=True, db_column="service_id")
     type = models.CharField(max_length=20, null=True, db_column="type")
@@ -70,7 +75,11 @@ class FreeServiceNow(models.Model):
 
     class Meta:
         managed = False
-        db_table = "free_services_now"
+        db_table = (
+            "free_services_snapshot"
+            if getattr(settings, "FREE_SERVICES_SNAPSHOT", False)
+            else "free_services_now"
+        )
 
 
 class Employee(models.Model):
@@ -393,7 +393,8 @@ def statistic_view(request: HttpRequest) -> HttpResponse:
     LIMIT 10;
 
     SELECT * FROM "fully_booked_events" ORDER BY "event_date" DESC LIMIT 50;
-    SELECT * FROM "free_services_now" ORDER BY "available" DESC, "type" ASC, "service_id" ASC LIMIT 200;
+    SELECT * FROM "free_services_now"  -- or "free_services_snapshot", see FreeServiceNow
+    ORDER BY "available" DESC, "type" ASC, "service_id" ASC LIMIT 200;
     """
     users_count = models.User.objects.count()
     employees_count = models.ActiveEmployee.objects.count()
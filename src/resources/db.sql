@@ -74,6 +74,7 @@ CREATE TABLE ORDER_DETAIL (
 CREATE TABLE EVENT (
 	id INT AUTO_INCREMENT PRIMARY KEY,
 	seats INT NOT NULL CHECK (seats > 0),
+	taken INT NOT NULL DEFAULT 0 CHECK (taken >= 0), -- SUM(EVENT_SUBSCRIPTION.participants), kept by the app
 	title VARCHAR(100) NOT NULL,
 	description TEXT NOT NULL,
 	event_date DATE NOT NULL,
@@ -81,6 +82,9 @@ CREATE TABLE EVENT (
 	FOREIGN KEY (created_by) REFERENCES EMPLOYEE(username)
 );
 
+-- Keyset pagination of the events list: (event_date, title, id)
+CREATE INDEX idx_event_listing ON EVENT (event_date, title, id);
+
 CREATE TABLE EVENT_SUBSCRIPTION (
 	event INT NOT NULL,
 	user VARCHAR(32) NOT NULL,
@@ -132,6 +136,47 @@ CREATE TABLE ROOM (
 	FOREIGN KEY (service) REFERENCES SERVICE(id)
 );
 
+-- One row per booked room night: the primary key rejects double bookings
+CREATE TABLE ROOM_NIGHT (
+	service INT NOT NULL,
+	night DATE NOT NULL,
+	booking INT NOT NULL,
+	PRIMARY KEY (service, night),
+	FOREIGN KEY (service) REFERENCES SERVICE(id),
+	FOREIGN KEY (booking) REFERENCES BOOKING(id) ON DELETE CASCADE
+);
+
+-- One row per restaurant table and meal; booking is NULL while the slot is free
+CREATE TABLE TABLE_SLOT (
+	service INT NOT NULL,
+	slot_date DATE NOT NULL,
+	meal ENUM('breakfast', 'lunch', 'dinner') NOT NULL,
+	booking INT NULL,
+	PRIMARY KEY (service, slot_date, meal),
+	INDEX idx_table_slot_lookup (slot_date, meal, booking),
+	FOREIGN KEY (service) REFERENCES SERVICE(id),
+	FOREIGN KEY (booking) REFERENCES BOOKING(id) ON DELETE SET NULL
+);
+
+-- Occupancy snapshot per service, maintained by the application (refresh_occupancy)
+CREATE TABLE SERVICE_OCCUPANCY (
+	service INT PRIMARY KEY,
+	people_now INT NOT NULL DEFAULT 0,
+	reservations_now INT NOT NULL DEFAULT 0,
+	refreshed_at DATETIME NOT NULL,
+	FOREIGN KEY (service) REFERENCES SERVICE(id) ON DELETE CASCADE
+);
+
+-- Inverted index for the site search (events, products, reviews), see core.search
+CREATE TABLE SEARCH_TOKEN (
+	kind VARCHAR(16) NOT NULL,
+	token VARCHAR(64) COLLATE utf8mb4_bin NOT NULL, -- exact keys, as core.search.tokenize folds them
+	object_id INT NOT NULL,
+	hits SMALLINT UNSIGNED NOT NULL DEFAULT 1,
+	PRIMARY KEY (kind, token, object_id),
+	INDEX idx_search_token_object (kind, object_id)
+);
+
 CREATE TABLE REVIEW (
 	id INT AUTO_INCREMENT PRIMARY KEY,
 	`user` VARCHAR(32) NOT NULL,
@@ -264,11 +309,9 @@ SELECT
 	e.title,
 	e.event_date,
 	e.seats,
-	IFNULL(SUM(es.participants), 0) AS total_participants
+	e.taken AS total_participants
 FROM EVENT e
-LEFT JOIN EVENT_SUBSCRIPTION es ON es.event = e.id
-GROUP BY e.id
-HAVING IFNULL(SUM(es.participants), 0) >= e.seats;
+WHERE e.taken >= e.seats;
 
 -- View: services currently free/available (no active reservations now)
 CREATE VIEW free_services_now AS
@@ -303,6 +346,31 @@ WHERE
     (s.type = 'ROOM' AND IFNULL(b.reservations_now, 0) = 0) OR
     (s.type = 'RESTAURANT' AND IFNULL(b.people_now, 0) < IFNULL(r.max_capacity, 0));
 
+-- View: same projection as free_services_now, read from the SERVICE_OCCUPANCY snapshot
+CREATE VIEW free_services_snapshot AS
+SELECT 
+    s.id AS service_id,
+    s.type,
+    r.code AS restaurant_code,
+    ro.code AS room_code,
+    r.max_capacity AS restaurant_max_capacity,
+    ro.max_capacity AS room_max_capacity,
+    IFNULL(o.people_now, 0) AS people_booked_now,
+    IFNULL(o.reservations_now, 0) AS reservations_now,
+    (IFNULL(o.reservations_now, 0) = 0) AS available,
+    CASE
+        WHEN s.type = 'RESTAURANT' THEN GREATEST(IFNULL(r.max_capacity, 0) - IFNULL(o.people_now, 0), 0)
+        WHEN s.type = 'ROOM' THEN ro.max_capacity
+        ELSE NULL
+    END AS available_seats
+FROM SERVICE s
+LEFT JOIN RESTAURANT r ON r.service = s.id
+LEFT JOIN ROOM ro ON ro.service = s.id
+LEFT JOIN SERVICE_OCCUPANCY o ON o.service = s.id
+WHERE 
+    (s.type = 'ROOM' AND IFNULL(o.reservations_now, 0) = 0) OR
+    (s.type = 'RESTAURANT' AND IFNULL(o.people_now, 0) < IFNULL(r.max_capacity, 0));
+
 -- View: booking revenue per service (total people * unit_price)
 CREATE VIEW booking_revenue_per_service AS
 SELECT 
@@ -144,6 +144,10 @@ SELECT e.id, 'mrossi', '2025-08-30 00:00:00', 2
 FROM EVENT e
 WHERE e.title = 'Farm Open Day';
 
+-- Initialize the taken-seats counters from the demo subscriptions
+UPDATE EVENT e
+SET e.taken = (SELECT IFNULL(SUM(es.participants), 0) FROM EVENT_SUBSCRIPTION es WHERE es.event = e.id);
+
 INSERT INTO SERVICE (price, type) VALUES
 (0, 'RESTAURANT'),
 (0, 'RESTAURANT'),
@@ -201,6 +205,18 @@ SELECT @r3, @s_room2,  '2025-09-17 18:00:00', '2025-09-19 10:00:00', 3, price FR
 INSERT INTO BOOKING_DETAIL (booking, service, start_date, end_date, people, unit_price)
 SELECT @r4, @s_table2, '2025-09-18 20:00:00', '2025-09-18 22:00:00', 5, price FROM SERVICE WHERE id = @s_table2; -- Table T02 (cap 6)
 
+-- Room nights claimed by the room bookings above
+INSERT INTO ROOM_NIGHT (service, night, booking) VALUES
+(@s_room1, '2025-09-16', @r2),
+(@s_room1, '2025-09-17', @r2),
+(@s_room2, '2025-09-17', @r3),
+(@s_room2, '2025-09-18', @r3);
+
+-- Table slots claimed by the restaurant bookings above
+INSERT INTO TABLE_SLOT (service, slot_date, meal, booking) VALUES
+(@s_table1, '2025-09-15', 'lunch', @r1),
+(@s_table2, '2025-09-18', 'dinner', @r4);
+
 -- Alias for event IDs
 SET @e_workshop  = (SELECT id FROM EVENT WHERE title = 'Cheese Making Workshop');
 SET @e_festival  = (SELECT id FROM EVENT WHERE title = 'Harvest Festival');